@@ -0,0 +1,141 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Batch Chart Rendering
+
+Renders the viewer's charts (highs, lows, and both) for every station and year
+straight to image files, with no window and no menu, so hundreds of charts can be
+made on a server with no display.
+
+Features & Flow:
+- Uses matplotlib's Agg backend, which draws to memory instead of the screen.
+- Each worker process makes one figure and reuses it for every chart it draws
+  (clearing the axes between charts) instead of calling plt.subplots() each time.
+- Charts are drawn with draw_temps() from sitka_highs_cms.py, so they match the
+  interactive viewer.
+- Work is split into one task per station and year, spread over a multiprocessing.Pool.
+- Weather files are loaded with sitka_ingest.py, so any number of files and stations
+  can be given at once.
+
+Usage:
+    python sitka_batch.py sitka_weather_2018_simple.csv --out charts
+    python sitka_batch.py "data/*.csv" --types high both --workers 8
+'''
+
+import argparse
+import os
+import sys
+from bisect import bisect_left
+from datetime import date, datetime
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')  # Must be chosen before pyplot is imported anywhere.
+from matplotlib import pyplot as plt
+
+from sitka_highs_cms import FILENAME, draw_temps
+from sitka_ingest import ingest
+
+TEMP_TYPES = ('high', 'low', 'both')
+FIGURE_SIZE = (12, 6)  # Inches.
+DPI = 100
+
+_figure = None  # Each worker's reusable (figure, axes).
+
+
+def start_worker(figsize=FIGURE_SIZE):
+    """Creates the figure this worker process reuses for every chart."""
+    global _figure
+    fig, ax = plt.subplots(figsize=figsize)
+    _figure = (fig, ax)
+
+
+def chart_filename(out_dir, station_id, year, temp_type, image_format='png'):
+    """Returns the output path for one chart."""
+    safe_id = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in station_id)
+    return os.path.join(out_dir, f"{safe_id}_{year}_{temp_type}.{image_format}")
+
+
+def render_task(task):
+    """
+    Draws every requested chart for one station and year.
+    Returns a list of the files written.
+    """
+    station_id, name, year, days, highs, lows, temp_types, overlays, out_dir, image_format = task
+    if _figure is None:
+        start_worker()
+    fig, ax = _figure
+    dates = list(map(datetime.fromordinal, days))
+    period = f"{name or station_id} {year}"
+    written = []
+    for temp_type in temp_types:
+        ax.clear()
+        draw_temps(fig, ax, temp_type, dates, highs, lows, period, overlays)
+        filename = chart_filename(out_dir, station_id, year, temp_type, image_format)
+        fig.savefig(filename, dpi=DPI, bbox_inches='tight')
+        written.append(filename)
+    return written
+
+
+def year_tasks(stations, temp_types=TEMP_TYPES, out_dir='charts', image_format='png', overlays=()):
+    """Yields one render task per station and year, finding each year's rows with bisect."""
+    for station_id in sorted(stations):
+        station = stations[station_id]
+        days = station['days']
+        if not days:
+            continue
+        for year in range(date.fromordinal(days[0]).year, date.fromordinal(days[-1]).year + 1):
+            start = bisect_left(days, date(year, 1, 1).toordinal())
+            stop = bisect_left(days, date(year + 1, 1, 1).toordinal())
+            if start == stop:
+                continue
+            yield (station_id, station['name'], year, days[start:stop].tolist(),
+                   station['highs'][start:stop].tolist(), station['lows'][start:stop].tolist(),
+                   tuple(temp_types), tuple(overlays), out_dir, image_format)
+
+
+def render_charts(source, out_dir='charts', temp_types=TEMP_TYPES, workers=None, image_format='png',
+                  overlays=()):
+    """
+    Loads every weather file for source and renders charts for each station and year
+    into out_dir. Returns the number of files written.
+    overlays -- rolling statistics to draw on each chart ('mean', 'range').
+    workers -- number of processes (default: one per CPU); 1 renders in this process.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    stations = ingest(source, workers)
+    tasks = year_tasks(stations, temp_types, out_dir, image_format, overlays)
+    count = 0
+    if workers == 1:
+        for task in tasks:
+            count += len(render_task(task))
+    else:
+        with Pool(workers, initializer=start_worker) as pool:
+            for written in pool.imap_unordered(render_task, tasks):
+                count += len(written)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render weather charts to image files without a display.")
+    parser.add_argument('source', nargs='?', default=FILENAME,
+                        help="weather CSV file, folder, or glob pattern")
+    parser.add_argument('--out', default='charts', help="output folder (default: charts)")
+    parser.add_argument('--types', nargs='+', choices=TEMP_TYPES, default=list(TEMP_TYPES),
+                        help="charts to draw for each station and year")
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: one per CPU)")
+    parser.add_argument('--overlays', nargs='*', choices=('mean', 'range'), default=[],
+                        help="rolling statistics to draw over each chart")
+    parser.add_argument('--format', default='png', help="image format, e.g. png, svg or pdf")
+    args = parser.parse_args(argv)
+
+    count = render_charts(args.source, args.out, args.types, args.workers, args.format, args.overlays)
+    print(f"Wrote {count} charts to {args.out}")
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n[Info] Batch rendering interrupted.")
+        sys.exit(1)
@@ -0,0 +1,116 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Columnar Weather Cache
+
+Parsing the weather CSV (csv.reader plus a date parse per row) is most of the
+viewer's startup time. After the first parse the parsed columns are written next to
+the CSV in a small binary file, one typed array per column. Later launches read that
+file with a single memory-mapped read instead of parsing the CSV again.
+
+Features & Flow:
+- Columns: dates as int32 day numbers (date.toordinal()), TMAX and TMIN as int16,
+  PRCP as float32 (NaN where the CSV has no value).
+- The cache remembers the CSV's size and modification time; if either changes,
+  load_cache() returns None and the caller re-parses and rewrites the cache.
+- The warnings printed for skipped rows are kept after the columns, so they are printed
+  again on every launch and a bad CSV never goes quiet.
+- The arrays come back as memoryviews straight over the mapped file, so nothing is
+  copied until the caller needs Python objects.
+- The cache is written to a temporary file and renamed, so a crash never leaves a
+  half-written cache behind.
+'''
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = b'SKWC'
+CACHE_VERSION = 2  # 2 added the skipped-row warnings
+BYTE_ORDER_MARK = 0x0102  # Reads back as 0x0201 on a machine with the other byte order.
+
+# magic, version, byte order mark, source mtime (ns), source size, row count,
+# size of the warnings text (UTF-8, one warning per line) that follows the columns:
+HEADER = struct.Struct('=4sHHqqQI')
+
+# Column name, array typecode. The 4-byte columns come first so every column stays aligned.
+COLUMNS = (('days', 'i'), ('prcp', 'f'), ('highs', 'h'), ('lows', 'h'))
+
+
+def cache_path(csv_filename):
+    """Returns the filename of the cache kept next to the given CSV file."""
+    return csv_filename + CACHE_SUFFIX
+
+
+def write_cache(csv_filename, days, highs, lows, prcp, warnings=()):
+    """
+    Writes the parsed columns for csv_filename to its cache file.
+    days -- day numbers from date.toordinal(); prcp -- floats, NaN where missing.
+    warnings -- the messages for rows that were skipped while parsing.
+    """
+    source = os.stat(csv_filename)
+    columns = {'days': days, 'highs': highs, 'lows': lows, 'prcp': prcp}
+    count = len(days)
+    warning_text = '\n'.join(warnings).encode('utf-8')
+    temp_name = cache_path(csv_filename) + '.tmp'
+    with open(temp_name, 'wb') as cache_file:
+        cache_file.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, BYTE_ORDER_MARK,
+                                     source.st_mtime_ns, source.st_size, count, len(warning_text)))
+        for name, typecode in COLUMNS:
+            values = array(typecode, columns[name])
+            if len(values) != count:
+                raise ValueError(f"Column {name} has {len(values)} values, expected {count}")
+            values.tofile(cache_file)
+        cache_file.write(warning_text)
+    os.replace(temp_name, cache_path(csv_filename))
+
+
+def load_cache(csv_filename):
+    """
+    Returns a dict of memoryviews ('days', 'highs', 'lows', 'prcp') read from the
+    cache of csv_filename, plus 'warnings', the list of skipped-row messages, or
+    None if there is no cache or it is out of date.
+    """
+    try:
+        source = os.stat(csv_filename)
+        with open(cache_path(csv_filename), 'rb') as cache_file:
+            size = os.fstat(cache_file.fileno()).st_size
+            if size < HEADER.size:
+                return None
+            mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    magic, version, mark, mtime_ns, source_size, count, warning_size = HEADER.unpack_from(mapped)
+    if (magic, version, mark) != (CACHE_MAGIC, CACHE_VERSION, BYTE_ORDER_MARK) \
+            or (mtime_ns, source_size) != (source.st_mtime_ns, source.st_size) \
+            or size != HEADER.size + count * sum(array(t).itemsize for _, t in COLUMNS) + warning_size:
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    columns, offset = {}, HEADER.size
+    for name, typecode in COLUMNS:
+        length = count * array(typecode).itemsize
+        columns[name] = view[offset:offset + length].cast(typecode)
+        offset += length
+    warning_text = mapped[offset:offset + warning_size].decode('utf-8')
+    columns['warnings'] = warning_text.split('\n') if warning_text else []
+    return columns
+
+
+def main(csv_filename):
+    """Prints whether the cache for csv_filename is current and how many rows it holds."""
+    columns = load_cache(csv_filename)
+    if columns is None:
+        print(f"No up-to-date cache for {csv_filename}")
+    else:
+        print(f"{cache_path(csv_filename)}: {len(columns['days'])} rows, "
+              f"{len(columns['warnings'])} skipped")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'sitka_weather_2018_simple.csv')
@@ -0,0 +1,49 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Fast Date Parsing
+
+datetime.strptime() reads its format string and matches it piece by piece on every
+call, which makes it most of the per-row cost of reading a weather CSV. NOAA files
+always write dates as YYYY-MM-DD, so dates in exactly that layout go through the much
+faster datetime.fromisoformat() instead.
+
+Features & Flow:
+- Only 10-character values with dashes in the right places take the fast path.
+  Anything else (or anything fromisoformat() rejects) goes to strptime(), so the
+  same dates are accepted and malformed rows raise the same ValueError messages
+  that read_weather_data() prints in its row warnings.
+- parse_day() returns day numbers (date.toordinal()) and remembers dates it has
+  already seen, since files with many stations repeat every date once per station.
+'''
+
+from datetime import datetime
+
+DATE_FORMAT = '%Y-%m-%d'
+MAX_REMEMBERED_DAYS = 200_000  # About 550 years of daily dates.
+
+_days = {}
+
+
+def parse_date(value):
+    """
+    Returns a datetime for a 'YYYY-MM-DD' string.
+    Raises ValueError exactly like datetime.strptime(value, DATE_FORMAT).
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass  # Let strptime() decide, so the error message stays the same.
+    return datetime.strptime(value, DATE_FORMAT)
+
+
+def parse_day(value):
+    """Returns the day number (date.toordinal()) for a 'YYYY-MM-DD' string."""
+    day = _days.get(value)
+    if day is None:
+        day = parse_date(value).toordinal()
+        if len(_days) >= MAX_REMEMBERED_DAYS:
+            _days.clear()
+        _days[value] = day
+    return day
@@ -0,0 +1,87 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Level-of-Detail Plotting
+
+plot_temps() hands every data point to ax.plot(). A year is only 365 points, but
+decades of daily data across many stations is millions, and then drawing becomes the
+slow part, even though the axes are only a few hundred pixels wide. This module
+plots a reduced copy of each series: the x range is split into about one bucket
+per pixel and only the lowest and highest point in each bucket are kept, so every
+peak and trough still shows up exactly where it belongs.
+
+Features & Flow:
+- minmax_indices() picks the points to keep using NumPy (already installed with matplotlib).
+- plot_downsampled() draws a series through a LevelOfDetail helper, which listens
+  for changes to the x limits. When the view is zoomed or panned, only the visible
+  part of the series is reduced again for the new range, so zooming in brings back
+  full detail.
+- Series that are already short enough are plotted unchanged.
+'''
+
+import numpy as np
+from matplotlib import dates as mdates
+
+POINTS_PER_PIXEL = 2  # One low and one high per pixel column.
+
+
+def minmax_indices(y, buckets):
+    """
+    Returns sorted indices into y that keep the first and last point plus the
+    lowest and highest point of each of about `buckets` equal-sized buckets.
+    """
+    y = np.asarray(y, dtype=float)
+    count = len(y)
+    if buckets <= 0 or count <= 2 * buckets:
+        return np.arange(count)
+    size = -(-count // buckets)  # Points per bucket, rounded up.
+    rows = -(-count // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:count] = y
+    padded = padded.reshape(rows, size)
+    starts = np.arange(rows) * size
+    # NaN (gaps and padding) never wins; a bucket with no values at all keeps its first point.
+    lowest = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highest = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.concatenate(([0, count - 1], starts + lowest, starts + highest))
+    return np.unique(np.minimum(keep, count - 1))
+
+
+class LevelOfDetail:
+    """Keeps a line drawn at about POINTS_PER_PIXEL points per pixel of the visible x range."""
+
+    def __init__(self, ax, line, x, y):
+        self.ax = ax
+        self.line = line
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.x_numbers = mdates.date2num(self.x) if self.x.dtype.kind in 'OM' else self.x.astype(float)
+        ax.callbacks.connect('xlim_changed', self.update)
+
+    def visible_range(self):
+        """Returns (start, stop) indices covering the current x limits plus one point on each side."""
+        low, high = sorted(self.ax.get_xlim())
+        start = max(0, np.searchsorted(self.x_numbers, low, side='left') - 1)
+        stop = min(len(self.x), np.searchsorted(self.x_numbers, high, side='right') + 1)
+        return start, stop
+
+    def update(self, ax=None):
+        """Re-reduce the visible part of the series for the current view."""
+        start, stop = self.visible_range()
+        pixels = max(1, int(self.ax.bbox.width))
+        keep = minmax_indices(self.y[start:stop], pixels * POINTS_PER_PIXEL // 2) + start
+        self.line.set_data(self.x[keep], self.y[keep])
+
+
+def plot_downsampled(ax, x, y, **kwargs):
+    """
+    Plots y against x like ax.plot(x, y, **kwargs), but only draws the points
+    needed at the current zoom level. x must be sorted. Returns the Line2D.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    pixels = max(1, int(ax.bbox.width))
+    keep = minmax_indices(y, pixels * POINTS_PER_PIXEL // 2)
+    line, = ax.plot(x[keep], y[keep], **kwargs)
+    if len(keep) < len(y):
+        line.lod = LevelOfDetail(ax, line, x, y)  # Kept on the line so it lives as long as the plot.
+    return line
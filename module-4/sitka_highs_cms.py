@@ -14,6 +14,8 @@ Revisions:
 - Incorporated graceful exit handling via sys.exit().
 - Included error handling for file access, data parsing, and invalid inputs.
 - Added detailed comments, docstrings, and structure to reflect consistent coding style.
+- Can view any station from any number of NOAA CSVs (a file, folder or glob pattern):
+  python sitka_highs_cms.py SOURCE [STATION]
 
 Features & Flow:
 1. Program displays a menu offering four options: Highs, Lows, Both, or Exit.
@@ -37,24 +39,57 @@ References:
 '''
 
 import csv
+import math
 import sys  # Added to handle system exit on errors -cms
 from datetime import datetime
 from matplotlib import pyplot as plt
 
+import sitka_cache  # Binary column cache so later launches skip CSV parsing -cms
+from sitka_dates import parse_date  # Fast path for YYYY-MM-DD dates -cms
+from sitka_downsample import plot_downsampled  # Only draws what fits on screen -cms
+from sitka_ingest import ingest, station_series  # Multi-file, multi-station loading -cms
+from sitka_stats import ROLLING_WINDOW, TemperatureStats, summary  # Rolling overlays -cms
+from sitka_store import WeatherStore, parse_range  # Indexed date-range lookups -cms
+
 # Constants (added for clarity and maintainability) -cms
 FILENAME = 'sitka_weather_2018_simple.csv'
 HIGH_INDEX = 5
 LOW_INDEX = 6
 DATE_INDEX = 2
+PRCP_INDEX = 3
+
+# Initialize data lists (added support for lows and precipitation) -cms
+dates, highs, lows, precip = [], [], [], []
+overlays = set()  # Rolling statistics drawn over the chart: 'mean' and/or 'range' -cms
+store = None  # WeatherStore index over dates/highs/lows, built once the data is read -cms
+selection = None  # (start, end, label) of the chosen date range, or None for all dates -cms
 
-# Initialize data lists (added support for lows) -cms
-dates, highs, lows = [], [], []
+def parse_precip(value):
+    """Returns the precipitation as a float, or NaN when it is missing or invalid."""
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
 
 def read_weather_data(filename):
     """
     Reads weather data from the given CSV file and populates
-    the global lists: dates, highs, and lows.
+    the global lists: dates, highs, lows, and precip.
+    Uses the binary cache next to the CSV when it is up to date, and
+    writes a new cache after parsing the CSV otherwise. -cms
     """
+    columns = sitka_cache.load_cache(filename)
+    if columns is not None:
+        for warning in columns['warnings']:
+            print(f"[Warning] {warning}")  # Same warnings as the first parse -cms
+        dates.extend(map(datetime.fromordinal, columns['days']))
+        highs.extend(columns['highs'].tolist())
+        lows.extend(columns['lows'].tolist())
+        precip.extend(round(rain, 2) for rain in columns['prcp'])  # float32 -> the CSV's 2 decimals -cms
+        return
+
+    first_row = len(dates)  # Only the rows read from this file go into its cache -cms
+    warnings = []  # Kept in the cache so later launches repeat them -cms
     try:
         with open(filename) as f:
             reader = csv.reader(f)
@@ -62,15 +97,18 @@ def read_weather_data(filename):
 
             for row_num, row in enumerate(reader, start=2):  # Added row_num for better error reporting -cms
                 try:
-                    current_date = datetime.strptime(row[DATE_INDEX], '%Y-%m-%d')
+                    current_date = parse_date(row[DATE_INDEX])  # Same warnings as strptime -cms
                     high = int(row[HIGH_INDEX])
                     low = int(row[LOW_INDEX])  # Added support for parsing low temps -cms
+                    rain = parse_precip(row[PRCP_INDEX])
                 except (ValueError, IndexError) as e:
-                    print(f"[Warning] Skipping invalid row {row_num}: {e}")  # Added detailed error handling -cms
+                    warnings.append(f"Skipping invalid row {row_num}: {e}")
+                    print(f"[Warning] {warnings[-1]}")  # Added detailed error handling -cms
                     continue
                 dates.append(current_date)
                 highs.append(high)
                 lows.append(low)  # Added storing low temps -cms
+                precip.append(rain)
 
     except FileNotFoundError:
         print(f"[Error] File not found: {filename}")  # Added error message for missing file -cms
@@ -79,6 +117,78 @@ def read_weather_data(filename):
         print(f"[Error] Unexpected error reading file: {e}")  # Added general exception handling -cms
         sys.exit(1)
 
+    try:
+        sitka_cache.write_cache(filename, [day.toordinal() for day in dates[first_row:]],
+                                highs[first_row:], lows[first_row:], precip[first_row:], warnings)
+    except (OSError, OverflowError) as e:
+        print(f"[Notice] Could not write weather cache: {e}")  # The viewer still works without it -cms
+
+def load_station_data(source, station_id=None):
+    """
+    Loads every weather CSV for source (a file, folder or glob pattern) and fills
+    the global lists with one station's data: station_id, or the station with the
+    most rows if it is None. Exits if there is no such station. -cms
+    """
+    stations = ingest(source)
+    if not stations:
+        print(f"[Error] No weather data found for {source}")
+        sys.exit(1)
+    if station_id is None:
+        station_id = max(stations, key=lambda station: len(stations[station]['days']))
+    elif station_id not in stations:
+        print(f"[Error] Station {station_id} not found. Stations: {', '.join(sorted(stations))}")
+        sys.exit(1)
+    print(f"[Info] Showing station {station_id} {stations[station_id]['name']}")
+    for values, column in zip((dates, highs, lows, precip), station_series(stations[station_id])):
+        values.extend(column)
+
+def draw_overlays(ax, temp_type, dates, highs, lows, overlays):
+    """
+    Draws rolling statistics over the chart. -cms
+    overlays -- any of 'mean' (rolling mean) and 'range' (rolling low/high).
+    """
+    stats = TemperatureStats()
+    stats.extend(dates, highs, lows)
+    kinds = {'high': [('high', 'darkred')], 'low': [('low', 'navy')],
+             'both': [('high', 'darkred'), ('low', 'navy')]}[temp_type]
+    for kind, color in kinds:
+        if 'mean' in overlays:
+            plot_downsampled(ax, dates, stats.rolling[(kind, 'mean')], c=color, linestyle='--',
+                             linewidth=1.5, label=f"{ROLLING_WINDOW}-day mean {kind}")
+        if 'range' in overlays:
+            plot_downsampled(ax, dates, stats.rolling[(kind, 'max')], c=color, linestyle=':',
+                             linewidth=1, alpha=0.6, label=f"{ROLLING_WINDOW}-day range {kind}")
+            plot_downsampled(ax, dates, stats.rolling[(kind, 'min')], c=color, linestyle=':',
+                             linewidth=1, alpha=0.6)
+
+def draw_temps(fig, ax, temp_type, dates, highs, lows, period='2018', overlays=()):
+    """
+    Draws a temperature chart onto an existing figure and axes.
+    Split out of plot_temps() so batch rendering can reuse one figure. -cms
+    temp_type -- 'high', 'low', or 'both'; period -- shown at the end of the title.
+    overlays -- rolling statistics to draw on top (see draw_overlays()).
+    """
+    if temp_type == 'high':
+        plot_downsampled(ax, dates, highs, c='red')  # Modified to use dynamic temp type -cms
+        ax.set_title(f"Daily High Temperatures - {period}", fontsize=24)
+    elif temp_type == 'low':
+        plot_downsampled(ax, dates, lows, c='blue')  # Added option to plot lows -cms
+        ax.set_title(f"Daily Low Temperatures - {period}", fontsize=24)
+    elif temp_type == 'both':
+        plot_downsampled(ax, dates, highs, c='red', label='Highs')  # Added plotting both highs and lows -cms
+        plot_downsampled(ax, dates, lows, c='blue', label='Lows')
+        ax.set_title(f"Daily High/Low Temperatures - {period}", fontsize=24)
+
+    if overlays:
+        draw_overlays(ax, temp_type, dates, highs, lows, overlays)  # Added rolling statistics -cms
+    if temp_type == 'both' or overlays:
+        ax.legend()
+
+    ax.set_xlabel('', fontsize=16)
+    fig.autofmt_xdate()
+    ax.set_ylabel("Temperature (F)", fontsize=16)
+    ax.tick_params(axis='both', which='major', labelsize=16)
+
 def plot_temps(temp_type):
     """
     Plots temperature data based on user input.
@@ -86,23 +196,11 @@ def plot_temps(temp_type):
     """
     fig, ax = plt.subplots()
     try:
-        if temp_type == 'high':
-            ax.plot(dates, highs, c='red')  # Modified to use dynamic temp type -cms
-            plt.title("Daily High Temperatures - 2018", fontsize=24)
-        elif temp_type == 'low':
-            ax.plot(dates, lows, c='blue')  # Added option to plot lows -cms
-            plt.title("Daily Low Temperatures - 2018", fontsize=24)
-        elif temp_type == 'both':
-            ax.plot(dates, highs, c='red', label='Highs')  # Added plotting both highs and lows -cms
-            ax.plot(dates, lows, c='blue', label='Lows')
-            plt.title("Daily High/Low Temperatures - 2018", fontsize=24)
-            ax.legend()
-
-        plt.xlabel('', fontsize=16)
-        fig.autofmt_xdate()
-        plt.ylabel("Temperature (F)", fontsize=16)
-        plt.tick_params(axis='both', which='major', labelsize=16)
-
+        if selection is None:
+            draw_temps(fig, ax, temp_type, dates, highs, lows, overlays=overlays)
+        else:
+            start, end, label = selection  # Only plot the chosen date range -cms
+            draw_temps(fig, ax, temp_type, *store.select(start, end), label, overlays)
         plt.show()
     except KeyboardInterrupt:
         print("\n[Notice] Plot window closed or interrupted.")  # Added handling for plot window being closed -cms
@@ -117,14 +215,49 @@ def display_menu():
     print("  2 - View Low Temperatures")
     print("  3 - View Both High and Low Temperatures")
     print("  4 - Exit")
+    state = 'on' if overlays else 'off'
+    print(f"  5 - Toggle {ROLLING_WINDOW}-day rolling mean/range overlays (currently {state})")
+    chosen = selection[2] if selection else 'all dates'
+    print(f"  6 - Select a date range (currently {chosen})")
+
+def select_date_range():
+    """
+    Asks for a date range, prints its statistics from the index, and makes
+    it the range the charts show. A blank entry goes back to all dates. -cms
+    """
+    global selection
+    text = input("Enter a year, month (2018-03), season (summer 2018) or two dates "
+                 "(2018-03-01 2018-05-31), or press Enter for all dates: ").strip()
+    if not text:
+        selection = None
+        return
+    try:
+        start, end, label = parse_range(text)
+    except ValueError as e:
+        print(f"[Warning] Invalid date range: {e}")
+        return
+    stats = store.query(start, end)
+    if stats is None:
+        print(f"[Warning] No weather data for {label}.")
+        return
+    selection = (start, end, label)
+    for kind in ('high', 'low'):
+        lowest, highest, mean = stats[kind]
+        print(f"{label} {kind}s: min {lowest}F, max {highest}F, mean {mean:.1f}F")
+    print('\n'.join(store.summary_table('month', start, end)))
 
 def main():
     """Main program loop."""
-    read_weather_data(FILENAME)  # Now uses function instead of inline file handling -cms
+    global store
+    if len(sys.argv) > 1:
+        load_station_data(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        read_weather_data(FILENAME)  # Now uses function instead of inline file handling -cms
+    store = WeatherStore(dates, highs, lows)  # Index the data once for range queries -cms
     while True:
         display_menu()  # Interactive menu loop -cms
         try:
-            choice = input("Enter choice (1-4): ").strip()  # Added safe input handling -cms
+            choice = input("Enter choice (1-6): ").strip()  # Added safe input handling -cms
         except (EOFError, KeyboardInterrupt):
             print("\n[Info] Input interrupted. Exiting program.")
             sys.exit(0)
@@ -139,8 +272,21 @@ def main():
         elif choice == '4':
             print("\nThanks for using the weather data viewer. Goodbye!")  # Added user-friendly exit message -cms
             sys.exit(0)
+        elif choice == '5':
+            if overlays:
+                overlays.clear()
+            else:
+                overlays.update(('mean', 'range'))  # Added rolling statistics overlays -cms
+                stats = TemperatureStats()
+                stats.extend(dates, highs, lows)
+                print('\n'.join(summary(stats, highs, lows)))
+        elif choice == '6':
+            try:
+                select_date_range()
+            except (EOFError, KeyboardInterrupt):
+                print("\n[Info] Date range selection cancelled.")
         else:
-            print("[Warning] Invalid selection. Please choose 1, 2, 3, or 4.")  # Input validation -cms
+            print("[Warning] Invalid selection. Please choose 1, 2, 3, 4, 5, or 6.")  # Input validation -cms
 
 if __name__ == '__main__':
     main()  # Switched from inline logic to main() function call -cms
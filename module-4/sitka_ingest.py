@@ -0,0 +1,200 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Multi-Station Ingestion
+
+read_weather_data() reads one file at fixed column positions into three global
+lists. This module loads any number of NOAA GHCN-style daily CSVs (a file, a
+folder, or a glob pattern such as 'data/*.csv'), finds the columns by their header
+names, and splits the rows up by STATION, so decades of data across hundreds of
+stations can be loaded at once.
+
+Features & Flow:
+- Each file is read row by row with csv.reader in a worker process (multiprocessing.Pool),
+  so several files are parsed at the same time on different CPU cores.
+- Rows are stored in typed arrays (day number, TMAX, TMIN, PRCP: 12 bytes per row)
+  instead of lists of datetime and int objects, which keeps memory use small.
+- A file whose header is missing a needed column is reported and skipped; rows with a
+  bad date or temperature are skipped and counted, like read_weather_data() does.
+- The results for each station are merged and sorted by date once every file is read.
+- station_series() turns one station's arrays back into the dates/highs/lows/precip
+  lists that the viewer uses; run sitka_highs_cms.py with a file, folder or glob
+  pattern (and optionally a station ID) to view any station.
+'''
+
+import csv
+import glob
+import math
+import os
+import sys
+from array import array
+from datetime import datetime
+from multiprocessing import Pool
+
+from sitka_dates import parse_day
+
+REQUIRED_COLUMNS = ('STATION', 'DATE', 'TMAX', 'TMIN')
+MAX_WARNINGS = 5  # Row warnings printed per file; the rest are only counted.
+COLUMN_TYPES = (('days', 'i'), ('highs', 'h'), ('lows', 'h'), ('prcp', 'f'))
+TEMPERATURE_RANGE = range(-2 ** 15, 2 ** 15)  # What fits in the 'h' (16-bit) temperature arrays.
+
+
+def find_weather_files(source):
+    """
+    Returns a sorted list of CSV files for source, which may be a file,
+    a folder (every .csv file in it, including subfolders), or a glob pattern.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '**', '*.csv'), recursive=True))
+    if os.path.isfile(source):
+        return [source]
+    return sorted(glob.glob(source, recursive=True))
+
+
+def new_station(name=''):
+    """Returns an empty station record with one typed array per column."""
+    station = {'name': name}
+    for column, typecode in COLUMN_TYPES:
+        station[column] = array(typecode)
+    return station
+
+
+def resolve_columns(header_row):
+    """
+    Returns a dict mapping column name to index, found by header name.
+    Raises ValueError if a required column is missing.
+    """
+    columns = {name.strip().upper(): index for index, name in enumerate(header_row)}
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"missing column(s) {', '.join(missing)}")
+    return columns
+
+
+def parse_weather_file(filename):
+    """
+    Reads one weather CSV and returns (filename, stations, skipped, warnings, error).
+    stations maps station ID to a station record (see new_station()).
+    """
+    stations, skipped, warnings = {}, 0, []
+    try:
+        with open(filename, newline='') as f:
+            reader = csv.reader(f)
+            columns = resolve_columns(next(reader, []))
+            station_index, date_index = columns['STATION'], columns['DATE']
+            high_index, low_index = columns['TMAX'], columns['TMIN']
+            name_index, prcp_index = columns.get('NAME'), columns.get('PRCP')
+
+            for row_num, row in enumerate(reader, start=2):
+                try:
+                    day = parse_day(row[date_index])
+                    high = int(row[high_index])
+                    low = int(row[low_index])
+                    if high not in TEMPERATURE_RANGE or low not in TEMPERATURE_RANGE:
+                        raise ValueError(f"temperature out of range: {high}, {low}")
+                except (ValueError, IndexError) as e:
+                    skipped += 1
+                    if len(warnings) < MAX_WARNINGS:
+                        warnings.append(f"row {row_num}: {e}")
+                    continue
+                try:
+                    rain = float(row[prcp_index]) if prcp_index is not None else math.nan
+                except (ValueError, IndexError):
+                    rain = math.nan
+
+                station_id = row[station_index]
+                station = stations.get(station_id)
+                if station is None:
+                    name = row[name_index] if name_index is not None and name_index < len(row) else ''
+                    station = stations[station_id] = new_station(name)
+                station['days'].append(day)
+                station['highs'].append(high)
+                station['lows'].append(low)
+                station['prcp'].append(rain)
+    except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+        return filename, {}, skipped, warnings, str(e)
+    return filename, stations, skipped, warnings, None
+
+
+def merge_station(target, source):
+    """Appends the rows of one station record onto another."""
+    if not target['name']:
+        target['name'] = source['name']
+    for column, _ in COLUMN_TYPES:
+        target[column].extend(source[column])
+
+
+def sort_station(station):
+    """Sorts a station's rows by date, in place, if they are not already in order."""
+    days = station['days']
+    if all(days[i] <= days[i + 1] for i in range(len(days) - 1)):
+        return
+    order = sorted(range(len(days)), key=days.__getitem__)
+    for column, typecode in COLUMN_TYPES:
+        values = station[column]
+        station[column] = array(typecode, [values[i] for i in order])
+
+
+def ingest(source, workers=None, verbose=True):
+    """
+    Loads every weather CSV found for source (see find_weather_files()) using a
+    pool of worker processes, and returns a dict mapping station ID to station record.
+    workers -- number of processes (default: one per CPU); 1 parses in this process.
+    """
+    filenames = find_weather_files(source) if isinstance(source, str) else list(source)
+    stations = {}
+
+    def collect(result):
+        filename, file_stations, skipped, warnings, error = result
+        if error is not None:
+            if verbose:
+                print(f"[Error] Skipping {filename}: {error}")
+            return
+        if verbose:
+            for warning in warnings:
+                print(f"[Warning] {filename}: skipping invalid {warning}")
+            if skipped > len(warnings):
+                print(f"[Warning] {filename}: {skipped - len(warnings)} more invalid rows skipped")
+        for station_id, station in file_stations.items():
+            merge_station(stations.setdefault(station_id, new_station()), station)
+
+    if workers == 1 or len(filenames) <= 1:
+        for filename in filenames:
+            collect(parse_weather_file(filename))
+    else:
+        with Pool(workers) as pool:
+            # Results are merged as each file finishes, so only a few parsed files
+            # are ever waiting in memory at once.
+            for result in pool.imap_unordered(parse_weather_file, filenames):
+                collect(result)
+
+    for station in stations.values():
+        sort_station(station)
+    return stations
+
+
+def station_series(station):
+    """
+    Returns (dates, highs, lows, precip) lists for one station, the same lists
+    read_weather_data() fills. precip is rounded back to the CSV's 2 decimals.
+    """
+    return (list(map(datetime.fromordinal, station['days'])),
+            station['highs'].tolist(), station['lows'].tolist(),
+            [round(rain, 2) for rain in station['prcp']])
+
+
+def main(source):
+    """Loads every weather file for source and prints a summary per station."""
+    stations = ingest(source)
+    if not stations:
+        print(f"[Error] No weather data found for {source}")
+        return
+    for station_id in sorted(stations):
+        station = stations[station_id]
+        days = station['days']
+        first, last = datetime.fromordinal(days[0]).date(), datetime.fromordinal(days[-1]).date()
+        print(f"{station_id}  {station['name'][:30]:30}  {len(days):8} rows  {first} to {last}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else '.')
@@ -0,0 +1,190 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Rolling Statistics
+
+Rolling means, rolling lows/highs, degree-days and departure-from-normal for the
+highs and lows series. Recomputing each window from scratch costs O(n * window);
+here every value is handled once, as it arrives, so a whole series costs O(n) and
+new rows can be appended at any time without starting over.
+
+Features & Flow:
+- RollingWindow keeps a running sum for the mean, plus two monotonic deques: one whose
+  values only increase (its front is the window minimum) and one whose values only
+  decrease (its front is the window maximum). Each value enters and leaves each deque
+  once, so every update is O(1) on average.
+- DegreeDays keeps running totals of heating and cooling degree-days from each day's
+  average temperature (base 65F).
+- DailyNormals keeps running totals for each calendar day, so departure() gives how far
+  a reading is above or below normal for that time of year (the mean of every reading
+  within NORMAL_SPAN days of that calendar day, across all years loaded).
+- TemperatureStats feeds highs and lows through all of the above one row at a time and
+  keeps the results as lists ready for plotting (NaN until a window is full).
+'''
+
+import math
+from collections import deque
+from datetime import date
+
+ROLLING_WINDOW = 7  # Days.
+DEGREE_DAY_BASE = 65  # Degrees F.
+NORMAL_SPAN = 15  # Days either side of a calendar day that count towards its normal.
+LEAP_YEAR_START = date(2000, 1, 1).toordinal()
+
+
+class RollingWindow:
+    """Mean, minimum and maximum of the last `window` values pushed."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.values = deque()
+        self.total = 0
+        self.lows = deque()  # (index, value), values increasing from the front.
+        self.highs = deque()  # (index, value), values decreasing from the front.
+        self.count = 0  # Values pushed so far.
+
+    def push(self, value):
+        """Adds a value, dropping the oldest one once the window is full."""
+        index = self.count
+        self.count += 1
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+
+        # A new value makes every larger value behind it useless as a future minimum
+        # (and every smaller value useless as a future maximum):
+        while self.lows and self.lows[-1][1] >= value:
+            self.lows.pop()
+        self.lows.append((index, value))
+        while self.highs and self.highs[-1][1] <= value:
+            self.highs.pop()
+        self.highs.append((index, value))
+
+        oldest = index - self.window + 1
+        if self.lows[0][0] < oldest:
+            self.lows.popleft()
+        if self.highs[0][0] < oldest:
+            self.highs.popleft()
+
+    def full(self):
+        """Returns True once the window holds `window` values."""
+        return len(self.values) == self.window
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else math.nan
+
+    def minimum(self):
+        return self.lows[0][1] if self.lows else math.nan
+
+    def maximum(self):
+        return self.highs[0][1] if self.highs else math.nan
+
+
+class DegreeDays:
+    """Running heating and cooling degree-day totals."""
+
+    def __init__(self, base=DEGREE_DAY_BASE):
+        self.base = base
+        self.heating = 0.0
+        self.cooling = 0.0
+
+    def push(self, high, low):
+        """Adds one day, using the mean of its high and low as the day's temperature."""
+        average = (high + low) / 2
+        self.heating += max(0.0, self.base - average)
+        self.cooling += max(0.0, average - self.base)
+
+
+class DailyNormals:
+    """Running mean temperature around each calendar day of the year."""
+
+    def __init__(self, span=NORMAL_SPAN):
+        self.span = span
+        self.sums = [0] * 366  # Indexed by calendar day 0-365 (Feb 29 included).
+        self.counts = [0] * 366
+
+    @staticmethod
+    def calendar_day(day):
+        """Returns 0-365 for a date, using a leap year so Feb 29 has its own slot."""
+        return date(2000, day.month, day.day).toordinal() - LEAP_YEAR_START
+
+    def push(self, day, value):
+        slot = self.calendar_day(day)
+        self.sums[slot] += value
+        self.counts[slot] += 1
+
+    def normal(self, day):
+        """
+        Returns the mean of every value seen within `span` calendar days either side
+        of this day (in any year), or NaN if there are none.
+        """
+        slot = self.calendar_day(day)
+        total = count = 0
+        for offset in range(-self.span, self.span + 1):
+            total += self.sums[(slot + offset) % 366]
+            count += self.counts[(slot + offset) % 366]
+        return total / count if count else math.nan
+
+    def departure(self, day, value):
+        """Returns how far value is above (+) or below (-) normal for this calendar day."""
+        return value - self.normal(day)
+
+
+class TemperatureStats:
+    """Incremental rolling statistics for a highs/lows series, kept as plot-ready lists."""
+
+    SERIES = ('mean', 'min', 'max')
+
+    def __init__(self, window=ROLLING_WINDOW, base=DEGREE_DAY_BASE):
+        self.windows = {'high': RollingWindow(window), 'low': RollingWindow(window)}
+        self.degree_days = DegreeDays(base)
+        self.normals = {'high': DailyNormals(), 'low': DailyNormals()}
+        self.dates = []
+        self.rolling = {(kind, stat): [] for kind in self.windows for stat in self.SERIES}
+        self.heating = []  # Running heating degree-day total after each day.
+        self.cooling = []
+
+    def append(self, day, high, low):
+        """Adds one day's high and low and updates every statistic."""
+        self.dates.append(day)
+        for kind, value in (('high', high), ('low', low)):
+            window = self.windows[kind]
+            window.push(value)
+            ready = window.full()
+            self.rolling[(kind, 'mean')].append(window.mean() if ready else math.nan)
+            self.rolling[(kind, 'min')].append(window.minimum() if ready else math.nan)
+            self.rolling[(kind, 'max')].append(window.maximum() if ready else math.nan)
+            self.normals[kind].push(day, value)
+        self.degree_days.push(high, low)
+        self.heating.append(self.degree_days.heating)
+        self.cooling.append(self.degree_days.cooling)
+
+    def extend(self, dates, highs, lows):
+        """Adds many days at once."""
+        for day, high, low in zip(dates, highs, lows):
+            self.append(day, high, low)
+
+    def departures(self, kind, values):
+        """Returns departure from normal for each value of the 'high' or 'low' series."""
+        normals = self.normals[kind]
+        # Work out each calendar day's normal once rather than once per reading:
+        table = [normals.normal(date.fromordinal(LEAP_YEAR_START + slot)) for slot in range(366)]
+        return [value - table[normals.calendar_day(day)] for day, value in zip(self.dates, values)]
+
+
+def summary(stats, highs, lows):
+    """Returns printable lines summarizing degree-days and the largest departures from normal."""
+    if not stats.dates:
+        return ["No weather data loaded."]
+    lines = [f"Heating degree-days: {stats.heating[-1]:.0f}   Cooling degree-days: {stats.cooling[-1]:.0f}"]
+    for kind, values in (('high', highs), ('low', lows)):
+        departures = stats.departures(kind, values)
+        warmest = max(range(len(departures)), key=departures.__getitem__)
+        coldest = min(range(len(departures)), key=departures.__getitem__)
+        lines.append(f"Largest {kind} departures: {departures[warmest]:+.1f}F on "
+                     f"{stats.dates[warmest]:%Y-%m-%d}, {departures[coldest]:+.1f}F on "
+                     f"{stats.dates[coldest]:%Y-%m-%d}")
+    return lines
@@ -0,0 +1,168 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Indexed Weather Store
+
+Every view in the viewer works on the whole dates/highs/lows lists, so picking out a
+month, a season or a year means scanning the full series. WeatherStore builds a
+few indexes once, when the data is loaded, so those questions are answered without
+rescanning anything.
+
+Features & Flow:
+- Dates are kept as a sorted list of day numbers, so any date range is found with two
+  bisect lookups (O(log n)).
+- Running totals (prefix sums) of highs and lows give the mean of any range in O(1).
+- Sparse tables (the min/max of every power-of-two-long run) give the lowest and highest
+  value of any range in O(1): two overlapping runs always cover the range exactly.
+- Per-month and per-year aggregates (min, max, mean) are worked out once up front for
+  summary tables.
+- parse_range() turns text such as '2018', '2018-03', 'summer 2018' or
+  '2018-03-01 2018-05-31' into start and end dates.
+'''
+
+from bisect import bisect_left
+from datetime import date
+
+from sitka_dates import parse_date
+
+# Months in each season; winter runs from December of the year before.
+SEASONS = {'winter': (12, 1, 2), 'spring': (3, 4, 5), 'summer': (6, 7, 8), 'fall': (9, 10, 11)}
+
+
+def prefix_sums(values):
+    """Returns a list where item i is the sum of the first i values."""
+    sums = [0]
+    for value in values:
+        sums.append(sums[-1] + value)
+    return sums
+
+
+def sparse_table(values, pick):
+    """
+    Returns levels where levels[k][i] is pick() of values[i:i + 2**k].
+    pick is min or max.
+    """
+    levels = [list(values)]
+    width = 1
+    while width * 2 <= len(values):
+        previous = levels[-1]
+        levels.append([pick(previous[i], previous[i + width])
+                       for i in range(len(previous) - width)])
+        width *= 2
+    return levels
+
+
+def range_pick(levels, pick, start, stop):
+    """Returns pick() of values[start:stop] from a sparse table, in O(1)."""
+    level = (stop - start).bit_length() - 1
+    row = levels[level]
+    return pick(row[start], row[stop - (1 << level)])
+
+
+def month_end(year, month):
+    """Returns the first day of the month after year/month."""
+    return date(year + month // 12, month % 12 + 1, 1)
+
+
+def parse_range(text):
+    """
+    Returns (start, end, label) for text such as '2018', '2018-03', 'summer 2018'
+    or '2018-03-01 2018-05-31'. end is the day after the range ends.
+    Raises ValueError for anything else.
+    """
+    parts = text.lower().split()
+    if len(parts) == 2 and parts[0] in SEASONS:
+        year = int(parts[1])
+        months = SEASONS[parts[0]]
+        first_year = year - 1 if parts[0] == 'winter' else year
+        start = date(first_year, months[0], 1)
+        return start, month_end(year, months[-1]), f"{parts[0].title()} {year}"
+    if len(parts) == 2:
+        start, end = parse_date(parts[0]).date(), parse_date(parts[1]).date()
+        if end < start:
+            raise ValueError("the end date is before the start date")
+        return start, date.fromordinal(end.toordinal() + 1), f"{start} to {end}"
+    if len(parts) == 1 and len(parts[0]) == 4:
+        year = int(parts[0])
+        return date(year, 1, 1), date(year + 1, 1, 1), str(year)
+    if len(parts) == 1 and len(parts[0]) == 7 and parts[0][4] == '-':
+        year, month = int(parts[0][:4]), int(parts[0][5:])
+        start = date(year, month, 1)
+        return start, month_end(year, month), start.strftime('%B %Y')
+    if len(parts) == 1:
+        day = parse_date(parts[0]).date()
+        return day, date.fromordinal(day.toordinal() + 1), str(day)
+    raise ValueError(f"could not understand date range {text!r}")
+
+
+class WeatherStore:
+    """Date-indexed highs and lows with O(log n) range lookups and O(1) range statistics."""
+
+    def __init__(self, dates, highs, lows):
+        self.days = [day.toordinal() for day in dates]
+        if any(a > b for a, b in zip(self.days, self.days[1:])):
+            raise ValueError("dates must be in order")
+        self.dates = list(dates)
+        self.series = {'high': list(highs), 'low': list(lows)}
+        self.sums = {kind: prefix_sums(values) for kind, values in self.series.items()}
+        self.lowest = {kind: sparse_table(values, min) for kind, values in self.series.items()}
+        self.highest = {kind: sparse_table(values, max) for kind, values in self.series.items()}
+        self.monthly = self.aggregate(lambda day: (day.year, day.month))
+        self.yearly = self.aggregate(lambda day: day.year)
+
+    def __len__(self):
+        return len(self.days)
+
+    def aggregate(self, key):
+        """Returns {key: {kind: (min, max, mean)}} for consecutive rows sharing a key."""
+        groups = {}
+        start = 0
+        for i in range(1, len(self.dates) + 1):
+            if i == len(self.dates) or key(self.dates[i]) != key(self.dates[start]):
+                groups[key(self.dates[start])] = self.stats(start, i)
+                start = i
+        return groups
+
+    def index_range(self, start, end):
+        """Returns (first, stop) row indices for dates from start up to (not including) end."""
+        return (bisect_left(self.days, start.toordinal()),
+                bisect_left(self.days, end.toordinal()))
+
+    def stats(self, first, stop):
+        """Returns {kind: (min, max, mean)} for rows first:stop, or None if there are none."""
+        if first >= stop:
+            return None
+        return {kind: (range_pick(self.lowest[kind], min, first, stop),
+                       range_pick(self.highest[kind], max, first, stop),
+                       (self.sums[kind][stop] - self.sums[kind][first]) / (stop - first))
+                for kind in self.series}
+
+    def query(self, start, end):
+        """Returns {kind: (min, max, mean)} for dates from start up to end, or None."""
+        return self.stats(*self.index_range(start, end))
+
+    def select(self, start, end):
+        """Returns (dates, highs, lows) lists for dates from start up to end."""
+        first, stop = self.index_range(start, end)
+        return self.dates[first:stop], self.series['high'][first:stop], self.series['low'][first:stop]
+
+    def summary_table(self, by='month', start=None, end=None):
+        """
+        Returns printable lines with min/max/mean highs and lows per month or year,
+        limited to the months or years that overlap start up to end if given.
+        """
+        groups = self.monthly if by == 'month' else self.yearly
+        lines = [f"{'Period':10} {'High min/max/mean':>18}  {'Low min/max/mean':>18}"]
+        for group, stats in groups.items():
+            if by == 'month':
+                first_day, after = date(*group, 1), month_end(*group)
+                label = f"{group[0]}-{group[1]:02}"
+            else:
+                first_day, after = date(group, 1, 1), date(group + 1, 1, 1)
+                label = str(group)
+            if (start is not None and after <= start) or (end is not None and first_day >= end):
+                continue
+            high, low = stats['high'], stats['low']
+            lines.append(f"{label:10} {high[0]:>6}/{high[1]:>4}/{high[2]:6.1f}  "
+                         f"{low[0]:>6}/{low[1]:>4}/{low[2]:6.1f}")
+        return lines
@@ -0,0 +1,79 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Batch Chart Rendering Tests
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import sitka_batch
+
+
+class BatchRenderTestCase(unittest.TestCase):
+    """Tests for rendering charts to image files with no display."""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.csv_file = os.path.join(self.folder, 'weather.csv')
+        with open(self.csv_file, 'w') as f:
+            f.write('"STATION","NAME","DATE","TMAX","TMIN"\n')
+            day = date(2017, 12, 20)
+            while day < date(2018, 1, 10):
+                f.write(f'"AB:1","Alpha","{day}","{40 + day.day % 7}","{30 + day.day % 5}"\n')
+                if day.year == 2018:
+                    f.write(f'"B2","Beta","{day}","{20 + day.day}","{10 + day.day}"\n')
+                day += timedelta(days=1)
+
+    def expected_files(self, out_dir, temp_types):
+        """Returns the chart files there should be: Alpha has 2017 and 2018, Beta only 2018."""
+        return sorted(sitka_batch.chart_filename(out_dir, station_id, year, temp_type)
+                      for station_id, year in [('AB:1', 2017), ('AB:1', 2018), ('B2', 2018)]
+                      for temp_type in temp_types)
+
+    def assert_charts(self, out_dir, temp_types):
+        """Checks that out_dir holds exactly the expected PNG files."""
+        expected = self.expected_files(out_dir, temp_types)
+        self.assertEqual(sorted(os.path.join(out_dir, name) for name in os.listdir(out_dir)), expected)
+        for filename in expected:
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_one_task_per_station_year(self):
+        """Does year_tasks() split each station's rows by calendar year?"""
+        stations = sitka_batch.ingest(self.csv_file, 1)
+        tasks = list(sitka_batch.year_tasks(stations, ('high',), 'out'))
+        self.assertEqual([(task[0], task[2], len(task[3])) for task in tasks],
+                         [('AB:1', 2017, 12), ('AB:1', 2018, 9), ('B2', 2018, 9)])
+        self.assertEqual(tasks[2][4][:2], [21, 22])
+        self.assertTrue(sitka_batch.chart_filename('out', 'AB:1', 2017, 'high').endswith('AB_1_2017_high.png'))
+
+    def test_render_in_this_process_reuses_figure(self):
+        """With one worker, is every chart drawn on the same figure?"""
+        out_dir = os.path.join(self.folder, 'charts')
+        with mock.patch.object(sitka_batch, '_figure', None), \
+                mock.patch.object(sitka_batch.plt, 'subplots', wraps=sitka_batch.plt.subplots) as subplots:
+            count = sitka_batch.render_charts(self.csv_file, out_dir, workers=1)
+            fig = sitka_batch._figure[0]
+        sitka_batch.plt.close(fig)
+        self.assertEqual(count, 9)
+        self.assertEqual(subplots.call_count, 1)
+        self.assert_charts(out_dir, sitka_batch.TEMP_TYPES)
+
+    def test_render_with_pool(self):
+        """Do worker processes write the same set of charts, from the command line too?"""
+        out_dir = os.path.join(self.folder, 'pool')
+        with mock.patch('builtins.print') as printed:
+            sitka_batch.main([self.csv_file, '--out', out_dir, '--types', 'high', 'both',
+                              '--workers', '2', '--overlays', 'mean'])
+        self.assertEqual(printed.call_args.args[0], f"Wrote 6 charts to {out_dir}")
+        self.assert_charts(out_dir, ('high', 'both'))
+
+
+if __name__ == '__main__':
+    unittest.main()
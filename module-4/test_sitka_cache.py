@@ -0,0 +1,92 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Columnar Weather Cache Tests
+'''
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import sitka_cache
+import sitka_highs_cms
+
+ROWS = '''"STATION","NAME","DATE","PRCP","TAVG","TMAX","TMIN"
+"USW00025333","SITKA AIRPORT, AK US","2018-01-01","0.45",,"48","38"
+"USW00025333","SITKA AIRPORT, AK US","2018-01-02",,,"48","43"
+"USW00025333","SITKA AIRPORT, AK US","2018-01-03","0.40",,"hot","41"
+"USW00025333","SITKA AIRPORT, AK US","2018-01-04","0.99",,"-3","-12"
+"USW00025333","SITKA AIRPORT, AK US","2018-02-30","0.10",,"40","30"
+'''
+
+
+class WeatherCacheTestCase(unittest.TestCase):
+    """Tests for the binary column cache next to the weather CSV."""
+
+    def setUp(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        self.csv_file = os.path.join(folder, 'weather.csv')
+        with open(self.csv_file, 'w') as f:
+            f.write(ROWS)
+
+    def read(self):
+        """Runs read_weather_data() on fresh lists; returns the lists and the printed lines."""
+        columns = ([], [], [], [])
+        with mock.patch.multiple(sitka_highs_cms, dates=columns[0], highs=columns[1],
+                                 lows=columns[2], precip=columns[3]), \
+                mock.patch('builtins.print') as printed:
+            sitka_highs_cms.read_weather_data(self.csv_file)
+        return columns, [call.args[0] for call in printed.call_args_list]
+
+    def test_cache_matches_csv(self):
+        """Does a cached load give the same columns and the same skipped-row warnings?"""
+        parsed, first_warnings = self.read()
+        self.assertIsNotNone(sitka_cache.load_cache(self.csv_file))
+        cached, cached_warnings = self.read()
+
+        self.assertEqual(len(first_warnings), 2)
+        self.assertEqual(cached_warnings, first_warnings)
+        self.assertTrue(all('Skipping invalid row' in line for line in cached_warnings))
+        self.assertEqual(cached[:3], parsed[:3])
+        self.assertEqual([day.day for day in cached[0]], [1, 2, 4])
+        self.assertEqual(cached[1:3], ([48, 48, -3], [38, 43, -12]))
+        self.assertEqual(cached[3][0], 0.45)
+        self.assertTrue(math.isnan(cached[3][1]))
+
+    def test_changed_csv_invalidates_cache(self):
+        """Is the cache ignored once the CSV's size or modification time changes?"""
+        self.read()
+        stat = os.stat(self.csv_file)
+        os.utime(self.csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(sitka_cache.load_cache(self.csv_file))
+
+        self.read()  # Rewrites the cache for the new modification time.
+        self.assertIsNotNone(sitka_cache.load_cache(self.csv_file))
+        with open(self.csv_file, 'a') as f:
+            f.write('"USW00025333","SITKA AIRPORT, AK US","2018-01-05","0.10",,"45","37"\n')
+        os.utime(self.csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(sitka_cache.load_cache(self.csv_file))
+        self.assertEqual(len(self.read()[0][0]), 4)
+
+    def test_damaged_cache_is_ignored(self):
+        """Is a truncated or foreign cache file treated as no cache at all?"""
+        sitka_cache.write_cache(self.csv_file, [736695], [48], [38], [0.45], ['Skipping invalid row 3: x'])
+        columns = sitka_cache.load_cache(self.csv_file)
+        self.assertEqual((list(columns['highs']), columns['warnings']), ([48], ['Skipping invalid row 3: x']))
+        del columns
+
+        cache_file = sitka_cache.cache_path(self.csv_file)
+        with open(cache_file, 'r+b') as f:
+            f.truncate(os.path.getsize(cache_file) - 1)
+        self.assertIsNone(sitka_cache.load_cache(self.csv_file))
+        with open(cache_file, 'wb') as f:
+            f.write(b'JUNK' * 20)
+        self.assertIsNone(sitka_cache.load_cache(self.csv_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
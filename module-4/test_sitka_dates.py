@@ -0,0 +1,76 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Fast Date Parsing Tests
+'''
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import sitka_dates
+from sitka_dates import DATE_FORMAT
+
+
+def strptime_result(value):
+    """Returns what datetime.strptime() gives for value: the datetime or the ValueError message."""
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except ValueError as e:
+        return str(e)
+
+
+def parse_date_result(value):
+    """Returns what parse_date() gives for value, and whether it used fromisoformat()'s answer."""
+    with mock.patch.object(sitka_dates, 'datetime', wraps=datetime) as patched:
+        try:
+            result = sitka_dates.parse_date(value)
+        except ValueError as e:
+            result = str(e)
+    return result, not patched.strptime.called
+
+
+class DateParsingTestCase(unittest.TestCase):
+    """Tests for the fromisoformat() fast path and the day number cache."""
+
+    def test_valid_dates_use_fast_path(self):
+        """Does every valid YYYY-MM-DD date take the fast path and match strptime()?"""
+        day = datetime(2015, 12, 25)
+        for _ in range(800):
+            value = day.strftime(DATE_FORMAT)
+            self.assertEqual(parse_date_result(value), (strptime_result(value), True), value)
+            day += timedelta(days=1)
+
+    def test_bad_values_fall_back(self):
+        """Are malformed or impossible dates left to strptime(), with the same result or error?"""
+        for value in ['2018-02-30', '2018-13-01', '2018-1-5', '2018-01-5', '', '   ', 'not a date',
+                      '2018/01/05', '20180105', '2018-01-05T00:00', '2018-W01-1', '+018-01-05']:
+            with self.subTest(value=value):
+                self.assertEqual(parse_date_result(value), (strptime_result(value), False))
+
+    def test_surrounding_whitespace(self):
+        """Is a date with spaces or a newline around it treated exactly like strptime() does?"""
+        for value in [' 2018-01-05', '2018-01-05 ', ' 2018-01-05 ', '2018-01-05\n', '\t2018-01-05']:
+            with self.subTest(value=value):
+                result, fast = parse_date_result(value)
+                self.assertEqual(result, strptime_result(value))
+                self.assertIsInstance(result, str)
+                self.assertFalse(fast)
+
+    def test_parse_day(self):
+        """Are day numbers right, remembered, and forgotten once too many are stored?"""
+        with mock.patch.object(sitka_dates, '_days', {}), \
+                mock.patch.object(sitka_dates, 'MAX_REMEMBERED_DAYS', 2):
+            self.assertEqual(sitka_dates.parse_day('2018-01-05'), datetime(2018, 1, 5).toordinal())
+            self.assertEqual(sitka_dates.parse_day('2018-01-05'), datetime(2018, 1, 5).toordinal())
+            sitka_dates.parse_day('2018-01-06')
+            self.assertEqual(len(sitka_dates._days), 2)
+            sitka_dates.parse_day('2018-01-07')
+            self.assertEqual(list(sitka_dates._days), ['2018-01-07'])
+            with self.assertRaisesRegex(ValueError, 'day is out of range'):
+                sitka_dates.parse_day('2018-02-30')
+            self.assertNotIn('2018-02-30', sitka_dates._days)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Level-of-Detail Plotting Tests
+'''
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+from matplotlib.figure import Figure
+
+import sitka_downsample
+from sitka_downsample import minmax_indices
+
+
+class DownsampleTestCase(unittest.TestCase):
+    """Tests for min/max downsampling and the zoom-aware line."""
+
+    def assert_extremes_kept(self, y, buckets):
+        """Checks that minmax_indices() keeps the ends and every bucket's lowest and highest value."""
+        keep = minmax_indices(y, buckets)
+        self.assertEqual(keep.tolist(), sorted(set(keep.tolist())))
+        self.assertEqual((keep[0], keep[-1]), (0, len(y) - 1))
+        self.assertLessEqual(len(keep), 2 * buckets + 2)
+        size = -(-len(y) // buckets)
+        for start in range(0, len(y), size):
+            bucket = y[start:start + size]
+            kept = [y[i] for i in keep if start <= i < start + size and not np.isnan(y[i])]
+            values = bucket[~np.isnan(bucket)]
+            if len(values):
+                self.assertEqual((min(kept), max(kept)), (values.min(), values.max()), f'bucket at {start}')
+        return keep
+
+    def test_every_bucket_keeps_its_extremes(self):
+        """For random series of many lengths, is each bucket's min and max kept?"""
+        rng = np.random.default_rng(7)
+        for count, buckets in [(1000, 10), (1001, 10), (999, 7), (365 * 30, 200), (50, 24)]:
+            with self.subTest(count=count, buckets=buckets):
+                self.assert_extremes_kept(rng.normal(size=count).cumsum(), buckets)
+
+    def test_gaps_never_win(self):
+        """Are NaN gaps skipped, with an all-NaN bucket keeping a single point?"""
+        y = np.sin(np.arange(400) / 10)
+        y[::7] = np.nan
+        y[100:200] = np.nan
+        keep = self.assert_extremes_kept(y, 20)
+        self.assertEqual(len([i for i in keep if 100 <= i < 200]), 5)
+
+    def test_short_series_unchanged(self):
+        """Is a series with no more than two points per bucket returned whole?"""
+        for count, buckets in [(0, 5), (1, 5), (10, 5), (10, 0)]:
+            self.assertEqual(minmax_indices(range(count), buckets).tolist(), list(range(count)))
+
+    def test_plot_downsampled(self):
+        """Is a long line drawn reduced, given back its detail when zoomed in, and a short one left alone?"""
+        ax = Figure(figsize=(2, 1), dpi=100).add_subplot()
+        days = [datetime(2000, 1, 1) + timedelta(days=i) for i in range(20000)]
+        highs = np.sin(np.arange(20000) / 50) * 20 + 50
+        line = sitka_downsample.plot_downsampled(ax, days, highs)
+        drawn = len(line.get_ydata())
+        self.assertLess(drawn, 2 * int(ax.bbox.width) + 2)
+        self.assertEqual((max(line.get_ydata()), min(line.get_ydata())), (highs.max(), highs.min()))
+
+        ax.set_xlim(days[1000], days[1050])
+        self.assertEqual(list(line.get_ydata()), list(highs[999:1052]))
+
+        short = sitka_downsample.plot_downsampled(ax, days[:100], highs[:100])
+        self.assertEqual(list(short.get_ydata()), list(highs[:100]))
+        self.assertFalse(hasattr(short, 'lod'))
+
+
+if __name__ == '__main__':
+    unittest.main()
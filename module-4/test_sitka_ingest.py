@@ -0,0 +1,108 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Multi-Station Ingestion Tests
+'''
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import sitka_highs_cms
+import sitka_ingest
+
+
+def write_csv(filename, header, rows):
+    """Writes a NOAA-style CSV file with every value quoted."""
+    with open(filename, 'w') as f:
+        f.write(','.join(f'"{name}"' for name in header) + '\n')
+        for row in rows:
+            f.write(','.join(f'"{value}"' for value in row) + '\n')
+
+
+class IngestTestCase(unittest.TestCase):
+    """Tests for loading many weather files and stations at once."""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def path(self, name):
+        """Returns the path of name inside the test folder."""
+        return os.path.join(self.folder, name)
+
+    def test_columns_found_by_header_name(self):
+        """Are columns found by name, in any order and case, with missing ones reported?"""
+        columns = sitka_ingest.resolve_columns(['tmin', ' DATE ', 'Station', 'PRCP', 'TMAX'])
+        self.assertEqual([columns[name] for name in sitka_ingest.REQUIRED_COLUMNS], [2, 1, 4, 0])
+        with self.assertRaisesRegex(ValueError, 'TMAX, TMIN'):
+            sitka_ingest.resolve_columns(['STATION', 'DATE'])
+
+        write_csv(self.path('moved.csv'), ['TMIN', 'DATE', 'STATION', 'TMAX'],
+                  [['38', '2018-01-01', 'A', '48']])
+        _, stations, _, _, error = sitka_ingest.parse_weather_file(self.path('moved.csv'))
+        self.assertIsNone(error)
+        self.assertEqual((stations['A']['highs'].tolist(), stations['A']['lows'].tolist()), ([48], [38]))
+        self.assertTrue(math.isnan(stations['A']['prcp'][0]))  # No PRCP column.
+
+    def test_rows_split_by_station(self):
+        """Are interleaved rows split by STATION, sorted by date, and bad or out-of-range rows skipped?"""
+        header = ['STATION', 'NAME', 'DATE', 'PRCP', 'TMAX', 'TMIN']
+        write_csv(self.path('mixed.csv'), header, [
+            ['A', 'Alpha', '2018-01-02', '0.5', '50', '40'],
+            ['B', 'Beta', '2018-01-01', '', '30', '20'],
+            ['A', 'Alpha', '2018-01-01', '0.25', '48', '38'],
+            ['B', 'Beta', 'not a date', '', '31', '21'],
+            ['A', 'Alpha', '2018-01-03', '0.1', '99999', '40'],
+        ])
+        with mock.patch('builtins.print') as printed:
+            stations = sitka_ingest.ingest(self.path('mixed.csv'))
+        self.assertEqual(sorted(stations), ['A', 'B'])
+        self.assertEqual(stations['A']['name'], 'Alpha')
+        dates, highs, lows, precip = sitka_ingest.station_series(stations['A'])
+        self.assertEqual(dates, [datetime(2018, 1, 1), datetime(2018, 1, 2)])
+        self.assertEqual((highs, lows, precip), ([48, 50], [38, 40], [0.25, 0.5]))
+        self.assertEqual(len(stations['B']['days']), 1)
+        self.assertIn('row 5', printed.call_args_list[0].args[0])
+        self.assertIn('row 6: temperature out of range', printed.call_args_list[1].args[0])
+
+    def test_parallel_matches_serial(self):
+        """Do worker processes give exactly the same stations as parsing in this process?"""
+        header = ['STATION', 'NAME', 'DATE', 'PRCP', 'TMAX', 'TMIN']
+        for year in (2016, 2017, 2018):
+            os.makedirs(self.path(str(year)))
+            rows = [[station, station.lower(), f'{year}-{month:02}-{day:02}', '0.1',
+                     str(40 + day), str(30 + day)]
+                    for month in range(12, 0, -1) for day in (15, 1) for station in ('X', 'Y')]
+            write_csv(self.path(os.path.join(str(year), 'data.csv')), header, rows)
+        write_csv(self.path('broken.csv'), ['DATE', 'TMAX'], [['2018-01-01', '1']])
+
+        with mock.patch('builtins.print'):
+            serial = sitka_ingest.ingest(self.folder, workers=1)
+            parallel = sitka_ingest.ingest(self.folder, workers=3)
+        self.assertEqual(len(sitka_ingest.find_weather_files(self.folder)), 4)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sorted(serial), ['X', 'Y'])
+        self.assertEqual(len(serial['X']['days']), 72)
+        self.assertEqual(list(serial['X']['days']), sorted(serial['X']['days']))
+
+    def test_viewer_loads_one_station(self):
+        """Does the viewer fill its lists from the chosen (or largest) station?"""
+        header = ['STATION', 'DATE', 'TMAX', 'TMIN']
+        write_csv(self.path('stations.csv'), header, [
+            ['A', '2018-01-01', '48', '38'], ['B', '2018-01-01', '30', '20'], ['B', '2018-01-02', '31', '21']])
+        for station_id, expected in ((None, [30, 31]), ('A', [48])):
+            lists = ([], [], [], [])
+            with mock.patch.multiple(sitka_highs_cms, dates=lists[0], highs=lists[1],
+                                     lows=lists[2], precip=lists[3]), mock.patch('builtins.print'):
+                sitka_highs_cms.load_station_data(self.path('stations.csv'), station_id)
+            self.assertEqual(lists[1], expected)
+            self.assertEqual(len(lists[0]), len(lists[3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Rolling Statistics Tests
+'''
+
+import math
+import random
+import unittest
+from datetime import date, timedelta
+
+from sitka_stats import DegreeDays, RollingWindow, TemperatureStats
+
+
+class RollingStatsTestCase(unittest.TestCase):
+    """Tests for the streaming rolling statistics."""
+
+    def test_window_matches_naive(self):
+        """Do the rolling mean, min and max match recomputing every window?"""
+        rng = random.Random(1)
+        values = [rng.randint(-20, 90) for _ in range(500)]
+        window = RollingWindow(7)
+        for i, value in enumerate(values):
+            window.push(value)
+            recent = values[max(0, i - 6):i + 1]
+            self.assertEqual(window.minimum(), min(recent))
+            self.assertEqual(window.maximum(), max(recent))
+            self.assertAlmostEqual(window.mean(), sum(recent) / len(recent))
+
+    def test_degree_days(self):
+        """Are heating and cooling degree-days taken from each day's average?"""
+        degree_days = DegreeDays(65)
+        degree_days.push(60, 40)  # Average 50: 15 heating degree-days.
+        degree_days.push(80, 70)  # Average 75: 10 cooling degree-days.
+        self.assertEqual((degree_days.heating, degree_days.cooling), (15, 10))
+
+    def test_incremental_append(self):
+        """Does appending rows later give the same results as adding them all at once?"""
+        days = [date(2018, 1, 1) + timedelta(i) for i in range(40)]
+        highs = [50 + i % 9 for i in range(40)]
+        lows = [30 + i % 5 for i in range(40)]
+        whole, parts = TemperatureStats(), TemperatureStats()
+        whole.extend(days, highs, lows)
+        parts.extend(days[:25], highs[:25], lows[:25])
+        parts.extend(days[25:], highs[25:], lows[25:])
+        self.assertTrue(math.isnan(whole.rolling[('high', 'mean')][5]))
+        for key, values in whole.rolling.items():
+            self.assertEqual(values[6:], parts.rolling[key][6:])
+        self.assertEqual(whole.heating, parts.heating)
+
+
+if __name__ == '__main__':
+    unittest.main()
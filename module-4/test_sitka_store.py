@@ -0,0 +1,44 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 4 – Sitka Weather: Indexed Weather Store Tests
+'''
+
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from sitka_store import WeatherStore, parse_range
+
+
+class WeatherStoreTestCase(unittest.TestCase):
+    """Tests for date-range lookups and range statistics."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.dates = [datetime(2017, 11, 1) + timedelta(days=i) for i in range(500)]
+        self.highs = [rng.randint(30, 80) for _ in self.dates]
+        self.lows = [high - rng.randint(5, 20) for high in self.highs]
+        self.store = WeatherStore(self.dates, self.highs, self.lows)
+
+    def test_query_matches_scan(self):
+        """Do range statistics match scanning the lists directly?"""
+        for text in ('2018', '2018-02', 'winter 2018', '2018-03-05 2018-03-05', '2017-12-30 2018-01-02'):
+            start, end, _ = parse_range(text)
+            chosen = [i for i, day in enumerate(self.dates) if start <= day.date() < end]
+            highs = [self.highs[i] for i in chosen]
+            lowest, highest, mean = self.store.query(start, end)['high']
+            self.assertEqual((lowest, highest), (min(highs), max(highs)), text)
+            self.assertAlmostEqual(mean, sum(highs) / len(highs))
+
+    def test_empty_range(self):
+        """Is a range with no data reported as None?"""
+        self.assertIsNone(self.store.query(date(2000, 1, 1), date(2001, 1, 1)))
+
+    def test_season_crosses_year(self):
+        """Does winter start in December of the year before?"""
+        self.assertEqual(parse_range('winter 2018')[:2], (date(2017, 12, 1), date(2018, 3, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
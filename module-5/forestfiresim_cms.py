@@ -24,24 +24,29 @@ def install_bext():
         print(f'Technical detail: {e}')
         sys.exit(1)
 
-# Try importing bext
-try:
-    import bext
-except ImportError:
-    print('This program requires the bext module.')
-    print('1. Install bext now') # Added option to install bext -cms
-    print('2. Exit program')
-    while True:
-        choice = input('Choose an option (1 or 2): ').strip()
-        if choice in ('1', '2'):
-            break
-        print('Invalid choice. Please enter 1 or 2.')
-
-    if choice == '1':
-        bext = install_bext()  # Get the imported module instead of restarting -cms
-    else:
-        print('Exiting program.')
-        sys.exit()
+bext = None  # Imported by loadBext() so headless runs never hit the install prompt -cms
+
+def loadBext():
+    """Import 'bext' for terminal drawing, offering to install it if it is missing."""
+    global bext
+    try:
+        import bext
+    except ImportError:
+        print('This program requires the bext module.')
+        print('1. Install bext now') # Added option to install bext -cms
+        print('2. Exit program')
+        while True:
+            choice = input('Choose an option (1 or 2): ').strip()
+            if choice in ('1', '2'):
+                break
+            print('Invalid choice. Please enter 1 or 2.')
+
+        if choice == '1':
+            bext = install_bext()  # Get the imported module instead of restarting -cms
+        else:
+            print('Exiting program.')
+            sys.exit()
+    return bext
 
 # Set up the constants:
 WIDTH = 79
@@ -60,43 +65,82 @@ FIRE_CHANCE = 0.01  # Chance a tree is hit by lightning & burns.
 PAUSE_LENGTH = 0.5
 
 def main():
+    loadBext()
     forest = createNewForest()
     bext.clear()
 
     while True:  # Main program loop.
         displayForest(forest)
+        forest = stepForest(forest)
+        time.sleep(PAUSE_LENGTH)
 
-        # Run a single simulation step:
-        nextForest = {'width': forest['width'], 'height': forest['height']}
-
-        for x in range(forest['width']):
-            for y in range(forest['height']):
-                if (x, y) in nextForest:
-                    # If we've already set nextForest[(x, y)] on a previous iteration, just do nothing here:
-                    continue
-
-                if (forest[(x, y)] == EMPTY) and (random.random() <= GROW_CHANCE):
-                    # Grow a tree in this empty space.
-                    nextForest[(x, y)] = TREE
-                elif (forest[(x, y)] == TREE) and (random.random() <= FIRE_CHANCE):
-                    # Lightning sets this tree on fire.
-                    nextForest[(x, y)] = FIRE
-                elif forest[(x, y)] == FIRE:
-                    # This tree is currently burning.
-                    # Loop through all the neighboring spaces:
-                    for ix in range(-1, 2):
-                        for iy in range(-1, 2):
-                            # Fire spreads to neighboring trees:
-                            if forest.get((x + ix, y + iy)) == TREE:
-                                nextForest[(x + ix, y + iy)] = FIRE
-                    # The tree has burned down now, so erase it:
-                    nextForest[(x, y)] = EMPTY
-                else:
-                    # Just copy the existing object:
-                    nextForest[(x, y)] = forest[(x, y)]
+def stepForest(forest):
+    """Runs a single simulation step and returns the next forest."""
+    nextForest = {'width': forest['width'], 'height': forest['height']}
+
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            if (x, y) in nextForest:
+                # If we've already set nextForest[(x, y)] on a previous iteration, just do nothing here:
+                continue
+
+            if (forest[(x, y)] == EMPTY) and (random.random() <= GROW_CHANCE):
+                # Grow a tree in this empty space.
+                nextForest[(x, y)] = TREE
+            elif (forest[(x, y)] == TREE) and (random.random() <= FIRE_CHANCE):
+                # Lightning sets this tree on fire.
+                nextForest[(x, y)] = FIRE
+            elif forest[(x, y)] == FIRE:
+                # This tree is currently burning.
+                # Loop through all the neighboring spaces:
+                for ix in range(-1, 2):
+                    for iy in range(-1, 2):
+                        # Fire spreads to neighboring trees:
+                        if forest.get((x + ix, y + iy)) == TREE:
+                            nextForest[(x + ix, y + iy)] = FIRE
+                # The tree has burned down now, so erase it:
+                nextForest[(x, y)] = EMPTY
+            else:
+                # Just copy the existing object:
+                nextForest[(x, y)] = forest[(x, y)]
+    return nextForest
+
+def forestStats(forest, previousForest=None):
+    """Returns a dict of tree, fire and empty counts for the forest.
+
+    If previousForest is given, 'burned' is the number of trees that
+    caught fire between the two forests.
+    """
+    stats = {'trees': 0, 'fires': 0, 'empty': 0, 'burned': 0}
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            cell = forest[(x, y)]
+            if cell == TREE:
+                stats['trees'] += 1
+            elif cell == FIRE:
+                stats['fires'] += 1
+                if previousForest is not None and previousForest[(x, y)] == TREE:
+                    stats['burned'] += 1
+            else:
+                stats['empty'] += 1
+    return stats
+
+def runHeadless(steps, forest=None):
+    """Run the simulation for a number of steps with no drawing, printing or sleeping.
+
+    Returns a list with one forestStats() dict per step. Never imports bext. -cms
+    """
+    if forest is None:
+        forest = createNewForest()
+
+    history = []
+    for step in range(steps):
+        nextForest = stepForest(forest)
+        stats = forestStats(nextForest, forest)
+        stats['step'] = step + 1
+        history.append(stats)
         forest = nextForest
-
-        time.sleep(PAUSE_LENGTH)
+    return history
 
 def createNewForest():
     """Returns a dictionary for a new forest data structure."""
@@ -0,0 +1,48 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 5 – Forest Fire Sim: Headless Mode Tests
+'''
+
+import random
+import unittest
+
+import forestfiresim_cms as sim
+
+
+class HeadlessTestCase(unittest.TestCase):
+    """Tests for runHeadless() and forestStats()."""
+
+    def setUp(self):
+        state = random.getstate()
+        self.addCleanup(random.setstate, state)  # The sim uses the shared 'random' module.
+
+    def seededRun(self, seed, steps=40):
+        """Runs the sim headless from a seeded 'random' module and returns its history."""
+        random.seed(seed)
+        return sim.runHeadless(steps)
+
+    def test_counts_cover_every_cell(self):
+        """Do the tree, fire and empty counts add up to WIDTH * HEIGHT on every step?"""
+        history = self.seededRun(1)
+        self.assertEqual([stats['step'] for stats in history], list(range(1, 41)))
+        for stats in history:
+            self.assertEqual(stats['trees'] + stats['fires'] + stats['empty'], sim.WIDTH * sim.HEIGHT)
+            self.assertLessEqual(stats['burned'], stats['fires'])
+        self.assertIsNone(sim.bext)  # Headless runs never import bext.
+
+    def test_seeded_run_is_deterministic(self):
+        """Does the same seed give the same run, and another seed a different one?"""
+        self.assertEqual(self.seededRun(5), self.seededRun(5))
+        self.assertNotEqual(self.seededRun(5), self.seededRun(6))
+
+    def test_burned_counts_new_fires(self):
+        """Does 'burned' count only trees that were not burning in the previous forest?"""
+        forest = {'width': 2, 'height': 1, (0, 0): sim.FIRE, (1, 0): sim.FIRE}
+        previous = {'width': 2, 'height': 1, (0, 0): sim.TREE, (1, 0): sim.FIRE}
+        self.assertEqual(sim.forestStats(forest, previous),
+                         {'trees': 0, 'fires': 2, 'empty': 0, 'burned': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,22 @@
-import random, sys, time
+import math, random, sys, time
+from dataclasses import dataclass
 
-try:
-    import bext
-except ImportError:
-    print('This program requires the bext module, which you')
-    print('can install by following the instructions at')
-    print('https://pypi.org/project/Bext/')
-    sys.exit()
+from forestfiresim_clusters import FireTracker
+
+bext = None  # Imported by loadBext() so headless runs never need it -CMS
+
+
+def loadBext():
+    """Import 'bext' for terminal drawing, exiting if it is not installed."""
+    global bext
+    try:
+        import bext
+    except ImportError:
+        print('This program requires the bext module, which you')
+        print('can install by following the instructions at')
+        print('https://pypi.org/project/Bext/')
+        sys.exit()
+    return bext
 
 # Set up the constants:
 WIDTH = 79
@@ -17,6 +27,10 @@ FIRE = '@'
 EMPTY = ' '
 LAKE = '~'  # Character for the lake (water feature) -CMS
 LAKE_COLOR = 'blue'  # Color for the lake -CMS
+ROAD = '='  # Roads and firebreaks never burn (see forestfiresim_terrain.py) -CMS
+ROAD_COLOR = 'white'
+FIREBREAK = '#'
+FIREBREAK_COLOR = 'yellow'
 
 # (!) Try changing these settings to anything between 0.0 and 1.0:
 INITIAL_TREE_DENSITY = 0.20  # Amount of forest that starts with trees.
@@ -26,76 +40,187 @@ FIRE_CHANCE = 0.01  # Chance a tree is hit by lightning & burns.
 # (!) Try setting the pause length to 1.0 or 0.0:
 PAUSE_LENGTH = 0.5
 
+LAKE_RADIUS = 7  # 60% the size of the original max radius (was up to 12) -CMS
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """Settings for one simulation run, so runs don't depend on the module globals. -CMS"""
+    width: int = WIDTH
+    height: int = HEIGHT
+    initial_tree_density: float = INITIAL_TREE_DENSITY
+    grow_chance: float = GROW_CHANCE
+    fire_chance: float = FIRE_CHANCE
+    lake_radius: int = LAKE_RADIUS
+    seed: int | None = None  # None uses the shared 'random' module instead of a seeded stream.
+
+    def makeRandom(self, stream=None):
+        """Returns the random number source for a run with this config.
 
-def main():
-    forest = createNewForest()
-    placeLake(forest)  # Add the fixed-size lake to the forest -CMS
+        Named streams ('init', 'step', ...) are seeded separately from the same
+        seed, so e.g. the starting forest doesn't change when the step code does.
+        """
+        if self.seed is None:
+            return random
+        if stream is None:
+            return random.Random(self.seed)
+        return random.Random(f'{self.seed}:{stream}')
+
+
+def main(tracker=None, terrain=None):
+    import forestfiresim_terrain  # Imported here because it imports this module.
+    loadBext()
+    if terrain is None:
+        config = SimConfig()
+        # The fixed-size lake, as a terrain layer so the step skips it -CMS
+        terrain = forestfiresim_terrain.lakeTerrain(config.width, config.height, config.lake_radius)
+    else:
+        config = SimConfig(width=terrain.width, height=terrain.height)
+    forest = forestfiresim_terrain.placeTerrain(createNewForest(config), terrain)
     bext.clear()
 
     while True:  # Main program loop.
         displayForest(forest)
+        forest = stepForest(forest, config, tracker=tracker, terrain=terrain)
+        if tracker is not None:
+            tracker.endStep()
+        time.sleep(PAUSE_LENGTH)
 
-        # Run a single simulation step:
-        nextForest = {'width': forest['width'],
-                      'height': forest['height']}
 
-        for x in range(forest['width']):
-            for y in range(forest['height']):
-                if (x, y) in nextForest:
-                    # If we've already set nextForest[(x, y)] on a
-                    # previous iteration, just do nothing here:
-                    continue
-
-                if (forest[(x, y)] == EMPTY) and (random.random() <= GROW_CHANCE):
-                    # Grow a tree in this empty space.
-                    nextForest[(x, y)] = TREE
-                elif (forest[(x, y)] == TREE) and (random.random() <= FIRE_CHANCE):
-                    # Lightning sets this tree on fire.
-                    nextForest[(x, y)] = FIRE
-                elif forest[(x, y)] == FIRE:
-                    # This tree is currently burning.
-                    # Loop through all the neighboring spaces:
-                    for ix in range(-1, 2):
-                        for iy in range(-1, 2):
-                            # Fire spreads to neighboring trees:
-                            if forest.get((x + ix, y + iy)) == TREE:
-                                nextForest[(x + ix, y + iy)] = FIRE
-                    # The tree has burned down now, so erase it:
-                    nextForest[(x, y)] = EMPTY
-                else:
-                    # Just copy the existing object:
-                    nextForest[(x, y)] = forest[(x, y)]
-        forest = nextForest
+def stepForest(forest, config=None, rng=random, rolls=None, tracker=None, terrain=None):
+    """Runs a single simulation step and returns the next forest.
 
-        time.sleep(PAUSE_LENGTH)
+    rolls, if given, is a function (x, y) -> float in [0, 1) used for the growth
+    and lightning rolls instead of rng.random(), so other engines can be fed
+    exactly the same rolls (see forestfiresim_replay.py).
 
+    tracker, if given, is a FireTracker that is told about every ignition;
+    call tracker.endStep() after each step.
 
-def createNewForest():
+    terrain, if given, is the Terrain from forestfiresim_terrain.py painted into
+    the forest. Its non-flammable cells are copied across in one go and only the
+    cells that can burn are visited. Non-flammable cells never use a roll, so the
+    result is the same as without the terrain, just faster. -CMS
+    """
+    config = SimConfig() if config is None else config
+    roll = (lambda x, y: rng.random()) if rolls is None else rolls
+    nextForest = {'width': forest['width'],
+                  'height': forest['height']}
+    if terrain is None:
+        cells = ((x, y) for x in range(forest['width']) for y in range(forest['height']))
+    else:
+        nextForest.update(terrain.blockedForest())
+        cells = terrain.flammableCells()
+
+    for x, y in cells:
+        if (x, y) in nextForest:
+            # If we've already set nextForest[(x, y)] on a
+            # previous iteration, just do nothing here:
+            continue
+
+        if (forest[(x, y)] == EMPTY) and (roll(x, y) <= config.grow_chance):
+            # Grow a tree in this empty space.
+            nextForest[(x, y)] = TREE
+        elif (forest[(x, y)] == TREE) and (roll(x, y) <= config.fire_chance):
+            # Lightning sets this tree on fire.
+            nextForest[(x, y)] = FIRE
+            if tracker is not None:
+                tracker.strike((x, y))
+        elif forest[(x, y)] == FIRE:
+            # This tree is currently burning.
+            # Loop through all the neighboring spaces:
+            for ix in range(-1, 2):
+                for iy in range(-1, 2):
+                    # Fire spreads to neighboring trees:
+                    if forest.get((x + ix, y + iy)) == TREE:
+                        nextForest[(x + ix, y + iy)] = FIRE
+                        if tracker is not None:
+                            tracker.spread((x, y), (x + ix, y + iy))
+            # The tree has burned down now, so erase it:
+            nextForest[(x, y)] = EMPTY
+        else:
+            # Just copy the existing object:
+            nextForest[(x, y)] = forest[(x, y)]
+    return nextForest
+
+
+def forestStats(forest, previousForest=None):
+    """Returns a dict of tree, fire and empty counts for the forest.
+
+    If previousForest is given, 'burned' is the number of trees that
+    caught fire between the two forests.
+    """
+    stats = {'trees': 0, 'fires': 0, 'empty': 0, 'burned': 0}
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            cell = forest[(x, y)]
+            if cell == TREE:
+                stats['trees'] += 1
+            elif cell == FIRE:
+                stats['fires'] += 1
+                if previousForest is not None and previousForest[(x, y)] == TREE:
+                    stats['burned'] += 1
+            elif cell == EMPTY:
+                stats['empty'] += 1
+    return stats
+
+
+def runHeadless(steps, forest=None, config=None, tracker=None, terrain=None):
+    """Run the simulation for a number of steps with no drawing, printing or sleeping.
+
+    Returns a list with one forestStats() dict per step. Pass a FireTracker to
+    also collect per-fire statistics. A new forest gets terrain (by default the
+    lake from lakeTerrain()) painted into it; a given forest should already have it.
+    """
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom('step')
+    if forest is None:
+        import forestfiresim_terrain  # Imported here because it imports this module.
+        if terrain is None:
+            terrain = forestfiresim_terrain.lakeTerrain(config.width, config.height, config.lake_radius)
+        forest = createNewForest(config, config.makeRandom('init'))
+        forestfiresim_terrain.placeTerrain(forest, terrain)
+
+    history = []
+    for step in range(steps):
+        nextForest = stepForest(forest, config, rng, tracker=tracker, terrain=terrain)
+        if tracker is not None:
+            tracker.endStep()
+        stats = forestStats(nextForest, forest)
+        stats['step'] = step + 1
+        history.append(stats)
+        forest = nextForest
+    return history
+
+
+def createNewForest(config=None, rng=random):
     """Returns a dictionary for a new forest data structure."""  
-    forest = {'width': WIDTH, 'height': HEIGHT}
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            if (random.random() * 100) <= INITIAL_TREE_DENSITY:
+    config = SimConfig() if config is None else config
+    forest = {'width': config.width, 'height': config.height}
+    for x in range(config.width):
+        for y in range(config.height):
+            if (rng.random() * 100) <= config.initial_tree_density:
                 forest[(x, y)] = TREE  # Start as a tree.
             else:
                 forest[(x, y)] = EMPTY  # Start as an empty space.
     return forest
 
 
-def placeLake(forest):
+def placeLake(forest, config=None):
     """Place a fixed-size lake in the center of the forest that acts as a firebreak."""  # -CMS
-    lake_radius = 7  # 60% the size of the original max radius (was up to 12) -CMS
-    lake_center_x = WIDTH // 2  # Center of the lake horizontally -CMS
-    lake_center_y = HEIGHT // 2  # Center of the lake vertically -CMS
-
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            # Calculate the distance from the center of the lake
-            distance = ((x - lake_center_x) ** 2 + (y - lake_center_y) ** 2) ** 0.5
+    config = SimConfig() if config is None else config
+    lake_radius = config.lake_radius
+    lake_center_x = forest['width'] // 2  # Center of the lake horizontally -CMS
+    lake_center_y = forest['height'] // 2  # Center of the lake vertically -CMS
 
-            # If the distance is less than the radius, fill the area with lake tiles
-            if distance <= lake_radius:
-                forest[(x, y)] = LAKE  # Set the lake tile
+    # Only visit the rows the lake covers, and in each row only the span of
+    # columns within lake_radius of the center, instead of every cell -CMS
+    for y in range(max(0, lake_center_y - lake_radius),
+                   min(forest['height'], lake_center_y + lake_radius + 1)):
+        half_width = math.isqrt(lake_radius ** 2 - (y - lake_center_y) ** 2)
+        for x in range(max(0, lake_center_x - half_width),
+                       min(forest['width'], lake_center_x + half_width + 1)):
+            forest[(x, y)] = LAKE  # Set the lake tile
 
 
 def displayForest(forest):
@@ -114,6 +239,12 @@ def displayForest(forest):
             elif forest[(x, y)] == LAKE:  # Check for lake and color it blue -CMS
                 bext.fg(LAKE_COLOR)  # Use blue color for the lake -CMS
                 print(LAKE, end='')
+            elif forest[(x, y)] == ROAD:
+                bext.fg(ROAD_COLOR)
+                print(ROAD, end='')
+            elif forest[(x, y)] == FIREBREAK:
+                bext.fg(FIREBREAK_COLOR)
+                print(FIREBREAK, end='')
 
         print()
     bext.fg('reset')  # Use the default font color.
@@ -124,7 +255,11 @@ def displayForest(forest):
 
 # If this program was run (instead of imported), run the game:
 if __name__ == '__main__':
+    tracker = FireTracker()
     try:
-        main()
+        main(tracker)
     except KeyboardInterrupt:
+        if bext is not None:
+            bext.fg('reset')
+        print('\n' + tracker.report())  # Per-fire statistics for the run -CMS
         sys.exit()  # When Ctrl-C is pressed, end the program.
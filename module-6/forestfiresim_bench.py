@@ -0,0 +1,209 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Step Benchmark
+
+Program Overview:
+Measures how the dict-based stepForest() in forestfiresim_cms.py (module 5) and
+forestfiresim_325.py (module 6) scales with grid size, tree density and fire
+activity. Results are printed as a table and can be appended as JSON lines to a
+file, so runs on different days or commits can be compared to catch regressions.
+
+Features & Flow:
+- Builds a forest of the requested size with a given fraction of trees and of burning trees.
+- Times whole steps of the real stepForest() to get steps/second and cells/second.
+- Measures peak memory for building the forest plus one step with tracemalloc.
+- Splits a step into growth (empty cells), lightning (trees), spread (burning cells) and
+  copy (lakes, roads and firebreaks) by sorting the cells by kind and timing the real
+  stepForest() over each group as one block, so there is no per-cell clock call. Each
+  phase's share is then applied to the real step time.
+- Sizes run from 79x22 up to 10000x10000. The dict forest needs roughly 150 bytes per
+  cell, so sizes above --max-cells are skipped unless --max-cells 0 is given.
+
+Usage:
+    python forestfiresim_bench.py
+    python forestfiresim_bench.py --sizes 79x22 1000x1000 --output bench.jsonl
+'''
+
+import argparse, datetime, importlib.util, json, os, platform, random, sys, time, tracemalloc
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, EMPTY, SimConfig
+
+DEFAULT_SIZES = ['79x22', '320x100', '1000x1000', '3162x3162', '10000x10000']
+DEFAULT_MAX_CELLS = 4_000_000
+MIN_SECONDS = 1.0  # Keep stepping each size until at least this much time has passed...
+MAX_STEPS = 50  # ...or this many steps have run.
+PHASES = ('growth', 'lightning', 'spread', 'copy')
+
+MODULE_5_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', 'module-5', 'forestfiresim_cms.py')
+
+
+def loadModule5():
+    """Imports forestfiresim_cms.py from the module-5 folder, or returns None if it is missing."""
+    if not os.path.exists(MODULE_5_PATH):
+        return None
+    spec = importlib.util.spec_from_file_location('forestfiresim_cms', MODULE_5_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def buildForest(width, height, tree_density, fire_density, rng):
+    """Returns a dict forest where tree_density of the cells are trees, fire_density of those burning."""
+    forest = {'width': width, 'height': height}
+    for x in range(width):
+        for y in range(height):
+            if rng.random() < tree_density:
+                forest[(x, y)] = FIRE if rng.random() < fire_density else TREE
+            else:
+                forest[(x, y)] = EMPTY
+    return forest
+
+
+class CellGroup:
+    """Stands in for a Terrain so stepForest() visits only the given cells.
+
+    stepForest() loops over terrain.flammableCells() and copies terrain.blockedForest()
+    across, so passing a CellGroup steps just one kind of cell with the real loop.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def flammableCells(self):
+        return self.cells
+
+    def blockedForest(self):
+        return {}
+
+
+def phaseTimes(forest, config, rng):
+    """Returns the ns the real stepForest() spends on each phase's cells, timed as one block each."""
+    groups = {phase: [] for phase in PHASES}
+    kinds = {EMPTY: 'growth', TREE: 'lightning', FIRE: 'spread'}
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            groups[kinds.get(forest[(x, y)], 'copy')].append((x, y))
+
+    phases = {}
+    for phase, cells in groups.items():
+        start = time.perf_counter_ns()
+        sim.stepForest(forest, config, rng, terrain=CellGroup(cells))
+        phases[phase] = time.perf_counter_ns() - start
+    return phases
+
+
+def makeStepper(engine, config, rng):
+    """Returns a function that runs one real step of the chosen engine."""
+    if engine == 'forestfiresim_cms':
+        module = loadModule5()
+        module.GROW_CHANCE, module.FIRE_CHANCE = config.grow_chance, config.fire_chance
+        module.random = rng  # The module 5 loop calls random.random() directly.
+        return module.stepForest
+    return lambda forest: sim.stepForest(forest, config, rng)
+
+
+def benchmark(engine, width, height, tree_density, fire_density, config, measureMemory=True):
+    """Runs one benchmark and returns its result dict."""
+    rng = random.Random(config.seed)
+    step = makeStepper(engine, config, rng)
+
+    peakMemory = None
+    if measureMemory:
+        tracemalloc.start()
+        step(buildForest(width, height, tree_density, fire_density, rng))
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    forest = buildForest(width, height, tree_density, fire_density, rng)
+    phases = phaseTimes(forest, config, rng)
+
+    steps = 0
+    start = time.perf_counter()
+    while steps < MAX_STEPS and (steps == 0 or time.perf_counter() - start < MIN_SECONDS):
+        forest = step(forest)
+        steps += 1
+    seconds = time.perf_counter() - start
+
+    stepSeconds = seconds / steps
+    phaseTotal = sum(phases.values()) or 1
+    return {
+        'engine': engine,
+        'width': width,
+        'height': height,
+        'tree_density': tree_density,
+        'fire_density': fire_density,
+        'grow_chance': config.grow_chance,
+        'fire_chance': config.fire_chance,
+        'steps': steps,
+        'seconds': round(seconds, 4),
+        'steps_per_sec': round(steps / seconds, 3),
+        'cells_per_sec': round(width * height * steps / seconds),
+        'peak_memory_bytes': peakMemory,
+        'phase_seconds': {phase: round(stepSeconds * phases[phase] / phaseTotal, 6)
+                          for phase in PHASES},
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def parseSize(text):
+    """Turns '79x22' into (79, 22)."""
+    try:
+        width, height = text.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}', expected WIDTHxHEIGHT")
+
+
+def printResult(result):
+    """Print one result as a table row."""
+    phases = '  '.join(f"{phase} {result['phase_seconds'][phase] * 1000:.1f}ms" for phase in PHASES)
+    memory = ('-' if result['peak_memory_bytes'] is None
+              else f"{result['peak_memory_bytes'] / 2 ** 20:.1f}MB")
+    print(f"{result['engine']:<18} {result['width']:>6}x{result['height']:<6} "
+          f"{result['steps_per_sec']:>10.3f} steps/s {result['cells_per_sec']:>12,} cells/s "
+          f"{memory:>10}  {phases}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dict-based forest fire step.')
+    parser.add_argument('--sizes', nargs='+', type=parseSize, default=[parseSize(s) for s in DEFAULT_SIZES])
+    parser.add_argument('--engines', nargs='+', default=['forestfiresim_cms', 'forestfiresim_325'],
+                        choices=['forestfiresim_cms', 'forestfiresim_325'])
+    parser.add_argument('--tree-density', type=float, nargs='+', default=[0.5])
+    parser.add_argument('--fire-density', type=float, nargs='+', default=[0.01])
+    parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS,
+                        help='skip grids with more cells than this (0 = no limit)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', help='append results as JSON lines to this file')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    engines = [engine for engine in args.engines
+               if engine != 'forestfiresim_cms' or loadModule5() is not None]
+    config = SimConfig(seed=args.seed)
+    for width, height in args.sizes:
+        if args.max_cells and width * height > args.max_cells:
+            print(f'[Info] Skipping {width}x{height}: more than --max-cells {args.max_cells:,} cells')
+            continue
+        for engine in engines:
+            for tree_density in args.tree_density:
+                for fire_density in args.fire_density:
+                    result = benchmark(engine, width, height, tree_density, fire_density,
+                                       config, measureMemory=not args.no_memory)
+                    printResult(result)
+                    if args.output:
+                        with open(args.output, 'a') as f:
+                            f.write(json.dumps(result) + '\n')
+
+
+# If this program was run (instead of imported), run the benchmarks:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,228 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Bitboard Engine
+
+Program Overview:
+An engine for the forest fire sim that needs nothing outside the standard library,
+for machines where NumPy can't be installed. The whole grid is stored as a few
+Python big-ints used as bitboards: one bit per cell for trees, one for fires, one
+for each kind of non-flammable cell. Fire spread to the 8 neighbours becomes a
+handful of shifts, ORs and ANDs over the whole grid at once, so a step is a fixed
+number of big-int operations (each running at C speed) instead of one dict lookup
+per cell.
+
+Features & Flow:
+- Bit y * stride + x holds cell (x, y). Each row has one spare "guard" bit (stride =
+  width + 1) that never holds a tree, so a sideways shift can never wrap a fire into
+  the next row.
+- Random masks where each bit is set with a given chance are built from a few
+  getrandbits() calls combined with AND/OR, one per binary digit of the chance.
+- The rules match stepForest() in forestfiresim_325.py: empty cells grow with GROW_CHANCE,
+  trees burn from lightning (FIRE_CHANCE) or a burning neighbour, fires burn out, and
+  lake/road/firebreak cells never change.
+- Memory is a few bits per cell instead of 100+ bytes per cell for the dict forest.
+- bitsFromForest() / forestFromBits() convert to and from the dict format, using
+  whole-string and whole-int conversions rather than per-cell loops where possible.
+- runHeadless() returns the same per-step statistics as forestfiresim_325.runHeadless().
+'''
+
+import math, sys, time
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, EMPTY, LAKE, ROAD, FIREBREAK, PAUSE_LENGTH, SimConfig
+
+CHANCE_BITS = 24  # Binary digits of precision used for growth and lightning chances.
+CELL_CHARS = (EMPTY, TREE, FIRE, LAKE, ROAD, FIREBREAK)
+BLOCKED_CHARS = (LAKE, ROAD, FIREBREAK)
+
+# Turns the ASCII '0'/'1' digits of a binary string into the byte values 0/1:
+DIGIT_TABLE = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def randomMask(bits, chance, rng):
+    """Returns a bits-wide int where each bit is 1 with the given chance.
+
+    Works through the binary digits of chance from the last one to the first:
+    OR-ing in a random word for a 1 digit and AND-ing for a 0 digit halves the
+    current chance and adds 1/2 or 0, so each bit ends up set with exactly
+    chance (rounded to CHANCE_BITS digits).
+    """
+    if chance <= 0 or bits == 0:
+        return 0
+    if chance >= 1:
+        return (1 << bits) - 1
+    digits = round(chance * (1 << CHANCE_BITS))
+    if digits == 0:
+        return 0
+    mask = 0
+    # Trailing zero digits would only AND with 0 again, so start at the last 1 digit:
+    for i in range((digits & -digits).bit_length() - 1, CHANCE_BITS):
+        if digits >> i & 1:
+            mask |= rng.getrandbits(bits)
+        else:
+            mask &= rng.getrandbits(bits)
+    return mask
+
+
+def newBoard(width, height):
+    """Returns an empty bitboard state for a width x height forest."""
+    stride = width + 1
+    # Every real cell, leaving the guard bit of each row clear:
+    allCells = int(('0' + '1' * width) * height, 2) if width and height else 0
+    return {'width': width, 'height': height, 'stride': stride, 'all': allCells,
+            'trees': 0, 'fires': 0, 'blocked': {}}
+
+
+def blockedBits(state):
+    """Returns one bitboard of every non-flammable cell."""
+    blocked = 0
+    for bits in state['blocked'].values():
+        blocked |= bits
+    return blocked
+
+
+def emptyBits(state):
+    """Returns a bitboard of the empty cells."""
+    return state['all'] & ~(state['trees'] | state['fires'] | blockedBits(state))
+
+
+def rowsToBits(rows, char):
+    """Returns a bitboard with a 1 wherever the row strings hold char."""
+    table = {ord(ch): '0' for ch in CELL_CHARS}
+    table[ord(char)] = '1'
+    # Each row gets a '0' guard bit; the string is reversed because bit 0 is cell (0, 0):
+    full = ''.join(row.translate(table) + '0' for row in rows)
+    return int(full[::-1], 2) if full else 0
+
+
+def bitsToBytes(bits, count):
+    """Returns count bytes holding 0 or 1, one per bit of a bitboard (bit 0 first)."""
+    return format(bits, f'0{count}b')[::-1].encode('ascii').translate(DIGIT_TABLE)
+
+
+def bitsFromForest(forest):
+    """Converts a dict forest from forestfiresim_325.py into a bitboard state."""
+    state = newBoard(forest['width'], forest['height'])
+    rows = [''.join([forest[(x, y)] for x in range(forest['width'])]) for y in range(forest['height'])]
+    state['trees'] = rowsToBits(rows, TREE)
+    state['fires'] = rowsToBits(rows, FIRE)
+    for char in BLOCKED_CHARS:
+        bits = rowsToBits(rows, char)
+        if bits:
+            state['blocked'][char] = bits
+    return state
+
+
+def bitsRows(state):
+    """Returns the forest as a list of row strings, e.g. for DiffRenderer."""
+    count = state['height'] * state['stride']
+    # The layers never overlap, so adding "one byte per cell" ints multiplied by each
+    # layer's code gives every cell's code in its own byte without any carries:
+    codes = int.from_bytes(bitsToBytes(state['trees'], count), 'little')
+    codes += 2 * int.from_bytes(bitsToBytes(state['fires'], count), 'little')
+    for char, bits in state['blocked'].items():
+        codes += CELL_CHARS.index(char) * int.from_bytes(bitsToBytes(bits, count), 'little')
+    table = bytes(ord(CELL_CHARS[i]) if i < len(CELL_CHARS) else 0 for i in range(256))
+    text = codes.to_bytes(count, 'little').translate(table).decode('ascii') if count else ''
+    stride, width = state['stride'], state['width']
+    return [text[y * stride:y * stride + width] for y in range(state['height'])]
+
+
+def forestFromBits(state):
+    """Converts a bitboard state back into the dict forest used by displayForest()."""
+    forest = {'width': state['width'], 'height': state['height']}
+    for y, row in enumerate(bitsRows(state)):
+        for x, char in enumerate(row):
+            forest[(x, y)] = char
+    return forest
+
+
+def lakeBits(state, lake_radius):
+    """Returns a bitboard of the lake placed by placeLake(), built one row span at a time."""
+    width, height, stride = state['width'], state['height'], state['stride']
+    centerX, centerY = width // 2, height // 2
+    lake = 0
+    for y in range(max(0, centerY - lake_radius), min(height, centerY + lake_radius + 1)):
+        half = math.isqrt(lake_radius ** 2 - (y - centerY) ** 2)
+        x0, x1 = max(0, centerX - half), min(width - 1, centerX + half)
+        lake |= ((1 << (x1 - x0 + 1)) - 1) << (y * stride + x0)
+    return lake
+
+
+def createBitForest(config=None, rng=None):
+    """Returns a bitboard state for a new forest, including the lake."""
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom() if rng is None else rng
+    state = newBoard(config.width, config.height)
+    count = config.height * state['stride']
+    lake = lakeBits(state, config.lake_radius)
+    # Matches createNewForest(), which compares random.random() * 100 to the density:
+    trees = randomMask(count, config.initial_tree_density / 100, rng) & state['all']
+    state['trees'] = trees & ~lake
+    if lake:
+        state['blocked'][LAKE] = lake
+    return state
+
+
+def stepBits(state, config=None, rng=None):
+    """Runs a single simulation step in place and returns the number of trees that caught fire."""
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom() if rng is None else rng
+    stride = state['stride']
+    count = state['height'] * stride
+    trees, fires = state['trees'], state['fires']
+
+    # Every cell next to a fire: spread sideways, then spread that up and down.
+    # Stray bits that land on guard bits or past the grid are harmless because
+    # they are only ever ANDed with trees.
+    sideways = fires | (fires << 1) | (fires >> 1)
+    nearFire = sideways | (sideways << stride) | (sideways >> stride)
+
+    lightning = randomMask(count, config.fire_chance, rng)
+    ignited = trees & (nearFire | lightning)
+    grown = emptyBits(state) & randomMask(count, config.grow_chance, rng)
+
+    state['trees'] = (trees & ~ignited) | grown
+    state['fires'] = ignited  # The old fires have burned down now.
+    return ignited.bit_count()
+
+
+def runHeadless(steps, state=None, config=None):
+    """Run the bitboard engine for a number of steps with no drawing, printing or sleeping.
+
+    Returns a list with one stats dict per step, in the same format as
+    forestfiresim_325.forestStats().
+    """
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom('step')
+    if state is None:
+        state = createBitForest(config, config.makeRandom('init'))
+
+    history = []
+    for step in range(steps):
+        burned = stepBits(state, config, rng)
+        history.append({'trees': state['trees'].bit_count(), 'fires': state['fires'].bit_count(),
+                        'empty': emptyBits(state).bit_count(), 'burned': burned, 'step': step + 1})
+    return history
+
+
+def main():
+    config = SimConfig()
+    rng = config.makeRandom()
+    state = createBitForest(config, rng)
+    sim.loadBext()
+    sim.bext.clear()
+
+    while True:  # Main program loop.
+        sim.displayForest(forestFromBits(state))
+        stepBits(state, config, rng)
+        time.sleep(PAUSE_LENGTH)
+
+
+# If this program was run (instead of imported), run the game:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,143 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Fire Cluster Tracking
+
+Program Overview:
+Tracks every individual fire while the simulation runs: how many cells it burned,
+how many steps it lasted, and how much area each lightning strike ended up burning.
+stepForest() in forestfiresim_325.py reports each ignition to a FireTracker as it
+happens, and the tracker gives the new fire cell the ID of the fire it came from.
+When fires meet, a union-find structure merges their IDs into one. Only ignitions
+are ever looked at, so tracking adds almost nothing to the cost of a step.
+
+Features & Flow:
+- strike(cell) starts a new fire; spread(source, target) adds target to source's fire.
+- If a cell is reached by two different fires in one step, the fires are merged (union by size).
+- A tree that lightning and a spreading fire both reach in one step belongs to the spreading
+  fire, and the strike is dropped; stepForest() only reports it when it visits the tree first.
+- endStep() finishes every fire that lit no new cells this step, since it has now burned out.
+- finished holds (size, duration, strikes) for every fire that has burned out.
+- sizeHistogram() buckets fire sizes by powers of two; report() gives a printable summary.
+'''
+
+
+class FireTracker:
+    """Attributes every burning cell to the lightning strike that started its fire."""
+
+    def __init__(self):
+        self.parent = []  # Union-find parent of each fire ID.
+        self.size = []  # Cells burned, kept up to date at each root.
+        self.start = []  # Step the fire started on, kept at each root.
+        self.end = []  # Last step the fire lit a cell on, kept at each root.
+        self.strikes = []  # Lightning strikes merged into the fire, kept at each root.
+        self.burning = {}  # Cells that caught fire this step -> fire ID.
+        self.struck = set()  # Cells lightning set on fire this step.
+        self.previous = {}  # Cells burning during this step (they caught fire last step) -> fire ID.
+        self.finished = []  # (size, duration, strikes) of every fire that has burned out.
+        self.step = 0
+
+    def newFire(self, strikes=1, size=1):
+        """Create a fire ID for a fire that has burned size cells so far."""
+        fire = len(self.parent)
+        self.parent.append(fire)
+        self.size.append(size)
+        self.start.append(self.step)
+        self.end.append(self.step)
+        self.strikes.append(strikes)
+        return fire
+
+    def find(self, fire):
+        """Returns the root fire ID, halving the path as it goes."""
+        parent = self.parent
+        while parent[fire] != fire:
+            parent[fire] = parent[parent[fire]]
+            fire = parent[fire]
+        return fire
+
+    def union(self, a, b):
+        """Merge two fires and return the root of the merged fire."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.start[a] = min(self.start[a], self.start[b])
+        self.end[a] = max(self.end[a], self.end[b])
+        self.strikes[a] += self.strikes[b]
+        return a
+
+    def strike(self, cell):
+        """Lightning set cell on fire."""
+        if cell not in self.burning:
+            self.burning[cell] = self.newFire()
+            self.struck.add(cell)
+
+    def spread(self, source, target):
+        """Fire spread from the burning cell source to the tree at target."""
+        fire = self.previous.get(source)
+        if fire is None:
+            # A fire that was already burning when tracking started. The cells
+            # it burned before then were never seen, so it starts at size 0:
+            fire = self.previous[source] = self.newFire(strikes=0, size=0)
+        if target in self.struck:
+            # Lightning hit this tree earlier in the step, but the fire reached it
+            # too. Hand the cell to this fire and drop the strike, so the result
+            # doesn't depend on which cell stepForest() visited first.
+            self.struck.discard(target)
+            struck = self.burning[target]
+            root = self.find(fire)
+            self.parent[struck] = root
+            self.burning[target] = root
+            self.size[root] += 1
+            self.end[root] = self.step
+            return
+        if target in self.burning:
+            self.union(fire, self.burning[target])  # Two fires met at target.
+            return
+        root = self.find(fire)
+        self.burning[target] = root
+        self.size[root] += 1
+        self.end[root] = self.step
+
+    def endStep(self):
+        """Call once after every step. Finishes the fires that lit nothing this step."""
+        active = {self.find(fire) for fire in self.burning.values()}
+        for root in {self.find(fire) for fire in self.previous.values()} - active:
+            self.finish(root)
+        self.previous = self.burning
+        self.burning = {}
+        self.struck = set()
+        self.step += 1
+
+    def finish(self, root):
+        """Records a fire that has burned out."""
+        self.finished.append((self.size[root], self.end[root] - self.start[root] + 1, self.strikes[root]))
+
+    def sizeHistogram(self):
+        """Returns [(smallest, largest, count), ...] of finished fire sizes in power-of-two buckets."""
+        counts = {}
+        for size, _, _ in self.finished:
+            bucket = size.bit_length() - 1
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return [(1 << bucket, (2 << bucket) - 1, counts[bucket]) for bucket in sorted(counts)]
+
+    def report(self):
+        """Returns a printable summary of the finished fires."""
+        if not self.finished:
+            return 'No fires have burned out yet.'
+        sizes = [size for size, _, _ in self.finished]
+        durations = [duration for _, duration, _ in self.finished]
+        strikes = sum(strike for _, _, strike in self.finished)
+        lines = [f'Fires burned out: {len(self.finished)}',
+                 f'Largest fire: {max(sizes)} cells, longest: {max(durations)} steps',
+                 f'Mean fire size: {sum(sizes) / len(sizes):.1f} cells over '
+                 f'{sum(durations) / len(durations):.1f} steps',
+                 f'Area burned per lightning strike: {sum(sizes) / max(1, strikes):.1f} cells',
+                 'Fire size histogram:']
+        for smallest, largest, count in self.sizeHistogram():
+            label = f'{smallest}' if smallest == largest else f'{smallest}-{largest}'
+            lines.append(f'  {label:>11} cells: {count}')
+        return '\n'.join(lines)
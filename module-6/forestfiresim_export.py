@@ -0,0 +1,182 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Frame Export
+
+Program Overview:
+Writes a simulation run to disk one frame at a time, so runs of thousands of frames
+can be turned into pictures and animations for reports. Each frame is written as soon as
+it is made and then forgotten, so memory use stays the same however long the run is.
+Frames come from any engine as row strings (the same rows DiffRenderer draws).
+
+Features & Flow:
+- 'png': a numbered PNG sequence in a folder (frame_00000.png, ...). Written with zlib
+  from the standard library, so no extra packages are needed.
+- 'gif': one animated GIF. Each frame is encoded and appended on its own with
+  Pillow's GifImagePlugin.getdata(), so earlier frames are never kept in memory.
+- 'raw': one uint8 cell code per cell, frames back to back, plus a small JSON file
+  giving the size and frame count. Codes match forestfiresim_numpy.py, so a raw file
+  can be read back with numpy.memmap(...).reshape(frames, height, width).
+- every=N only keeps every Nth frame; shrink=N keeps every Nth row and column, so a
+  10000x10000 grid can be exported as a 1000x1000 movie.
+- The format is picked from the file extension when it isn't given.
+'''
+
+import json, os, struct, sys, zlib
+
+from forestfiresim_325 import TREE, FIRE, EMPTY, LAKE, ROAD, FIREBREAK, SimConfig
+from forestfiresim_pipeline import makeEngine
+
+CELL_CHARS = (EMPTY, TREE, FIRE, LAKE, ROAD, FIREBREAK)  # Index is the cell code.
+CODE_TABLE = str.maketrans({char: chr(code) for code, char in enumerate(CELL_CHARS)})
+
+# RGB colour of each cell code (close to the terminal colours of displayForest()):
+PALETTE = ((0, 0, 0), (0, 160, 0), (230, 40, 20), (30, 80, 220), (150, 150, 150), (200, 160, 40))
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# (!) Try changing these settings:
+EXPORT_FILE = 'forestfire.gif'  # .gif, .raw, or a folder name for a PNG sequence.
+EXPORT_STEPS = 500
+EXPORT_EVERY = 1  # Keep every Nth frame.
+EXPORT_SHRINK = 1  # Keep every Nth row and column.
+EXPORT_FPS = 20  # Playback speed of GIF exports.
+
+
+def frameCodes(rows, shrink=1):
+    """Returns (width, height, codes) for a frame, with one byte of cell code per cell."""
+    if shrink > 1:
+        rows = [row[::shrink] for row in rows[::shrink]]
+    width = len(rows[0]) if rows else 0
+    return width, len(rows), ''.join(rows).translate(CODE_TABLE).encode('latin-1')
+
+
+def pngChunk(kind, data):
+    """Returns one PNG chunk: length, type, data and CRC."""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def writePng(filename, width, height, codes):
+    """Writes the cell codes as an 8-bit palette PNG."""
+    # Every PNG row starts with a filter-type byte; 0 means the row is stored as is.
+    compressor = zlib.compressobj(6)
+    data = b''.join(compressor.compress(b'\x00' + codes[y * width:(y + 1) * width])
+                    for y in range(height)) + compressor.flush()
+    with open(filename, 'wb') as pngFile:
+        pngFile.write(PNG_SIGNATURE)
+        pngFile.write(pngChunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)))
+        pngFile.write(pngChunk(b'PLTE', bytes(value for color in PALETTE for value in color)))
+        pngFile.write(pngChunk(b'IDAT', data))
+        pngFile.write(pngChunk(b'IEND', b''))
+
+
+def guessFormat(path):
+    """Returns 'gif', 'raw' or 'png' from the path's extension."""
+    extension = os.path.splitext(path)[1].lower()
+    return {'.gif': 'gif', '.raw': 'raw'}.get(extension, 'png')
+
+
+class FrameExporter:
+    """Streams frames to a PNG sequence, an animated GIF or a raw uint8 file."""
+
+    def __init__(self, path, format=None, every=1, shrink=1, fps=EXPORT_FPS):
+        self.path = path
+        self.format = guessFormat(path) if format is None else format
+        if self.format not in ('png', 'gif', 'raw'):
+            raise ValueError(f'Unknown export format: {self.format!r}')
+        self.every = max(1, every)
+        self.shrink = max(1, shrink)
+        self.duration = round(1000 / fps)  # GIF frame time in milliseconds.
+        self.seen = 0  # Frames passed to write(), including skipped ones.
+        self.written = 0
+        self.size = None
+        self.file = None
+        if self.format == 'png':
+            os.makedirs(path, exist_ok=True)
+        else:
+            self.file = open(path, 'wb')
+
+    def due(self):
+        """Returns True if the next frame passed to write() will be kept."""
+        return self.seen % self.every == 0
+
+    def write(self, rows):
+        """Export a frame given as a list of row strings, unless it is being skipped.
+
+        Skipped frames may be passed as None, so callers can avoid building them.
+        """
+        keep = self.due()
+        self.seen += 1
+        if not keep:
+            return
+        width, height, codes = frameCodes(rows, self.shrink)
+        if self.size is None:
+            self.size = (width, height)
+        elif self.size != (width, height):
+            raise ValueError(f'Frame size changed from {self.size} to {(width, height)}')
+
+        if self.format == 'png':
+            writePng(os.path.join(self.path, f'frame_{self.written:05d}.png'), width, height, codes)
+        elif self.format == 'raw':
+            self.file.write(codes)
+        else:
+            self.writeGifFrame(width, height, codes)
+        self.written += 1
+
+    def writeGifFrame(self, width, height, codes):
+        """Append one frame to the GIF, writing the GIF header before the first one."""
+        from PIL import Image, GifImagePlugin  # Only needed for GIF exports.
+        image = Image.frombytes('P', (width, height), codes)
+        image.putpalette([value for color in PALETTE for value in color])
+        if self.written == 0:
+            header, _ = GifImagePlugin.getheader(image, info={'loop': 0, 'optimize': False})
+            self.file.write(b''.join(header))
+        self.file.write(b''.join(GifImagePlugin.getdata(image, duration=self.duration)))
+
+    def close(self):
+        """Finish the file. Raw exports also get a JSON file describing the frames."""
+        if self.file is None:
+            return
+        if self.format == 'gif' and self.written:
+            self.file.write(b';')  # GIF trailer.
+        self.file.close()
+        self.file = None
+        if self.format == 'raw':
+            width, height = self.size or (0, 0)
+            with open(self.path + '.json', 'w') as infoFile:
+                json.dump({'width': width, 'height': height, 'frames': self.written,
+                           'dtype': 'uint8', 'cells': list(CELL_CHARS)}, infoFile)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def exportRun(path, steps, config=None, engine='dict', format=None, every=1, shrink=1, fps=EXPORT_FPS):
+    """Runs the simulation for a number of steps, exporting the starting frame and every step.
+
+    Returns the number of frames written.
+    """
+    config = SimConfig() if config is None else config
+    step, rows = makeEngine(engine, config)
+    with FrameExporter(path, format, every, shrink, fps) as exporter:
+        exporter.write(rows())
+        for _ in range(steps):
+            step()
+            exporter.write(rows() if exporter.due() else None)
+    return exporter.written
+
+
+def main():
+    print(f'Exporting {EXPORT_STEPS} steps to {EXPORT_FILE}...')
+    written = exportRun(EXPORT_FILE, EXPORT_STEPS, every=EXPORT_EVERY, shrink=EXPORT_SHRINK)
+    print(f'Done. Wrote {written} frames.')
+
+
+# If this program was run (instead of imported), export a run:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,193 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Frontier (Active-Set) Engine
+
+Program Overview:
+stepForest() in forestfiresim_325.py visits every cell on every step, even though
+fire can only reach the neighbours of cells that are already burning. This engine
+keeps the burning cells in a set and only expands their neighbourhoods, and it
+samples which cells grow or get struck by lightning instead of rolling a die for
+every cell. The cost of a step scales with the amount of activity, not with the
+size of the grid.
+
+Features & Flow:
+- Trees and empty spaces are kept in CellPools, which support O(1) add, remove and
+  lookup of the i-th cell; burning cells are a plain set; lake cells are in no pool.
+- Fire spreads from every burning cell to the trees among its 8 neighbours.
+- Growth and lightning use geometric skipping: the gap to the next chosen cell is
+  drawn directly, so each event costs one random draw and each cell still has exactly
+  GROW_CHANCE / FIRE_CHANCE of being chosen, the same as the reference loop.
+- runHeadless() returns the same per-step statistics as forestfiresim_325.runHeadless().
+- frontierFromForest() / forestFromFrontier() convert to and from the dict format.
+'''
+
+import math, sys, time
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, EMPTY, PAUSE_LENGTH, SimConfig
+
+# Offsets of the 8 neighbouring cells:
+NEIGHBOURS = [(ix, iy) for ix in range(-1, 2) for iy in range(-1, 2) if (ix, iy) != (0, 0)]
+
+
+class CellPool:
+    """A set of (x, y) cells that can also return the i-th cell in O(1)."""
+
+    def __init__(self, cells=()):
+        self.cells = []
+        self.index = {}
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def remove(self, cell):
+        # Move the last cell into the hole so removal stays O(1):
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+
+def sampleIndices(n, chance, rng):
+    """Returns the indices in range(n) chosen when each is picked with the given chance.
+
+    Draws the gap to the next picked index from a geometric distribution, so the
+    cost is proportional to the number of picks rather than to n.
+    """
+    if n == 0 or chance <= 0:
+        return []
+    if chance >= 1:
+        return list(range(n))
+    log_miss = math.log(1.0 - chance)
+    picks = []
+    i = -1
+    while True:
+        i += int(math.log(1.0 - rng.random()) / log_miss) + 1
+        if i >= n:
+            return picks
+        picks.append(i)
+
+
+def frontierFromForest(forest):
+    """Converts a dict forest from forestfiresim_325.py into frontier state."""
+    state = {'width': forest['width'], 'height': forest['height'],
+             'trees': CellPool(), 'empty': CellPool(), 'burning': set()}
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            cell = forest[(x, y)]
+            if cell == TREE:
+                state['trees'].add((x, y))
+            elif cell == FIRE:
+                state['burning'].add((x, y))
+            elif cell == EMPTY:
+                state['empty'].add((x, y))
+            # Anything else (the lake) never changes, so it isn't tracked.
+    return state
+
+
+def forestFromFrontier(state, lakeForest=None):
+    """Converts frontier state back into a dict forest for displayForest().
+
+    Cells in no pool are copied from lakeForest (normally the starting forest).
+    """
+    forest = {'width': state['width'], 'height': state['height']}
+    if lakeForest is not None:
+        forest.update(lakeForest)
+    for cell in state['trees'].cells:
+        forest[cell] = TREE
+    for cell in state['empty'].cells:
+        forest[cell] = EMPTY
+    for cell in state['burning']:
+        forest[cell] = FIRE
+    return forest
+
+
+def createFrontierForest(config=None, rng=None):
+    """Returns frontier state for a new forest, including the lake."""
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom() if rng is None else rng
+    forest = sim.createNewForest(config, rng)
+    sim.placeLake(forest, config)
+    return frontierFromForest(forest)
+
+
+def stepFrontier(state, config=None, rng=None):
+    """Runs a single simulation step in place and returns the number of trees that caught fire."""
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom() if rng is None else rng
+    trees, empty, burning = state['trees'], state['empty'], state['burning']
+
+    # Fire spreads to neighbouring trees:
+    newFires = set()
+    for x, y in burning:
+        for ix, iy in NEIGHBOURS:
+            if (x + ix, y + iy) in trees:
+                newFires.add((x + ix, y + iy))
+
+    # Lightning strikes and new growth are chosen from the cells as they were before this step:
+    newFires.update(trees.cells[i] for i in sampleIndices(len(trees), config.fire_chance, rng))
+    grown = [empty.cells[i] for i in sampleIndices(len(empty), config.grow_chance, rng)]
+
+    for cell in grown:
+        empty.remove(cell)
+        trees.add(cell)
+    for cell in newFires:
+        trees.remove(cell)
+    # The burning trees have burned down now, so erase them:
+    for cell in burning:
+        empty.add(cell)
+    state['burning'] = newFires
+    return len(newFires)
+
+
+def runHeadless(steps, state=None, config=None):
+    """Run the frontier engine for a number of steps with no drawing, printing or sleeping.
+
+    Returns a list with one stats dict per step, in the same format as
+    forestfiresim_325.forestStats().
+    """
+    config = SimConfig() if config is None else config
+    rng = config.makeRandom('step')
+    if state is None:
+        state = createFrontierForest(config, config.makeRandom('init'))
+
+    history = []
+    for step in range(steps):
+        burned = stepFrontier(state, config, rng)
+        history.append({'trees': len(state['trees']), 'fires': len(state['burning']),
+                        'empty': len(state['empty']), 'burned': burned, 'step': step + 1})
+    return history
+
+
+def main():
+    config = SimConfig()
+    rng = config.makeRandom()
+    forest = sim.createNewForest(config, rng)
+    sim.placeLake(forest, config)
+    state = frontierFromForest(forest)
+    sim.loadBext()
+    sim.bext.clear()
+
+    while True:  # Main program loop.
+        sim.displayForest(forestFromFrontier(state, forest))
+        stepFrontier(state, config, rng)
+        time.sleep(PAUSE_LENGTH)
+
+
+# If this program was run (instead of imported), run the game:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
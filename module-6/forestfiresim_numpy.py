@@ -0,0 +1,193 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: NumPy Grid Engine
+
+Program Overview:
+An alternative engine for forestfiresim_325.py that keeps the forest in a compact
+uint8 NumPy array instead of a dict keyed by (x, y) tuples. Growth, lightning and
+8-neighbour fire spread are computed as whole-grid operations, so a step costs a
+handful of array passes instead of one Python loop iteration per cell.
+
+Features & Flow:
+- Uses the same TREE/FIRE/EMPTY/LAKE semantics and the same constants as forestfiresim_325.py.
+- Each cell is one byte: EMPTY_CELL, TREE_CELL, FIRE_CELL, LAKE_CELL, ROAD_CELL or FIREBREAK_CELL.
+- One random roll per cell per step drives both growth (empty cells) and lightning (trees).
+- A tree catches fire if lightning strikes it or any of its 8 neighbours is burning.
+- Burning cells become empty; lake, road and firebreak cells never change.
+- runHeadless() steps the grid with no drawing and returns per-step statistics.
+- gridFromForest() / forestFromGrid() convert to and from the dict format so the
+  existing displayForest() can still draw the grid.
+
+Prerequisites:
+- Requires numpy: pip install numpy
+'''
+
+import sys, time
+
+import numpy as np
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import (WIDTH, HEIGHT, TREE, FIRE, EMPTY, LAKE, ROAD, FIREBREAK,
+                               INITIAL_TREE_DENSITY, GROW_CHANCE, FIRE_CHANCE,
+                               PAUSE_LENGTH, LAKE_RADIUS, SimConfig)
+
+# Cell codes stored in the uint8 grid:
+EMPTY_CELL = 0
+TREE_CELL = 1
+FIRE_CELL = 2
+LAKE_CELL = 3
+ROAD_CELL = 4
+FIREBREAK_CELL = 5
+
+# Character for each cell code, indexed by the code itself:
+CELL_CHARS = (EMPTY, TREE, FIRE, LAKE, ROAD, FIREBREAK)
+
+
+def createNewGrid(width=WIDTH, height=HEIGHT, density=INITIAL_TREE_DENSITY, rng=None):
+    """Returns a (height, width) uint8 array for a new forest."""
+    rng = np.random.default_rng() if rng is None else rng
+    grid = np.full((height, width), EMPTY_CELL, dtype=np.uint8)
+    # Matches createNewForest(), which compares random.random() * 100 to the density:
+    grid[rng.random((height, width), dtype=np.float32) * 100 <= density] = TREE_CELL
+    return grid
+
+
+def placeLakeGrid(grid, lake_radius=LAKE_RADIUS):
+    """Paint the fixed-size lake from placeLake() into the centre of the grid."""
+    height, width = grid.shape
+    ys, xs = np.ogrid[:height, :width]
+    distance_sq = (xs - width // 2) ** 2 + (ys - height // 2) ** 2
+    grid[distance_sq <= lake_radius ** 2] = LAKE_CELL
+    return grid
+
+
+def haloNeighbours(burning):
+    """Takes a boolean array with a one-cell halo on every side and returns, for the
+    interior cells only, True wherever any of the 8 neighbours is burning.
+    """
+    height, width = burning.shape[0] - 2, burning.shape[1] - 2
+    near = np.zeros((height, width), dtype=bool)
+    for dy in range(3):
+        for dx in range(3):
+            if dx == 1 and dy == 1:
+                continue  # A cell is not its own neighbour.
+            near |= burning[dy:dy + height, dx:dx + width]
+    return near
+
+
+def stepBlock(block, roll, grow_chance=GROW_CHANCE, fire_chance=FIRE_CHANCE):
+    """Steps the interior of a block that has a one-cell halo on every side.
+
+    The halo is only read to see whether fire spreads in from outside; the
+    returned array is the next state of the interior. Used directly by the
+    tiled engine in forestfiresim_tiled.py.
+    """
+    grid = block[1:-1, 1:-1]
+    burning = grid == FIRE_CELL
+    trees = grid == TREE_CELL
+
+    nextGrid = grid.copy()
+    # Grow a tree in empty spaces:
+    nextGrid[(grid == EMPTY_CELL) & (roll <= grow_chance)] = TREE_CELL
+    # Lightning, or a burning neighbour, sets a tree on fire:
+    nextGrid[trees & ((roll <= fire_chance) | haloNeighbours(block == FIRE_CELL))] = FIRE_CELL
+    # Burning trees have burned down now, so erase them:
+    nextGrid[burning] = EMPTY_CELL
+    return nextGrid
+
+
+def stepGrid(grid, grow_chance=GROW_CHANCE, fire_chance=FIRE_CHANCE, rng=None, roll=None):
+    """Runs a single simulation step and returns the next grid.
+
+    roll, if given, is a (height, width) array of growth/lightning rolls to use
+    instead of drawing new ones from rng.
+    """
+    if roll is None:
+        rng = np.random.default_rng() if rng is None else rng
+        roll = rng.random(grid.shape, dtype=np.float32)
+    # Cells off the edge of the grid count as empty, so fire never comes from there:
+    return stepBlock(np.pad(grid, 1), roll, grow_chance, fire_chance)
+
+
+def gridFromForest(forest):
+    """Converts a dict forest from forestfiresim_325.py into a uint8 grid."""
+    codes = {char: code for code, char in enumerate(CELL_CHARS)}
+    grid = np.empty((forest['height'], forest['width']), dtype=np.uint8)
+    for y in range(forest['height']):
+        for x in range(forest['width']):
+            grid[y, x] = codes[forest[(x, y)]]
+    return grid
+
+
+def forestFromGrid(grid):
+    """Converts a uint8 grid back into the dict forest used by displayForest()."""
+    height, width = grid.shape
+    forest = {'width': width, 'height': height}
+    for y in range(height):
+        for x in range(width):
+            forest[(x, y)] = CELL_CHARS[grid[y, x]]
+    return forest
+
+
+def gridRows(grid):
+    """Returns the grid as a list of strings, one per row, for DiffRenderer."""
+    chars = np.frombuffer(''.join(CELL_CHARS).encode('ascii'), dtype=np.uint8)
+    return [row.tobytes().decode('ascii') for row in chars[grid]]
+
+
+def gridStats(grid, previousGrid=None):
+    """Returns the same tree/fire/empty/burned counts as forestStats() for a grid."""
+    counts = np.bincount(grid.ravel(), minlength=len(CELL_CHARS))
+    stats = {'trees': int(counts[TREE_CELL]), 'fires': int(counts[FIRE_CELL]),
+             'empty': int(counts[EMPTY_CELL]), 'burned': 0}
+    if previousGrid is not None:
+        stats['burned'] = int(np.count_nonzero((grid == FIRE_CELL) & (previousGrid == TREE_CELL)))
+    return stats
+
+
+def runHeadless(steps, grid=None, config=None, terrain=None):
+    """Run the NumPy engine for a number of steps with no drawing, printing or sleeping.
+
+    Takes the same SimConfig as forestfiresim_325.runHeadless() and returns a
+    list with one gridStats() dict per step. A new grid gets terrain (a Terrain
+    from forestfiresim_terrain.py) painted into it, or the lake if there is none.
+    """
+    config = SimConfig() if config is None else config
+    rng = np.random.default_rng(config.seed)
+    if grid is None:
+        grid = createNewGrid(config.width, config.height, config.initial_tree_density, rng)
+        if terrain is None:
+            placeLakeGrid(grid, config.lake_radius)
+        else:
+            import forestfiresim_terrain
+            forestfiresim_terrain.placeTerrainGrid(grid, terrain)
+
+    history = []
+    for step in range(steps):
+        nextGrid = stepGrid(grid, config.grow_chance, config.fire_chance, rng)
+        stats = gridStats(nextGrid, grid)
+        stats['step'] = step + 1
+        history.append(stats)
+        grid = nextGrid
+    return history
+
+
+def main():
+    rng = np.random.default_rng()
+    grid = placeLakeGrid(createNewGrid(rng=rng))
+    sim.loadBext()
+    sim.bext.clear()
+
+    while True:  # Main program loop.
+        sim.displayForest(forestFromGrid(grid))
+        grid = stepGrid(grid, rng=rng)
+        time.sleep(PAUSE_LENGTH)
+
+
+# If this program was run (instead of imported), run the game:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
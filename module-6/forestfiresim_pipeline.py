@@ -0,0 +1,169 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Simulation/Rendering Pipeline
+
+Program Overview:
+In main() the simulation waits for displayForest() to finish printing and then
+for time.sleep(PAUSE_LENGTH), so stepping and drawing take turns. Here the
+simulation runs on its own thread or process and pushes frames into a small
+bounded queue, while the main thread draws at a target frame rate. When the
+terminal can't keep up, in-between frames are dropped, so the simulation never
+waits on the terminal or on a fixed sleep.
+
+Features & Flow:
+- produceFrames() steps the chosen engine as fast as it can. It only builds a frame
+  (the row strings) when the queue has room, so skipped frames cost nothing.
+- runPipeline() takes the newest frame in the queue, drops any older ones, draws it with
+  DiffRenderer and then waits for the next frame time.
+- mode='process' runs the simulation in another process (true parallelism);
+  mode='thread' keeps everything in one process.
+- engine can be 'dict' (forestfiresim_325.py), 'numpy' or 'bitboard'.
+- The status line shows the simulation step, steps/second, frames/second and dropped frames.
+'''
+
+import multiprocessing as mp
+import queue, sys, threading, time
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import SimConfig
+from forestfiresim_render import DiffRenderer, forestRows, RESET_COLOR
+
+# (!) Try changing these settings:
+TARGET_FPS = 10
+QUEUE_SIZE = 2  # Frames waiting to be drawn; keep it small so the picture stays current.
+PIPELINE_MODE = 'process'  # 'process' or 'thread'
+ENGINE = 'dict'  # 'dict', 'numpy' or 'bitboard'
+
+
+def makeEngine(engine, config):
+    """Returns (step, rows) functions for the chosen engine, starting from a new forest."""
+    if engine == 'numpy':
+        import numpy as np
+        import forestfiresim_numpy as numpyEngine
+        rng = np.random.default_rng(config.seed)
+        state = {'grid': numpyEngine.placeLakeGrid(numpyEngine.createNewGrid(
+            config.width, config.height, config.initial_tree_density, rng), config.lake_radius)}
+
+        def step():
+            state['grid'] = numpyEngine.stepGrid(state['grid'], config.grow_chance,
+                                                 config.fire_chance, rng)
+        return step, lambda: numpyEngine.gridRows(state['grid'])
+
+    if engine == 'bitboard':
+        import forestfiresim_bitboard as bitboard
+        rng = config.makeRandom('step')
+        board = bitboard.createBitForest(config, config.makeRandom('init'))
+        return lambda: bitboard.stepBits(board, config, rng), lambda: bitboard.bitsRows(board)
+
+    rng = config.makeRandom('step')
+    state = {'forest': sim.createNewForest(config, config.makeRandom('init'))}
+    sim.placeLake(state['forest'], config)
+
+    def step():
+        state['forest'] = sim.stepForest(state['forest'], config, rng)
+    return step, lambda: forestRows(state['forest'])
+
+
+def produceFrames(config, frames, stop, engine=ENGINE, steps=None):
+    """Steps the simulation until stop is set (or for steps steps), queueing frames when there is room.
+
+    Each frame is (step, time, rows). None is queued at the end.
+    """
+    try:
+        step, rows = makeEngine(engine, config)
+        count = 0
+        frames.put((count, time.perf_counter(), rows()))
+        while not stop.is_set() and (steps is None or count < steps):
+            step()
+            count += 1
+            if not frames.full():
+                frames.put((count, time.perf_counter(), rows()))
+        if not stop.is_set():
+            frames.put((count, time.perf_counter(), rows()))  # Always show the final state.
+    except KeyboardInterrupt:
+        pass  # Ctrl-C also reaches the simulation process; the main process handles it.
+    finally:
+        if stop.is_set():
+            try:
+                frames.put_nowait(None)  # Nobody may be reading any more, so don't wait.
+            except queue.Full:
+                pass
+        else:
+            frames.put(None)
+
+
+def runPipeline(config=None, fps=TARGET_FPS, mode=PIPELINE_MODE, engine=ENGINE, steps=None, out=None):
+    """Runs the simulation and the renderer side by side until the simulation ends or Ctrl-C.
+
+    Returns a dict with the number of steps simulated, frames drawn and frames dropped.
+    """
+    config = SimConfig() if config is None else config
+    if mode == 'process':
+        frames, stop = mp.Queue(QUEUE_SIZE), mp.Event()
+        worker = mp.Process(target=produceFrames, args=(config, frames, stop, engine, steps), daemon=True)
+    else:
+        frames, stop = queue.Queue(QUEUE_SIZE), threading.Event()
+        worker = threading.Thread(target=produceFrames, args=(config, frames, stop, engine, steps),
+                                  daemon=True)
+    worker.start()
+
+    renderer = DiffRenderer(out)
+    interval = 1.0 / fps
+    drawn = dropped = 0
+    firstStep = firstTime = drawStart = None
+    lastStep = 0
+    try:
+        frame = frames.get()
+        while frame is not None:
+            deadline = time.perf_counter() + interval
+            # Skip straight to the newest frame if the simulation got ahead of us:
+            while True:
+                try:
+                    newer = frames.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    frames = None  # The simulation has finished; draw this frame and stop.
+                    break
+                frame = newer
+                dropped += 1
+
+            step, stamp, rows = frame
+            if firstStep is None:
+                firstStep, firstTime, drawStart = step, stamp, time.perf_counter()
+            simSeconds = max(stamp - firstTime, 1e-9)
+            drawSeconds = max(time.perf_counter() - drawStart, 1e-9)
+            drawn += 1
+            lastStep = step
+            renderer.render(rows, f'Step {step}  Sim {(step - firstStep) / simSeconds:.1f} steps/s  '
+                                  f'Draw {(drawn - 1) / drawSeconds:.1f} fps  Dropped {dropped}  '
+                                  'Press Ctrl-C to quit.')
+            if frames is None:
+                break
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            frame = frames.get()
+    finally:
+        stop.set()
+        if mode == 'process' and frames is not None:
+            # Empty the queue so the simulation process can exit:
+            while worker.is_alive():
+                try:
+                    frames.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        worker.join(timeout=5)
+    return {'steps': lastStep, 'frames': drawn, 'dropped': dropped}
+
+
+def main():
+    runPipeline()
+
+
+# If this program was run (instead of imported), run the pipeline:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.stdout.write(RESET_COLOR + '\n')
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,116 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Differential Terminal Renderer
+
+Program Overview:
+displayForest() repaints every cell on every frame with one bext.fg() call and
+one print() per cell. DiffRenderer remembers the previous frame and only sends the
+cells that changed, switching colour only when the next changed cell needs a
+different colour, and writes the whole frame with a single sys.stdout.write().
+This keeps large grids watchable at high frame rates, even over slow SSH links.
+
+Features & Flow:
+- The first frame clears the screen and draws everything; later frames send only changes.
+- Rows that did not change at all are skipped with a single string comparison.
+- The cursor is only moved when the next changed cell is not directly after the last one.
+- Uses ANSI escape codes directly, so bext is not needed.
+- forestRows() turns a dict forest into row strings; the NumPy engine has gridRows().
+'''
+
+import sys, time
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, LAKE, ROAD, FIREBREAK, PAUSE_LENGTH, SimConfig
+
+ESC = '\x1b['
+CLEAR_SCREEN = ESC + '2J'
+RESET_COLOR = ESC + '39m'
+
+# ANSI foreground colour for each cell character (same colours as displayForest()):
+CELL_COLORS = {TREE: ESC + '32m', FIRE: ESC + '31m', LAKE: ESC + '34m',
+               ROAD: ESC + '37m', FIREBREAK: ESC + '33m'}
+
+
+def forestRows(forest):
+    """Returns the forest as a list of strings, one per row."""
+    width = forest['width']
+    return [''.join([forest[(x, y)] for x in range(width)]) for y in range(forest['height'])]
+
+
+def moveTo(x, y):
+    """Returns the escape code that moves the cursor to column x, row y (0-based)."""
+    return f'{ESC}{y + 1};{x + 1}H'
+
+
+class DiffRenderer:
+    """Draws frames by sending only the cells that changed since the last frame."""
+
+    def __init__(self, out=None):
+        self.out = sys.stdout if out is None else out
+        self.previous = None
+        self.status = None
+
+    def render(self, rows, status=''):
+        """Draw a frame given as a list of row strings, followed by a status line."""
+        parts = []
+        if self.previous is None or len(self.previous) != len(rows):
+            parts.append(CLEAR_SCREEN)
+            self.previous = [''] * len(rows)
+            self.status = None
+        color = None
+
+        for y, row in enumerate(rows):
+            old = self.previous[y]
+            if row == old:
+                continue  # Nothing changed on this row.
+            cursor = None  # Column the cursor will be at after the last write.
+            for x, ch in enumerate(row):
+                if x < len(old) and old[x] == ch:
+                    continue
+                if cursor != x:
+                    parts.append(moveTo(x, y))
+                cellColor = CELL_COLORS.get(ch)
+                if cellColor is not None and cellColor != color:
+                    parts.append(cellColor)
+                    color = cellColor
+                parts.append(ch)
+                cursor = x + 1
+
+        if status != self.status:
+            parts.append(moveTo(0, len(rows)))
+            parts.append(RESET_COLOR)
+            parts.append(status + ESC + 'K')  # Clear anything left over from a longer status.
+            color = None
+            self.status = status
+        if color is not None:
+            parts.append(RESET_COLOR)
+
+        self.previous = list(rows)
+        if parts:
+            self.out.write(''.join(parts))
+            self.out.flush()
+
+
+def main():
+    config = SimConfig()
+    rng = config.makeRandom()
+    forest = sim.createNewForest(config, rng)
+    sim.placeLake(forest, config)
+    renderer = DiffRenderer()
+    status = ('Grow chance: {}%  Lightning chance: {}%  Press Ctrl-C to quit.'
+              .format(config.grow_chance * 100, config.fire_chance * 100))
+
+    while True:  # Main program loop.
+        renderer.render(forestRows(forest), status)
+        forest = sim.stepForest(forest, config, rng)
+        time.sleep(PAUSE_LENGTH)
+
+
+# If this program was run (instead of imported), run the game:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.stdout.write(RESET_COLOR + '\n')
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,205 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Deterministic Replays
+
+Program Overview:
+Records a run of the reference engine (stepForest() in forestfiresim_325.py) as a
+compact replay log and plays it back to check that it reproduces bit-for-bit.
+The growth and lightning roll for each cell is computed from (seed, step, x, y)
+with a small hash instead of being drawn from a shared random stream, so it does
+not depend on the order the cells are visited in. That lets a faster engine be
+fed exactly the same rolls and checked step-by-step against the reference loop.
+
+Features & Flow:
+- cellRoll() / cellRollGrid() give the same roll for a cell in plain Python and in NumPy.
+- recordRun() runs the reference engine and logs the seed, the SimConfig and, for every
+  step, the number of trees grown, trees ignited and fires burned out.
+- The log also stores a CRC32 checksum of the final forest.
+- saveReplay() / loadReplay() store the log as gzipped JSON.
+- verifyReplay() re-runs the reference engine from the log and reports the first step that differs.
+- checkNumpyEngine() runs forestfiresim_numpy.stepGrid() with the same rolls and does the same check.
+'''
+
+import dataclasses, gzip, json, random, sys, zlib
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, EMPTY, SimConfig
+
+REPLAY_VERSION = 1
+
+# Constants for the splitmix64 hash behind cellRoll():
+MASK64 = (1 << 64) - 1
+SEED_MUL = 0x9E3779B97F4A7C15
+STEP_MUL = 0xD1B54A32D192ED03
+ROW_MUL = 0xAEF17502108EF2D9
+COL_MUL = 0xF1357AEA2E62A9C5
+MIX_MUL_1 = 0xBF58476D1CE4E5B9
+MIX_MUL_2 = 0x94D049BB133111EB
+
+
+def cellRoll(seed, step, x, y):
+    """Returns the roll in [0, 1) for cell (x, y) on the given step."""
+    z = (seed * SEED_MUL + step * STEP_MUL + y * ROW_MUL + x * COL_MUL) & MASK64
+    z = ((z ^ (z >> 30)) * MIX_MUL_1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX_MUL_2) & MASK64
+    z ^= z >> 31
+    return (z >> 11) * 2.0 ** -53
+
+
+def cellRollGrid(seed, step, width, height, x0=0, y0=0):
+    """Returns a (height, width) float64 array holding cellRoll() for every cell.
+
+    x0 and y0 offset the cell coordinates, so a tile of a larger grid gets the
+    same rolls it would have inside the whole grid.
+    """
+    import numpy as np  # Only needed for checking the NumPy engine.
+    base = (seed * SEED_MUL + step * STEP_MUL) & MASK64
+    ys, xs = np.ogrid[y0:y0 + height, x0:x0 + width]
+    with np.errstate(over='ignore'):  # uint64 arithmetic wraps, just like the & MASK64 above.
+        z = (np.uint64(base) + ys.astype(np.uint64) * np.uint64(ROW_MUL)
+             + xs.astype(np.uint64) * np.uint64(COL_MUL))
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX_MUL_1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX_MUL_2)
+        z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def forestChecksum(forest):
+    """Returns a CRC32 of every cell in the forest, row by row."""
+    crc = 0
+    for y in range(forest['height']):
+        row = ''.join([forest[(x, y)] for x in range(forest['width'])])
+        crc = zlib.crc32(row.encode('ascii'), crc)
+    return crc
+
+
+def forestEvents(forest, nextForest):
+    """Returns [grown, ignited, burned out] counts for one step."""
+    grown = ignited = burnedOut = 0
+    for x in range(forest['width']):
+        for y in range(forest['height']):
+            before, after = forest[(x, y)], nextForest[(x, y)]
+            if before == EMPTY and after == TREE:
+                grown += 1
+            elif before == TREE and after == FIRE:
+                ignited += 1
+            elif before == FIRE and after == EMPTY:
+                burnedOut += 1
+    return [grown, ignited, burnedOut]
+
+
+def startingForest(config):
+    """Returns the starting forest for a seeded config."""
+    forest = sim.createNewForest(config, config.makeRandom('init'))
+    sim.placeLake(forest, config)
+    return forest
+
+
+def runReference(config, steps):
+    """Runs the reference engine with per-cell rolls, yielding (step, forest, nextForest)."""
+    forest = startingForest(config)
+    for step in range(steps):
+        rolls = lambda x, y, step=step: cellRoll(config.seed, step, x, y)
+        nextForest = sim.stepForest(forest, config, rolls=rolls)
+        yield step, forest, nextForest
+        forest = nextForest
+
+
+def recordRun(config=None, steps=100):
+    """Runs the reference engine and returns its replay log.
+
+    A config without a seed is given a random one, so every log can be replayed.
+    """
+    config = SimConfig() if config is None else config
+    if config.seed is None:
+        config = dataclasses.replace(config, seed=random.randrange(2 ** 32))
+
+    events = []
+    forest = None
+    for step, forest, nextForest in runReference(config, steps):
+        events.append(forestEvents(forest, nextForest))
+        forest = nextForest
+    return {'version': REPLAY_VERSION, 'config': dataclasses.asdict(config), 'steps': steps,
+            'events': events, 'checksum': forestChecksum(forest) if forest else None}
+
+
+def saveReplay(log, filename):
+    """Save a replay log as gzipped JSON."""
+    with gzip.open(filename, 'wt', encoding='utf-8') as f:
+        json.dump(log, f, separators=(',', ':'))
+
+
+def loadReplay(filename):
+    """Load a replay log saved by saveReplay()."""
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        log = json.load(f)
+    if log.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version: {log.get('version')}")
+    return log
+
+
+def verifyReplay(log):
+    """Re-runs the reference engine from a log.
+
+    Returns None if every step matches, otherwise the first step number (1-based)
+    whose event counts differ, or 'checksum' if only the final forest differs.
+    """
+    config = SimConfig(**log['config'])
+    forest = None
+    for step, forest, nextForest in runReference(config, log['steps']):
+        if forestEvents(forest, nextForest) != log['events'][step]:
+            return step + 1
+        forest = nextForest
+    if forest is not None and forestChecksum(forest) != log['checksum']:
+        return 'checksum'
+    return None
+
+
+def checkNumpyEngine(log):
+    """Runs forestfiresim_numpy.stepGrid() with the logged seed's rolls.
+
+    Returns None if it matches the log on every step, otherwise the first
+    differing step number (1-based) or 'checksum'.
+    """
+    import numpy as np
+    import forestfiresim_numpy as engine
+
+    config = SimConfig(**log['config'])
+    grid = engine.gridFromForest(startingForest(config))
+    for step in range(log['steps']):
+        roll = cellRollGrid(config.seed, step, config.width, config.height)
+        nextGrid = engine.stepGrid(grid, config.grow_chance, config.fire_chance, roll=roll)
+        events = [int(np.count_nonzero((grid == before) & (nextGrid == after)))
+                  for before, after in ((engine.EMPTY_CELL, engine.TREE_CELL),
+                                        (engine.TREE_CELL, engine.FIRE_CELL),
+                                        (engine.FIRE_CELL, engine.EMPTY_CELL))]
+        if events != log['events'][step]:
+            return step + 1
+        grid = nextGrid
+    if log['steps'] and forestChecksum(engine.forestFromGrid(grid)) != log['checksum']:
+        return 'checksum'
+    return None
+
+
+def main():
+    log = recordRun(SimConfig(), 100)
+    filename = f"forestfire_replay_{log['config']['seed']}.json.gz"
+    saveReplay(log, filename)
+    print(f"Recorded {log['steps']} steps with seed {log['config']['seed']} to {filename}")
+
+    mismatch = verifyReplay(loadReplay(filename))
+    print('Reference replay:', 'OK' if mismatch is None else f'differs at step {mismatch}')
+    try:
+        mismatch = checkNumpyEngine(log)
+        print('NumPy engine:', 'OK' if mismatch is None else f'differs at step {mismatch}')
+    except ImportError:
+        print('NumPy engine: skipped (numpy is not installed)')
+
+
+# If this program was run (instead of imported), record and check a replay:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,231 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Snapshots and Checkpoints
+
+Program Overview:
+Saves and restores the full state of a simulation run so very long runs on huge
+grids can be paused, resumed after a crash, or moved to another machine. In memory
+the forest is a dict of (x, y) tuples costing 100+ bytes per cell; on disk each cell
+takes 2 bits, and the packed cells are then zlib-compressed. Grids with roads or firebreaks
+(see forestfiresim_terrain.py) need 4 bits per cell.
+
+Features & Flow:
+- Cell codes match forestfiresim_numpy.py: 0 = EMPTY, 1 = TREE, 2 = FIRE, 3 = LAKE,
+  4 = ROAD, 5 = FIREBREAK.
+- Four (or two) cells are packed into each byte using whole-buffer big-int shifts, so
+  packing runs at C speed instead of one Python operation per cell.
+- The file holds a short JSON header (size, step, SimConfig, RNG state) and the compressed cells.
+  The RNG can be the 'random' module, a random.Random, or the np.random.Generator used by
+  the NumPy engine, and the same kind of RNG is restored on load.
+- Files are written to a temporary name and then renamed, so a crash never leaves a
+  half-written snapshot behind.
+- Checkpointer saves at most every `interval` seconds and never lets saving take more than
+  `max_overhead` of the run time, however large the grid is.
+- runWithCheckpoints() resumes from an existing snapshot if there is one.
+'''
+
+import dataclasses, json, os, random, struct, sys, time, zlib
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import TREE, FIRE, EMPTY, LAKE, ROAD, FIREBREAK, SimConfig
+
+MAGIC = b'FFSN'
+SNAPSHOT_VERSION = 1
+CELL_CHARS = (EMPTY, TREE, FIRE, LAKE, ROAD, FIREBREAK)  # Index is the cell code.
+
+# (!) Try changing these settings:
+CHECKPOINT_FILE = 'forestfire.snapshot'
+CHECKPOINT_INTERVAL = 60.0  # Minimum seconds between checkpoints.
+MAX_OVERHEAD = 0.05  # Most of the run time that checkpointing may use.
+STEPS = 1000
+
+
+def packCells(codes, bits=2):
+    """Packs a bytes object of cell codes below 2 ** bits, 8 // bits cells per byte."""
+    perByte = 8 // bits
+    codes = codes + bytes(-len(codes) % perByte)  # Pad to a whole number of bytes.
+    count = len(codes) // perByte
+    packed = 0
+    for i in range(perByte):
+        # Every byte holds a value below 2 ** bits, so shifting the whole buffer moves
+        # each value up inside its own byte without spilling into the next one.
+        packed |= int.from_bytes(codes[i::perByte], 'little') << (bits * i)
+    return packed.to_bytes(count, 'little')
+
+
+def unpackCells(packed, cellCount, bits=2):
+    """Reverses packCells(), returning cellCount bytes of cell codes."""
+    perByte = 8 // bits
+    count = len(packed)
+    value = int.from_bytes(packed, 'little')
+    mask = int.from_bytes(bytes([(1 << bits) - 1]) * count, 'little')
+    codes = bytearray(count * perByte)
+    for i in range(perByte):
+        codes[i::perByte] = ((value >> (bits * i)) & mask).to_bytes(count, 'little')
+    return bytes(codes[:cellCount])
+
+
+def codesFromForest(forest):
+    """Returns the forest's cell codes as bytes, row by row."""
+    table = str.maketrans({char: chr(code) for code, char in enumerate(CELL_CHARS)})
+    rows = (''.join([forest[(x, y)] for x in range(forest['width'])]) for y in range(forest['height']))
+    return ''.join(rows).translate(table).encode('latin-1')
+
+
+def forestFromCodes(codes, width, height):
+    """Builds a dict forest from row-by-row cell codes."""
+    forest = {'width': width, 'height': height}
+    for y in range(height):
+        offset = y * width
+        for x in range(width):
+            forest[(x, y)] = CELL_CHARS[codes[offset + x]]
+    return forest
+
+
+def rngState(rng):
+    """Returns the state of a random.Random or np.random.Generator as JSON-ready data."""
+    if hasattr(rng, 'bit_generator'):
+        return rng.bit_generator.state  # A dict naming the bit generator, e.g. 'PCG64'.
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def rngFromState(state):
+    """Rebuilds the RNG saved by rngState()."""
+    if isinstance(state, dict):
+        import numpy as np  # Only needed for snapshots of NumPy engine runs.
+        bitGenerator = getattr(np.random, state['bit_generator'])()
+        bitGenerator.state = state
+        return np.random.Generator(bitGenerator)
+    version, internal, gauss = state
+    rng = random.Random()
+    rng.setstate((version, tuple(internal), gauss))
+    return rng
+
+
+def saveSnapshot(filename, forest, config, step, rng=random):
+    """Save the forest (a dict or a NumPy grid), its config, step number and RNG state."""
+    if isinstance(forest, dict):
+        width, height = forest['width'], forest['height']
+        codes = codesFromForest(forest)
+    else:
+        height, width = forest.shape
+        codes = forest.tobytes()
+
+    bits = 2 if max(codes, default=0) < 4 else 4
+    header = json.dumps({'width': width, 'height': height, 'step': step, 'bits': bits,
+                         'config': dataclasses.asdict(config),
+                         'rng_state': rngState(rng)}).encode('utf-8')
+    cells = zlib.compress(packCells(codes, bits), 6)
+
+    # Write to a temporary file first so a crash never leaves a broken snapshot:
+    tempName = filename + '.tmp'
+    with open(tempName, 'wb') as f:
+        f.write(MAGIC + struct.pack('<HI', SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        f.write(cells)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tempName, filename)
+
+
+def loadSnapshot(filename, asGrid=False):
+    """Load a snapshot saved by saveSnapshot().
+
+    Returns (forest, config, step, rng). forest is a dict, or a NumPy uint8 grid
+    if asGrid is True. rng is an np.random.Generator if one was saved, otherwise
+    a random.Random.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f'{filename} is not a forest fire snapshot')
+    version, headerLength = struct.unpack_from('<HI', data, 4)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported snapshot version: {version}')
+    start = 4 + struct.calcsize('<HI')
+    header = json.loads(data[start:start + headerLength])
+    width, height = header['width'], header['height']
+    codes = unpackCells(zlib.decompress(data[start + headerLength:]), width * height,
+                        header.get('bits', 2))
+
+    rng = rngFromState(header['rng_state'])
+    config = SimConfig(**header['config'])
+
+    if asGrid:
+        import numpy as np  # Only needed when restoring for the NumPy engine.
+        forest = np.frombuffer(codes, dtype=np.uint8).reshape(height, width).copy()
+    else:
+        forest = forestFromCodes(codes, width, height)
+    return forest, config, header['step'], rng
+
+
+class Checkpointer:
+    """Decides when to save checkpoints so saving stays a small part of the run time."""
+
+    def __init__(self, filename, interval=CHECKPOINT_INTERVAL, max_overhead=MAX_OVERHEAD):
+        self.filename = filename
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.lastSave = time.monotonic()
+        self.saveTime = 0.0  # How long the last save took.
+
+    def due(self):
+        """Returns True if enough time has passed since the last checkpoint."""
+        wait = max(self.interval, self.saveTime / self.max_overhead)
+        return time.monotonic() - self.lastSave >= wait
+
+    def save(self, forest, config, step, rng=random):
+        """Save a checkpoint now and remember how long it took."""
+        start = time.monotonic()
+        saveSnapshot(self.filename, forest, config, step, rng)
+        self.lastSave = time.monotonic()
+        self.saveTime = self.lastSave - start
+
+    def maybeSave(self, forest, config, step, rng=random):
+        """Save a checkpoint if one is due. Returns True if it saved."""
+        if self.due():
+            self.save(forest, config, step, rng)
+            return True
+        return False
+
+
+def runWithCheckpoints(steps, filename=CHECKPOINT_FILE, config=None, checkpointer=None):
+    """Run the reference engine headless for a number of steps, checkpointing as it goes.
+
+    If filename already holds a snapshot, the run resumes from it. Returns the
+    final forest; a final checkpoint is always written.
+    """
+    checkpointer = Checkpointer(filename) if checkpointer is None else checkpointer
+    if os.path.exists(filename):
+        forest, config, step, rng = loadSnapshot(filename)
+    else:
+        config = SimConfig() if config is None else config
+        forest = sim.createNewForest(config, config.makeRandom('init'))
+        sim.placeLake(forest, config)
+        step, rng = 0, config.makeRandom('step')
+        if rng is random:
+            rng = random.Random()  # Unseeded runs still need their own state to save.
+
+    while step < steps:
+        forest = sim.stepForest(forest, config, rng)
+        step += 1
+        checkpointer.maybeSave(forest, config, step, rng)
+    checkpointer.save(forest, config, step, rng)
+    return forest
+
+
+def main():
+    print(f'Running {STEPS} steps, checkpointing to {CHECKPOINT_FILE}...')
+    runWithCheckpoints(STEPS)
+    print(f'Done. Final state saved to {CHECKPOINT_FILE}')
+
+
+# If this program was run (instead of imported), run with checkpoints:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f'\nStopped. Run again to resume from {CHECKPOINT_FILE}.')
+        sys.exit()  # When Ctrl-C is pressed, end the program.
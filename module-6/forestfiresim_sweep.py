@@ -0,0 +1,156 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Parameter Sweep Runner
+
+Program Overview:
+Runs the forest fire simulation headless for every combination of
+INITIAL_TREE_DENSITY, GROW_CHANCE, FIRE_CHANCE and seed, spreading the runs
+over a process pool so all cores are used. Each run gets its own SimConfig,
+so nothing depends on the module globals in forestfiresim_325.py.
+
+Features & Flow:
+- buildConfigs() expands the parameter lists into one SimConfig per run.
+- runSweep() fans the configs out over multiprocessing.Pool and gathers one result row per run.
+- Each row holds the run's parameters, its steady-state tree density, how many cells were
+  burning and igniting per step, and the size of every fire (from a FireTracker)
+  that started after the warm-up and burned out before the end of the run.
+- The first WARMUP_STEPS of every run are skipped so the statistics describe the steady state.
+  STEPS must be more than WARMUP_STEPS.
+- printTable() shows the rows on screen and writeCsv() saves them for later analysis.
+- ENGINE selects the dict engine ('dict') or the NumPy engine ('numpy'). The NumPy engine
+  doesn't report ignitions to a FireTracker, so its fire-size columns are left blank.
+'''
+
+import csv, itertools, os, statistics, sys
+from multiprocessing import Pool
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import SimConfig
+from forestfiresim_clusters import FireTracker
+
+# (!) Try changing these lists to sweep other settings:
+DENSITIES = [0.20]
+GROW_CHANCES = [0.005, 0.01, 0.02]
+FIRE_CHANCES = [0.001, 0.01]
+SEEDS = [1, 2, 3]
+
+STEPS = 300  # Steps per run.
+WARMUP_STEPS = 100  # Steps ignored before measuring the steady state.
+ENGINE = 'dict'  # 'dict' for forestfiresim_325.py, 'numpy' for forestfiresim_numpy.py
+OUTPUT_FILE = 'sweep_results.csv'
+
+COLUMNS = ['initial_tree_density', 'grow_chance', 'fire_chance', 'seed',
+           'tree_density', 'max_burning_cells', 'mean_ignitions', 'total_ignitions',
+           'fires', 'mean_fire_size', 'max_fire_size']
+
+
+class SteadyStateTracker(FireTracker):
+    """A FireTracker that only keeps the fires that started after the warm-up steps."""
+
+    def __init__(self, warmup=WARMUP_STEPS):
+        super().__init__()
+        self.warmup = warmup
+
+    def finish(self, root):
+        if self.start[root] >= self.warmup:  # start counts steps from 0.
+            super().finish(root)
+
+
+def checkSteps(steps, warmup=WARMUP_STEPS):
+    """Raises ValueError unless there are steps left to measure after the warm-up."""
+    if warmup < 0 or steps <= warmup:
+        raise ValueError(f'steps ({steps}) must be more than the warm-up steps ({warmup})')
+
+
+def buildConfigs(densities, grow_chances, fire_chances, seeds, width=sim.WIDTH, height=sim.HEIGHT):
+    """Returns one SimConfig for every combination of the given parameter values."""
+    return [SimConfig(width=width, height=height, initial_tree_density=density,
+                      grow_chance=grow, fire_chance=fire, seed=seed)
+            for density, grow, fire, seed
+            in itertools.product(densities, grow_chances, fire_chances, seeds)]
+
+
+def summarizeRun(config, history, warmup=WARMUP_STEPS, fireSizes=None):
+    """Reduces the per-step statistics of one run to a single result row.
+
+    fireSizes is the size of every fire that started after the warm-up and burned
+    out before the run ended, or None if the engine couldn't track fires. Fires
+    still burning at the last step are left out, since their final size isn't known.
+    """
+    checkSteps(len(history), warmup)
+    steady = history[warmup:]
+    densities = [step['trees'] / max(1, step['trees'] + step['fires'] + step['empty'])
+                 for step in steady]
+    burning = [step['fires'] for step in steady]
+    ignitions = [step['burned'] for step in steady]
+    if fireSizes is None:
+        fireColumns = {'fires': '', 'mean_fire_size': '', 'max_fire_size': ''}
+    else:
+        fireColumns = {'fires': len(fireSizes),
+                       'mean_fire_size': round(statistics.fmean(fireSizes), 2) if fireSizes else 0,
+                       'max_fire_size': max(fireSizes, default=0)}
+    return {
+        'initial_tree_density': config.initial_tree_density,
+        'grow_chance': config.grow_chance,
+        'fire_chance': config.fire_chance,
+        'seed': config.seed,
+        'tree_density': round(statistics.fmean(densities), 4),
+        'max_burning_cells': max(burning),
+        'mean_ignitions': round(statistics.fmean(ignitions), 2),
+        'total_ignitions': sum(ignitions),
+        **fireColumns,
+    }
+
+
+def runOne(job):
+    """Runs a single (config, steps, warmup, engine) job. Used by the process pool."""
+    config, steps, warmup, engine = job
+    if engine == 'numpy':
+        import forestfiresim_numpy  # Only needed (and only required) for the NumPy engine.
+        history = forestfiresim_numpy.runHeadless(steps, config=config)
+        return summarizeRun(config, history, warmup)
+    tracker = SteadyStateTracker(warmup)
+    history = sim.runHeadless(steps, config=config, tracker=tracker)
+    return summarizeRun(config, history, warmup, [size for size, _, _ in tracker.finished])
+
+
+def runSweep(configs, steps=STEPS, warmup=WARMUP_STEPS, engine=ENGINE, processes=None):
+    """Runs every config in a process pool and returns the result rows in config order."""
+    checkSteps(steps, warmup)
+    jobs = [(config, steps, warmup, engine) for config in configs]
+    with Pool(processes or os.cpu_count()) as pool:
+        return pool.map(runOne, jobs, chunksize=1)
+
+
+def printTable(rows):
+    """Print the result rows as a fixed-width table."""
+    widths = [len(column) + 2 for column in COLUMNS]
+    print(''.join(f'{column:>{width}}' for column, width in zip(COLUMNS, widths)))
+    for row in rows:
+        print(''.join(f'{row[column]!s:>{width}}' for column, width in zip(COLUMNS, widths)))
+
+
+def writeCsv(rows, filename):
+    """Save the result rows to a CSV file."""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    configs = buildConfigs(DENSITIES, GROW_CHANCES, FIRE_CHANCES, SEEDS)
+    print(f'Running {len(configs)} simulations of {STEPS} steps on {os.cpu_count()} cores...')
+    rows = runSweep(configs)
+    printTable(rows)
+    writeCsv(rows, OUTPUT_FILE)
+    print(f'Results saved to {OUTPUT_FILE}')
+
+
+# If this program was run (instead of imported), run the sweep:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
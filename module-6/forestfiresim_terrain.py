@@ -0,0 +1,182 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Terrain Layer
+
+Program Overview:
+Generalizes placeLake() into a terrain layer that is built once per run: lakes,
+rivers, roads and firebreaks either loaded from a plain-text map file or generated
+from shapes. The layer is one byte per cell (0 = flammable land), so it doubles as
+a mask of non-flammable cells. Painting it into a forest sets those cells to LAKE,
+ROAD or FIREBREAK. stepForest() in forestfiresim_325.py takes the terrain too: it
+copies the non-flammable cells across in one go and only visits the cells that
+can burn, so every lake, road and firebreak cell costs nothing per step.
+
+Features & Flow:
+- Map files use one character per cell: '~' water, '=' road, '#' firebreak, anything
+  else is land. Short rows are padded with land.
+- Each map row is converted with a single bytes.translate(), so large maps load in milliseconds.
+- addCircle(), addRect() and addLine() paint shapes one row span at a time with slice assignment.
+- lakeTerrain() builds the same lake as placeLake(); main() in forestfiresim_325.py uses it.
+- flammableCells() and blockedForest() are worked out once and cached for stepForest().
+- placeTerrain() paints the layer into a dict forest, visiting only the non-flammable cells;
+  placeTerrainGrid() does the same for a NumPy grid with one masked assignment.
+- Run this file with a map file to watch a fire on that map.
+'''
+
+import math, sys
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import LAKE, ROAD, FIREBREAK
+
+# Terrain codes (the same numbers as the cell codes in forestfiresim_numpy.py):
+LAND = 0
+WATER = 3
+ROAD_CODE = 4
+FIREBREAK_CODE = 5
+
+TERRAIN_CHARS = {WATER: LAKE, ROAD_CODE: ROAD, FIREBREAK_CODE: FIREBREAK}
+
+# bytes.translate() table turning map file characters into terrain codes:
+MAP_TABLE = bytes(WATER if chr(i) == LAKE else
+                  ROAD_CODE if chr(i) == ROAD else
+                  FIREBREAK_CODE if chr(i) == FIREBREAK else
+                  LAND for i in range(256))
+
+
+class Terrain:
+    """A width x height layer of terrain codes, stored row by row in a bytearray."""
+
+    def __init__(self, width, height, codes=None):
+        self.width = width
+        self.height = height
+        self.codes = bytearray(width * height) if codes is None else codes
+        self._blocked = self._blockedForest = self._flammable = None
+
+    def paintSpan(self, y, x0, x1, code):
+        """Set cells x0..x1 (inclusive) of row y to code, clipped to the grid."""
+        x0, x1 = max(0, x0), min(self.width - 1, x1)
+        if 0 <= y < self.height and x0 <= x1:
+            start = y * self.width
+            self.codes[start + x0:start + x1 + 1] = bytes([code]) * (x1 - x0 + 1)
+            self._blocked = self._blockedForest = self._flammable = None
+
+    def blockedCells(self):
+        """Returns the (x, y) of every non-flammable cell. Computed once and cached."""
+        if self._blocked is None:
+            self._blocked = []
+            for y in range(self.height):
+                row = self.codes[y * self.width:(y + 1) * self.width]
+                if any(row):  # Skip all-land rows without looking at each cell.
+                    self._blocked.extend((x, y) for x, code in enumerate(row) if code)
+        return self._blocked
+
+    def blockedForest(self):
+        """Returns {(x, y): cell character} for every non-flammable cell. Computed once and cached."""
+        if self._blockedForest is None:
+            width = self.width
+            self._blockedForest = {(x, y): TERRAIN_CHARS[self.codes[y * width + x]]
+                                   for x, y in self.blockedCells()}
+        return self._blockedForest
+
+    def flammableCells(self):
+        """Returns the (x, y) of every cell that can burn, column by column in the same
+        order as stepForest()'s loop. Computed once and cached."""
+        if self._flammable is None:
+            width = self.width
+            self._flammable = [(x, y) for x in range(width)
+                               for y, code in enumerate(self.codes[x::width]) if code == LAND]
+        return self._flammable
+
+
+def loadTerrainMap(filename, width=None, height=None):
+    """Load a terrain map file. The size defaults to the size of the map itself."""
+    with open(filename, 'rb') as f:
+        lines = f.read().splitlines()
+    width = max((len(line) for line in lines), default=0) if width is None else width
+    height = len(lines) if height is None else height
+
+    codes = bytearray()
+    for line in lines[:height]:
+        row = line[:width].translate(MAP_TABLE)
+        codes += row + bytes(width - len(row))
+    codes += bytes(width * height - len(codes))
+    return Terrain(width, height, codes)
+
+
+def saveTerrainMap(terrain, filename):
+    """Save a terrain layer as a map file that loadTerrainMap() can read."""
+    chars = bytes(ord(TERRAIN_CHARS.get(code, '.')) for code in range(256))
+    with open(filename, 'wb') as f:
+        for y in range(terrain.height):
+            f.write(bytes(terrain.codes[y * terrain.width:(y + 1) * terrain.width]).translate(chars))
+            f.write(b'\n')
+
+
+def addCircle(terrain, cx, cy, radius, code=WATER):
+    """Paint a filled circle, using the same distance rule as placeLake()."""
+    for y in range(cy - radius, cy + radius + 1):
+        half = math.isqrt(radius ** 2 - (y - cy) ** 2)
+        terrain.paintSpan(y, cx - half, cx + half, code)
+    return terrain
+
+
+def addRect(terrain, x0, y0, x1, y1, code=FIREBREAK_CODE):
+    """Paint a filled rectangle with corners (x0, y0) and (x1, y1), inclusive."""
+    for y in range(min(y0, y1), max(y0, y1) + 1):
+        terrain.paintSpan(y, min(x0, x1), max(x0, x1), code)
+    return terrain
+
+
+def addLine(terrain, x0, y0, x1, y1, thickness=1, code=ROAD_CODE):
+    """Paint a straight line thickness cells wide, e.g. a road or a river."""
+    before = (thickness - 1) // 2
+    after = thickness - 1 - before
+    steps = max(abs(x1 - x0), abs(y1 - y0), 1)
+    for i in range(steps + 1):
+        x = x0 + round((x1 - x0) * i / steps)
+        y = y0 + round((y1 - y0) * i / steps)
+        if abs(x1 - x0) >= abs(y1 - y0):
+            # Mostly horizontal, so widen the line vertically:
+            for dy in range(-before, after + 1):
+                terrain.paintSpan(y + dy, x, x, code)
+        else:
+            terrain.paintSpan(y, x - before, x + after, code)
+    return terrain
+
+
+def lakeTerrain(width, height, lake_radius=sim.LAKE_RADIUS):
+    """Returns a terrain layer holding just the lake placed by placeLake()."""
+    return addCircle(Terrain(width, height), width // 2, height // 2, lake_radius)
+
+
+def placeTerrain(forest, terrain):
+    """Paint the terrain's non-flammable cells into a dict forest."""
+    forest.update(terrain.blockedForest())
+    return forest
+
+
+def placeTerrainGrid(grid, terrain):
+    """Paint the terrain's non-flammable cells into a NumPy grid from forestfiresim_numpy.py."""
+    import numpy as np
+    codes = np.frombuffer(bytes(terrain.codes), dtype=np.uint8).reshape(grid.shape)
+    mask = codes != LAND
+    grid[mask] = codes[mask]
+    return grid
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python forestfiresim_terrain.py MAPFILE')
+        print("Map characters: '~' water, '=' road, '#' firebreak, anything else is forest.")
+        sys.exit(1)
+
+    sim.main(terrain=loadTerrainMap(sys.argv[1]))
+
+
+# If this program was run (instead of imported), run the game on a map file:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,187 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Tiled Multi-Process Engine
+
+Program Overview:
+Splits very large forests into tiles and steps every tile in its own worker process.
+The grid lives in shared memory as two uint8 buffers (this step and the next), so no
+cells are copied between processes. Each worker reads its tile plus a one-cell halo
+border from the current buffer, which is how fire crosses from one tile into the next,
+and writes the new state of its tile into the other buffer. A barrier makes every
+worker finish a step before any starts the next one.
+
+Features & Flow:
+- Uses the transition rules of forestfiresim_325.py (through stepBlock() in the NumPy
+  engine): growth, lightning, 8-neighbour spread, and lake/road/firebreak cells that never change.
+- Tiles are laid out as a rows x columns grid; by default one row of tiles per CPU core.
+- Each worker has its own random stream spawned from the run's seed.
+- With deterministic=True the rolls come from forestfiresim_replay.cellRollGrid(), so the
+  result is the same bit-for-bit whatever the tiling, and matches the single-process engines.
+- run() returns the same per-step statistics as forestfiresim_numpy.runHeadless().
+
+Prerequisites:
+- Requires numpy: pip install numpy
+'''
+
+import os, queue, sys, time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import forestfiresim_numpy as engine
+from forestfiresim_325 import SimConfig
+
+# (!) Try changing these settings:
+DEMO_WIDTH = 4000
+DEMO_HEIGHT = 4000
+DEMO_STEPS = 50
+
+
+def tileBoxes(width, height, rows, columns):
+    """Splits the grid into rows x columns tiles, returned as (y0, y1, x0, x1) boxes."""
+    ys = [height * i // rows for i in range(rows + 1)]
+    xs = [width * i // columns for i in range(columns + 1)]
+    return [(ys[r], ys[r + 1], xs[c], xs[c + 1]) for r in range(rows) for c in range(columns)]
+
+
+def haloBlock(grid, box):
+    """Returns the tile in box with a one-cell halo around it; cells off the grid are EMPTY."""
+    y0, y1, x0, x1 = box
+    height, width = grid.shape
+    block = grid[max(y0 - 1, 0):min(y1 + 1, height), max(x0 - 1, 0):min(x1 + 1, width)]
+    return np.pad(block, ((int(y0 == 0), int(y1 == height)), (int(x0 == 0), int(x1 == width))))
+
+
+def tileWorker(shmName, width, height, box, config, seedSequence, deterministic, barrier, commands, results):
+    """Worker process: steps one tile each time the main process asks for more steps."""
+    shm = shared_memory.SharedMemory(name=shmName)
+    try:
+        buffers = np.ndarray((2, height, width), dtype=np.uint8, buffer=shm.buf)
+        rng = np.random.default_rng(seedSequence)
+        y0, y1, x0, x1 = box
+        if deterministic:
+            from forestfiresim_replay import cellRollGrid
+
+        while True:
+            command = commands.get()
+            if command is None:
+                break
+            firstStep, steps = command
+            stats = []
+            for step in range(firstStep, firstStep + steps):
+                current, nextGrid = buffers[step % 2], buffers[(step + 1) % 2]
+                block = haloBlock(current, box)
+                if deterministic:
+                    roll = cellRollGrid(config.seed, step, x1 - x0, y1 - y0, x0, y0)
+                else:
+                    roll = rng.random((y1 - y0, x1 - x0), dtype=np.float32)
+                tile = engine.stepBlock(block, roll, config.grow_chance, config.fire_chance)
+                nextGrid[y0:y1, x0:x1] = tile
+                stats.append(engine.gridStats(tile, block[1:-1, 1:-1]))
+                barrier.wait()  # Nobody starts the next step until every tile is written.
+            results.put(stats)
+        del buffers
+    finally:
+        shm.close()
+
+
+class TiledSimulation:
+    """Runs one forest split into tiles, one worker process per tile."""
+
+    def __init__(self, grid, config=None, tiles=None, deterministic=False):
+        self.config = SimConfig() if config is None else config
+        if deterministic and self.config.seed is None:
+            raise ValueError('deterministic=True needs a config with a seed')
+        self.height, self.width = grid.shape
+        rows, columns = tiles if tiles is not None else (os.cpu_count() or 1, 1)
+        self.boxes = tileBoxes(self.width, self.height, min(rows, self.height), min(columns, self.width))
+        self.step = 0
+
+        self.shm = shared_memory.SharedMemory(create=True, size=2 * grid.size)
+        self.buffers = np.ndarray((2, self.height, self.width), dtype=np.uint8, buffer=self.shm.buf)
+        self.buffers[0] = grid
+
+        self.barrier = mp.Barrier(len(self.boxes))
+        self.results = mp.Queue()
+        self.commands = []
+        self.workers = []
+        seeds = np.random.SeedSequence(self.config.seed).spawn(len(self.boxes))
+        for box, seedSequence in zip(self.boxes, seeds):
+            commands = mp.Queue()
+            worker = mp.Process(target=tileWorker, daemon=True,
+                                args=(self.shm.name, self.width, self.height, box, self.config,
+                                      seedSequence, deterministic, self.barrier, commands, self.results))
+            worker.start()
+            self.commands.append(commands)
+            self.workers.append(worker)
+
+    def grid(self):
+        """Returns a copy of the current grid."""
+        return self.buffers[self.step % 2].copy()
+
+    def run(self, steps):
+        """Runs a number of steps and returns one stats dict per step, summed over the tiles."""
+        for commands in self.commands:
+            commands.put((self.step, steps))
+
+        tileStats = []
+        while len(tileStats) < len(self.workers):
+            try:
+                tileStats.append(self.results.get(timeout=1))
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self.workers):
+                    self.barrier.abort()
+                    raise RuntimeError('A tile worker stopped unexpectedly')
+
+        history = []
+        for i in range(steps):
+            stats = {key: sum(tile[i][key] for tile in tileStats)
+                     for key in ('trees', 'fires', 'empty', 'burned')}
+            stats['step'] = self.step + i + 1
+            history.append(stats)
+        self.step += steps
+        return history
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        for commands in self.commands:
+            commands.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        del self.buffers
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    config = SimConfig(width=DEMO_WIDTH, height=DEMO_HEIGHT, initial_tree_density=20, seed=1)
+    rng = np.random.default_rng(config.seed)
+    grid = engine.createNewGrid(config.width, config.height, config.initial_tree_density, rng)
+    engine.placeLakeGrid(grid, config.lake_radius)
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        with TiledSimulation(grid, config, tiles=(workers, 1)) as simulation:
+            start = time.perf_counter()
+            history = simulation.run(DEMO_STEPS)
+            seconds = time.perf_counter() - start
+        print(f'{workers:>3} worker(s): {DEMO_STEPS / seconds:8.2f} steps/s, '
+              f'{config.width * config.height * DEMO_STEPS / seconds:,.0f} cells/s, '
+              f"{history[-1]['trees']:,} trees at the end")
+
+
+# If this program was run (instead of imported), run the scaling demo:
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit()  # When Ctrl-C is pressed, end the program.
@@ -0,0 +1,45 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Bitboard Engine Tests
+'''
+
+import random
+import unittest
+
+import forestfiresim_325 as sim
+import forestfiresim_bitboard as bitboard
+from forestfiresim_325 import SimConfig
+
+
+class BitboardEngineTestCase(unittest.TestCase):
+    """Tests for the big-int bitboard forest fire engine."""
+
+    def test_random_mask_chance(self):
+        """Is each bit of a random mask set with roughly the requested chance?"""
+        ones = bitboard.randomMask(200000, 0.01, random.Random(1)).bit_count()
+        self.assertAlmostEqual(ones / 200000, 0.01, delta=0.001)
+
+    def test_round_trip(self):
+        """Does a forest survive conversion to bitboards and back?"""
+        config = SimConfig(initial_tree_density=30)
+        forest = sim.createNewForest(config, random.Random(2))
+        sim.placeLake(forest, config)
+        self.assertEqual(bitboard.forestFromBits(bitboard.bitsFromForest(forest)), forest)
+
+    def test_spread_matches_reference(self):
+        """With no growth or lightning, does fire spread exactly like stepForest()?"""
+        config = SimConfig(width=30, height=12, grow_chance=0, fire_chance=0)
+        forest = sim.createNewForest(SimConfig(width=30, height=12, initial_tree_density=60),
+                                     random.Random(3))
+        sim.placeLake(forest, SimConfig(lake_radius=3))
+        forest[(0, 5)] = forest[(29, 6)] = sim.FIRE  # Fires on both edges must not wrap around.
+        state = bitboard.bitsFromForest(forest)
+        for _ in range(10):
+            forest = sim.stepForest(forest, config)
+            bitboard.stepBits(state, config)
+            self.assertEqual(bitboard.forestFromBits(state), forest)
+
+
+if __name__ == '__main__':
+    unittest.main()
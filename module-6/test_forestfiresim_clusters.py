@@ -0,0 +1,64 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Fire Cluster Tracking Tests
+'''
+
+import unittest
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import SimConfig
+from forestfiresim_clusters import FireTracker
+
+
+class FireTrackerTestCase(unittest.TestCase):
+    """Tests for the union-find fire tracker."""
+
+    def test_fires_merge(self):
+        """Do two strikes whose fires meet end up as one fire?"""
+        tracker = FireTracker()
+        tracker.strike((0, 0))
+        tracker.strike((2, 0))
+        tracker.endStep()
+        tracker.spread((0, 0), (1, 0))
+        tracker.spread((2, 0), (1, 0))
+        tracker.endStep()
+        tracker.endStep()
+        self.assertEqual(tracker.finished, [(3, 2, 2)])
+
+    def test_strike_on_spreading_fire_is_dropped(self):
+        """Is a tree hit by lightning and fire in the same step counted the same on either side?"""
+        config = SimConfig(width=3, height=1, grow_chance=0, fire_chance=0.5)
+        for side in (0, 2):
+            with self.subTest(side=side):
+                tracker = FireTracker()
+                forest = {'width': 3, 'height': 1, (0, 0): sim.EMPTY, (1, 0): sim.TREE, (2, 0): sim.EMPTY}
+                forest[(side, 0)] = sim.TREE
+                for step in range(3):
+                    # Lightning hits only the middle tree first, then every tree:
+                    forest = sim.stepForest(forest, config, rolls=lambda x, y: 0 if step or x == 1 else 0.9,
+                                            tracker=tracker)
+                    tracker.endStep()
+                self.assertEqual(tracker.finished, [(2, 2, 1)])
+
+    def test_fire_burning_before_tracking_starts(self):
+        """Does a fire that was already burning count only the cells it lit afterwards?"""
+        tracker = FireTracker()
+        tracker.spread((0, 0), (1, 0))
+        tracker.endStep()
+        tracker.endStep()
+        self.assertEqual(tracker.finished, [(1, 1, 0)])
+
+    def test_every_burned_cell_is_counted(self):
+        """Does every tree that caught fire belong to exactly one tracked fire?"""
+        tracker = FireTracker()
+        history = sim.runHeadless(200, config=SimConfig(initial_tree_density=20, seed=3),
+                                  tracker=tracker)
+        active = {tracker.find(fire) for fire in tracker.previous.values()}
+        tracked = (sum(size for size, _, _ in tracker.finished)
+                   + sum(tracker.size[root] for root in active))
+        self.assertEqual(tracked, sum(step['burned'] for step in history))
+
+
+if __name__ == '__main__':
+    unittest.main()
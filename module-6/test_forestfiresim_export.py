@@ -0,0 +1,56 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Frame Export Tests
+'''
+
+import json, os, tempfile, unittest
+
+import forestfiresim_export as export
+from forestfiresim_325 import SimConfig
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class FrameExportTestCase(unittest.TestCase):
+    """Tests for streaming frame export."""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.config = SimConfig(width=20, height=10, lake_radius=3, seed=1)
+
+    def test_raw_frames_skip_and_shrink(self):
+        """Does a raw export keep every Nth frame at the shrunken size?"""
+        path = os.path.join(self.folder.name, 'run.raw')
+        written = export.exportRun(path, 20, self.config, every=5, shrink=2)
+        with open(path + '.json') as infoFile:
+            info = json.load(infoFile)
+        self.assertEqual(written, 5)  # The starting frame and steps 5, 10, 15 and 20.
+        self.assertEqual((info['width'], info['height'], info['frames']), (10, 5, 5))
+        self.assertEqual(os.path.getsize(path), 10 * 5 * 5)
+
+    def test_png_matches_frame(self):
+        """Does a PNG frame hold the cell codes of the forest it was made from?"""
+        rows = ['A @', '~=#']
+        with export.FrameExporter(self.folder.name, 'png') as exporter:
+            exporter.write(rows)
+        with open(os.path.join(self.folder.name, 'frame_00000.png'), 'rb') as pngFile:
+            self.assertEqual(pngFile.read(8), export.PNG_SIGNATURE)
+        if Image is not None:
+            image = Image.open(os.path.join(self.folder.name, 'frame_00000.png'))
+            self.assertEqual(image.tobytes(), bytes([1, 0, 2, 3, 4, 5]))
+
+    @unittest.skipIf(Image is None, 'Pillow is not installed')
+    def test_gif_frame_count(self):
+        """Does the streamed GIF contain every exported frame?"""
+        path = os.path.join(self.folder.name, 'run.gif')
+        written = export.exportRun(path, 9, self.config)
+        self.assertEqual(Image.open(path).n_frames, written)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Frontier Engine Tests
+'''
+
+import random
+import statistics
+import unittest
+
+import forestfiresim_325 as sim
+import forestfiresim_frontier as frontier
+from forestfiresim_325 import SimConfig
+
+
+def steadyDensity(history, warmup=100):
+    """Mean fraction of flammable cells holding a tree after the warmup steps."""
+    return statistics.fmean(step['trees'] / (step['trees'] + step['fires'] + step['empty'])
+                            for step in history[warmup:])
+
+
+class FrontierEngineTestCase(unittest.TestCase):
+    """Tests for the frontier (active-set) forest fire engine."""
+
+    def test_cell_pool_remove(self):
+        """Does removing a cell keep the index of the moved cell correct?"""
+        pool = frontier.CellPool([(0, 0), (1, 0), (2, 0)])
+        pool.remove((0, 0))
+        self.assertNotIn((0, 0), pool)
+        self.assertEqual(pool.cells[pool.index[(2, 0)]], (2, 0))
+        self.assertEqual(len(pool), 2)
+
+    def test_sample_indices_chance(self):
+        """Is each index picked with roughly the requested chance?"""
+        rng = random.Random(1)
+        picks = sum(len(frontier.sampleIndices(1000, 0.05, rng)) for _ in range(200))
+        self.assertAlmostEqual(picks / 200000, 0.05, delta=0.003)
+
+    def test_fire_spreads_to_neighbours(self):
+        """Does fire reach all 8 neighbouring trees and burn itself out?"""
+        config = SimConfig(width=5, height=5, grow_chance=0, fire_chance=0)
+        forest = {'width': 5, 'height': 5}
+        for x in range(5):
+            for y in range(5):
+                forest[(x, y)] = sim.TREE
+        forest[(2, 2)] = sim.FIRE
+        state = frontier.frontierFromForest(forest)
+        burned = frontier.stepFrontier(state, config, random.Random(1))
+        self.assertEqual(burned, 8)
+        self.assertEqual(frontier.forestFromFrontier(state), sim.stepForest(forest, config))
+
+    def test_matches_reference_engine(self):
+        """Does the frontier engine reach the same steady-state density as stepForest()?"""
+        reference, active = [], []
+        for seed in range(4):
+            config = SimConfig(initial_tree_density=20, seed=seed)
+            reference.append(steadyDensity(sim.runHeadless(300, config=config)))
+            active.append(steadyDensity(frontier.runHeadless(300, config=config)))
+        self.assertAlmostEqual(statistics.fmean(active), statistics.fmean(reference), delta=0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
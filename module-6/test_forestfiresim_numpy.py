@@ -0,0 +1,63 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: NumPy Engine Tests
+'''
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import forestfiresim_325 as sim
+from forestfiresim_325 import SimConfig
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class NumpyEngineTestCase(unittest.TestCase):
+    """Tests for the NumPy uint8 grid engine."""
+
+    def test_matches_dict_engine(self):
+        """Given the same rolls, does stepGrid() give exactly the same forest as stepForest()?"""
+        import forestfiresim_numpy as engine
+
+        # The lake is big enough to touch the top and bottom edges, and every border
+        # cell is a tree with a fire in each corner, so spread along the edges and
+        # into the lake is checked too.
+        config = SimConfig(width=30, height=12, initial_tree_density=50,
+                           grow_chance=0.05, fire_chance=0.02, lake_radius=6)
+        forest = sim.createNewForest(config, random.Random(3))
+        for x in range(config.width):
+            forest[(x, 0)] = forest[(x, config.height - 1)] = sim.TREE
+        for y in range(config.height):
+            forest[(0, y)] = forest[(config.width - 1, y)] = sim.TREE
+        sim.placeLake(forest, config)
+        for corner in [(0, 0), (config.width - 1, 0), (0, config.height - 1),
+                       (config.width - 1, config.height - 1)]:
+            forest[corner] = sim.FIRE
+        grid = engine.gridFromForest(forest)
+        self.assertTrue((grid[[0, -1]] == engine.LAKE_CELL).any(axis=1).all())
+
+        rng = np.random.default_rng(3)
+        for step in range(25):
+            roll = rng.random((config.height, config.width))
+            forest = sim.stepForest(forest, config, rolls=lambda x, y: roll[y, x])
+            grid = engine.stepGrid(grid, config.grow_chance, config.fire_chance, roll=roll)
+            self.assertEqual(engine.forestFromGrid(grid), forest, f'step {step + 1}')
+
+    def test_lake_grid_matches_place_lake(self):
+        """Does placeLakeGrid() paint the same cells as placeLake()?"""
+        import forestfiresim_numpy as engine
+
+        config = SimConfig(width=21, height=11, initial_tree_density=0)
+        forest = sim.createNewForest(config)
+        sim.placeLake(forest, config)
+        grid = engine.placeLakeGrid(engine.createNewGrid(21, 11, 0), config.lake_radius)
+        self.assertEqual(engine.forestFromGrid(grid), forest)
+
+
+if __name__ == '__main__':
+    unittest.main()
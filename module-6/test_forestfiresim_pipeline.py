@@ -0,0 +1,93 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Simulation/Rendering Pipeline Tests
+'''
+
+import io
+import multiprocessing as mp
+import queue
+import threading
+import time
+import unittest
+
+import forestfiresim_325 as sim
+import forestfiresim_pipeline as pipeline
+from forestfiresim_325 import SimConfig
+
+CONFIG = SimConfig(width=20, height=8, initial_tree_density=30, grow_chance=0.05, fire_chance=0.02, seed=6)
+
+
+class InterruptedOutput(io.StringIO):
+    """An output stream that acts like Ctrl-C was pressed after a few writes."""
+
+    def __init__(self, writes):
+        super().__init__()
+        self.writes = writes
+
+    def write(self, text):
+        self.writes -= 1
+        if self.writes < 0:
+            raise KeyboardInterrupt
+        return super().write(text)
+
+
+class PipelineTestCase(unittest.TestCase):
+    """Tests for running the simulation and the renderer side by side."""
+
+    def test_frames_match_headless(self):
+        """Does every queued frame show the same forest runHeadless() gets for the seed?"""
+        history = sim.runHeadless(30, config=CONFIG)
+        frames = queue.Queue()
+        pipeline.produceFrames(CONFIG, frames, threading.Event(), engine='dict', steps=30)
+        delivered = []
+        frame = frames.get_nowait()
+        while frame is not None:
+            delivered.append(frame)
+            frame = frames.get_nowait()
+
+        self.assertEqual([step for step, _, _ in delivered], list(range(31)) + [30])
+        for step, _, rows in delivered[1:]:
+            text = ''.join(rows)
+            stats = history[step - 1]
+            self.assertEqual((text.count(sim.TREE), text.count(sim.FIRE), text.count(sim.EMPTY)),
+                             (stats['trees'], stats['fires'], stats['empty']), f'step {step}')
+
+    def test_pipeline_finishes(self):
+        """In both modes, does a run end at the last step with the worker shut down?"""
+        for mode in ('thread', 'process'):
+            with self.subTest(mode=mode):
+                threads = threading.active_count()
+                out = io.StringIO()
+                result = pipeline.runPipeline(CONFIG, fps=1000, mode=mode, steps=25, out=out)
+                self.assertEqual(result['steps'], 25)
+                self.assertGreaterEqual(result['frames'], 1)
+                self.assertIn('Step 25', out.getvalue())
+                self.assertEqual(threading.active_count(), threads)
+                self.assertEqual(mp.active_children(), [])
+
+    def test_interrupted_pipeline_stops_worker(self):
+        """If drawing is interrupted mid-run, does an endless simulation still stop?"""
+        for mode in ('thread', 'process'):
+            with self.subTest(mode=mode):
+                threads = threading.active_count()
+                with self.assertRaises(KeyboardInterrupt):
+                    pipeline.runPipeline(CONFIG, fps=1000, mode=mode, out=InterruptedOutput(3))
+                self.assertEqual(threading.active_count(), threads)
+                self.assertEqual(mp.active_children(), [])
+
+    def test_stop_with_full_queue(self):
+        """Does the producer exit when stopped while its bounded queue is full and unread?"""
+        frames, stop = queue.Queue(pipeline.QUEUE_SIZE), threading.Event()
+        worker = threading.Thread(target=pipeline.produceFrames, args=(CONFIG, frames, stop, 'dict'))
+        worker.start()
+        while not frames.full():
+            time.sleep(0.01)
+        stop.set()
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(frames.qsize(), pipeline.QUEUE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
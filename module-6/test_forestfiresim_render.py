@@ -0,0 +1,64 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Differential Renderer Tests
+'''
+
+import io
+import unittest
+
+import forestfiresim_render as render
+from forestfiresim_render import CELL_COLORS, CLEAR_SCREEN, RESET_COLOR, DiffRenderer, moveTo
+from forestfiresim_325 import TREE, FIRE, EMPTY, LAKE
+
+
+class DiffRendererTestCase(unittest.TestCase):
+    """Tests for drawing only the cells that changed."""
+
+    def setUp(self):
+        self.out = io.StringIO()
+        self.renderer = DiffRenderer(self.out)
+
+    def frame(self, rows, status='status'):
+        """Renders rows and returns just the text written for that frame."""
+        start = self.out.tell()
+        self.renderer.render(rows, status)
+        return self.out.getvalue()[start:]
+
+    def test_first_frame_draws_everything(self):
+        """Does the first frame clear the screen and draw every cell in colour?"""
+        text = self.frame(['A @', '~~A'])
+        self.assertTrue(text.startswith(CLEAR_SCREEN + moveTo(0, 0) + CELL_COLORS[TREE] + TREE))
+        self.assertIn(CELL_COLORS[FIRE] + FIRE, text)
+        self.assertIn(moveTo(0, 1) + CELL_COLORS[LAKE] + LAKE + LAKE + CELL_COLORS[TREE] + TREE, text)
+        self.assertIn(moveTo(0, 2) + RESET_COLOR + 'status', text)
+
+    def test_only_changed_cells_are_written(self):
+        """Are unchanged rows and cells skipped, with a cursor move only between gaps?"""
+        self.frame(['AAAA', 'AAAA', '    '])
+        text = self.frame(['AAAA', 'A@@A', ' A  '])
+        self.assertEqual(text, moveTo(1, 1) + CELL_COLORS[FIRE] + FIRE + FIRE
+                         + moveTo(1, 2) + CELL_COLORS[TREE] + TREE + RESET_COLOR)
+
+    def test_colour_only_changes_when_needed(self):
+        """Is the colour code sent only when the next changed cell needs a different one?"""
+        self.frame(['    '])
+        text = self.frame(['A A@'])
+        self.assertEqual(text.count(CELL_COLORS[TREE]), 1)
+        self.assertEqual(text, moveTo(0, 0) + CELL_COLORS[TREE] + TREE + moveTo(2, 0) + TREE
+                         + CELL_COLORS[FIRE] + FIRE + RESET_COLOR)
+
+    def test_identical_frame_writes_nothing(self):
+        """Is nothing at all written when neither the forest nor the status changed?"""
+        self.frame(['A@ ~'])
+        self.assertEqual(self.frame(['A@ ~']), '')
+        self.assertEqual(self.frame(['A@ ~'], 'new'), moveTo(0, 1) + RESET_COLOR + 'new' + render.ESC + 'K')
+
+    def test_size_change_redraws(self):
+        """Does a frame with a different number of rows clear the screen and start over?"""
+        self.frame(['AA'])
+        self.assertTrue(self.frame(['AA', EMPTY * 2]).startswith(CLEAR_SCREEN))
+
+
+if __name__ == '__main__':
+    unittest.main()
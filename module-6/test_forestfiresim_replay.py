@@ -0,0 +1,46 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Replay Tests
+'''
+
+import os
+import tempfile
+import unittest
+
+import forestfiresim_replay as replay
+from forestfiresim_325 import SimConfig
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ReplayTestCase(unittest.TestCase):
+    """Tests for recording and checking forest fire replays."""
+
+    def setUp(self):
+        self.log = replay.recordRun(SimConfig(initial_tree_density=20, seed=7), 40)
+
+    def test_replay_round_trip(self):
+        """Does a saved and reloaded log replay bit-for-bit?"""
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'replay.json.gz')
+            replay.saveReplay(self.log, filename)
+            self.assertIsNone(replay.verifyReplay(replay.loadReplay(filename)))
+
+    def test_replay_detects_changes(self):
+        """Does a log recorded with other settings fail to replay?"""
+        self.log['config']['grow_chance'] = 0.05
+        self.assertIsNotNone(replay.verifyReplay(self.log))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_engine_matches_reference(self):
+        """Does the NumPy engine reproduce the reference run exactly?"""
+        self.assertEqual(replay.cellRollGrid(7, 3, 10, 4)[2, 5], replay.cellRoll(7, 3, 5, 2))
+        self.assertIsNone(replay.checkNumpyEngine(self.log))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Snapshot Tests
+'''
+
+import os
+import random
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import forestfiresim_325 as sim
+import forestfiresim_snapshot as snapshot
+from forestfiresim_325 import SimConfig
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """Tests for the bit-packed snapshot format and checkpointing."""
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.filename = os.path.join(folder.name, 'run.snapshot')
+        self.config = SimConfig(width=23, height=9, initial_tree_density=40, lake_radius=3, seed=11)
+
+    def test_pack_round_trip(self):
+        """Do packCells() and unpackCells() round-trip every code, at both widths and odd lengths?"""
+        rng = random.Random(2)
+        for bits, top in [(2, 4), (4, 6)]:
+            for length in (0, 1, 7, 1001):
+                codes = bytes(rng.randrange(top) for _ in range(length))
+                packed = snapshot.packCells(codes, bits)
+                self.assertEqual(len(packed), -(-length * bits // 8))
+                self.assertEqual(snapshot.unpackCells(packed, length, bits), codes)
+
+    def test_save_and_load_forest(self):
+        """Does a dict forest with roads come back unchanged, with its config, step and RNG?"""
+        forest = sim.createNewForest(self.config, random.Random(1))
+        sim.placeLake(forest, self.config)
+        forest[(0, 0)], forest[(1, 0)], forest[(2, 0)] = sim.FIRE, sim.ROAD, sim.FIREBREAK
+        rng = random.Random(5)
+        snapshot.saveSnapshot(self.filename, forest, self.config, 42, rng)
+        loaded, config, step, loadedRng = snapshot.loadSnapshot(self.filename)
+        self.assertEqual((loaded, config, step), (forest, self.config, 42))
+        self.assertEqual(loadedRng.random(), rng.random())
+
+    def test_rejects_other_files(self):
+        """Is a file that isn't a snapshot rejected?"""
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            snapshot.loadSnapshot(self.filename)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_numpy_grid_and_generator(self):
+        """Does a NumPy run saved with its Generator resume exactly where it stopped?"""
+        import forestfiresim_numpy as engine
+
+        rng = np.random.default_rng(8)
+        grid = engine.placeLakeGrid(engine.createNewGrid(23, 9, 40, rng), 3)
+        for _ in range(5):
+            grid = engine.stepGrid(grid, rng=rng)
+        snapshot.saveSnapshot(self.filename, grid, self.config, 5, rng)
+        loaded, _, step, loadedRng = snapshot.loadSnapshot(self.filename, asGrid=True)
+        self.assertIsInstance(loadedRng, np.random.Generator)
+        self.assertEqual(step, 5)
+        for _ in range(5):
+            grid = engine.stepGrid(grid, rng=rng)
+            loaded = engine.stepGrid(loaded, rng=loadedRng)
+        self.assertTrue((loaded == grid).all())
+
+    def test_checkpointer_resume(self):
+        """Does a run stopped at a checkpoint and resumed match an uninterrupted run?"""
+        expected = snapshot.runWithCheckpoints(30, self.filename + '.full', self.config,
+                                               snapshot.Checkpointer(self.filename + '.full'))
+        checkpointer = snapshot.Checkpointer(self.filename, interval=0)
+        snapshot.runWithCheckpoints(12, self.filename, self.config, checkpointer)
+        self.assertEqual(snapshot.loadSnapshot(self.filename)[2], 12)
+        resumed = snapshot.runWithCheckpoints(30, self.filename, self.config, checkpointer)
+        self.assertEqual(resumed, expected)
+        self.assertEqual(snapshot.loadSnapshot(self.filename)[2], 30)
+
+    def test_checkpointer_bounds_overhead(self):
+        """Does a slow save push the next checkpoint back to keep the overhead bounded?"""
+        checkpointer = snapshot.Checkpointer(self.filename, interval=0, max_overhead=0.05)
+        self.assertTrue(checkpointer.due())
+        checkpointer.saveTime = 10.0  # As if the last save took 10 seconds.
+        self.assertFalse(checkpointer.due())
+
+
+if __name__ == '__main__':
+    unittest.main()
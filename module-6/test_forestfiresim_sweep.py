@@ -0,0 +1,86 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Parameter Sweep Tests
+'''
+
+import unittest
+
+import forestfiresim_sweep as sweep
+from forestfiresim_325 import SimConfig
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SweepTestCase(unittest.TestCase):
+    """Tests for the parallel parameter sweep runner."""
+
+    def test_build_configs(self):
+        """Is there one config per combination, with every value set?"""
+        configs = sweep.buildConfigs([10, 20], [0.01], [0.001, 0.01], [1, 2, 3], width=30, height=10)
+        self.assertEqual(len(configs), 12)
+        self.assertEqual(configs[0], SimConfig(width=30, height=10, initial_tree_density=10,
+                                               grow_chance=0.01, fire_chance=0.001, seed=1))
+        self.assertEqual(len(set(configs)), 12)
+
+    def test_check_steps(self):
+        """Are runs with nothing left to measure after the warm-up rejected?"""
+        sweep.checkSteps(11, 10)
+        for steps, warmup in [(0, 0), (10, 10), (5, 10), (10, -1)]:
+            with self.subTest(steps=steps, warmup=warmup), self.assertRaises(ValueError):
+                sweep.checkSteps(steps, warmup)
+        with self.assertRaises(ValueError):
+            sweep.summarizeRun(SimConfig(), [], warmup=0)
+
+    def test_summarize_run(self):
+        """Does a row describe only the steps after the warm-up?"""
+        history = ([{'trees': 0, 'fires': 50, 'empty': 50, 'burned': 50}] * 2
+                   + [{'trees': 30, 'fires': 2, 'empty': 68, 'burned': 1},
+                      {'trees': 50, 'fires': 4, 'empty': 46, 'burned': 3}])
+        row = sweep.summarizeRun(SimConfig(seed=4), history, warmup=2, fireSizes=[1, 2, 6])
+        self.assertEqual((row['tree_density'], row['max_burning_cells'], row['mean_ignitions'],
+                          row['total_ignitions']), (0.4, 4, 2, 4))
+        self.assertEqual((row['fires'], row['mean_fire_size'], row['max_fire_size']), (3, 3, 6))
+        self.assertEqual(sweep.summarizeRun(SimConfig(), history, 2)['fires'], '')
+        self.assertEqual(list(row), sweep.COLUMNS)
+
+    def test_tracker_skips_warmup_fires(self):
+        """Are fires that started during the warm-up left out, even if they end after it?"""
+        tracker = sweep.SteadyStateTracker(warmup=2)
+        tracker.strike((0, 0))  # Step 0: a warm-up fire...
+        tracker.endStep()
+        tracker.spread((0, 0), (1, 0))
+        tracker.endStep()
+        tracker.spread((1, 0), (2, 0))  # ...still spreading after the warm-up.
+        tracker.strike((9, 9))  # Step 2: the first steady-state fire.
+        tracker.endStep()
+        tracker.spread((9, 9), (9, 8))
+        tracker.endStep()
+        tracker.endStep()
+        self.assertEqual(tracker.finished, [(2, 2, 1)])
+
+    def test_small_sweep(self):
+        """Does a small sweep over a process pool give one row per config, in order?"""
+        configs = sweep.buildConfigs([20], [0.01, 0.02], [0.01], [1, 2], width=30, height=10)
+        rows = sweep.runSweep(configs, steps=40, warmup=10, processes=2)
+        self.assertEqual([(row['grow_chance'], row['seed']) for row in rows],
+                         [(config.grow_chance, config.seed) for config in configs])
+        self.assertEqual(rows[0], sweep.runOne((configs[0], 40, 10, 'dict')))
+        self.assertTrue(all(isinstance(row['fires'], int) for row in rows))
+        with self.assertRaises(ValueError):
+            sweep.runSweep(configs, steps=10, warmup=10)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_engine_leaves_fire_sizes_blank(self):
+        """Does the NumPy engine fill in every column except the fire sizes?"""
+        config = SimConfig(width=30, height=10, initial_tree_density=20, seed=1)
+        row = sweep.runOne((config, 30, 10, 'numpy'))
+        self.assertEqual((row['fires'], row['max_fire_size']), ('', ''))
+        self.assertGreater(row['tree_density'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
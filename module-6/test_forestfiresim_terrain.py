@@ -0,0 +1,111 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Terrain Layer Tests
+'''
+
+import os
+import random
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import forestfiresim_325 as sim
+import forestfiresim_terrain as terrainlayer
+from forestfiresim_325 import SimConfig
+from forestfiresim_terrain import Terrain, WATER, ROAD_CODE, FIREBREAK_CODE
+
+
+def rows(terrain):
+    """Returns the terrain codes as a list of lists, one per row."""
+    return [list(terrain.codes[y * terrain.width:(y + 1) * terrain.width]) for y in range(terrain.height)]
+
+
+class TerrainTestCase(unittest.TestCase):
+    """Tests for the precomputed terrain layer."""
+
+    def test_map_round_trip(self):
+        """Does a saved map load back the same, with short rows padded with land?"""
+        terrain = terrainlayer.addLine(terrainlayer.addRect(terrainlayer.lakeTerrain(20, 9, 3),
+                                                            0, 0, 4, 1), 0, 8, 19, 8)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'map.txt')
+            terrainlayer.saveTerrainMap(terrain, filename)
+            loaded = terrainlayer.loadTerrainMap(filename)
+            self.assertEqual((loaded.width, loaded.height, loaded.codes), (20, 9, terrain.codes))
+
+            with open(filename, 'w') as f:
+                f.write('~=\n#\n')
+            loaded = terrainlayer.loadTerrainMap(filename, width=3, height=3)
+        self.assertEqual(rows(loaded), [[WATER, ROAD_CODE, 0], [FIREBREAK_CODE, 0, 0], [0, 0, 0]])
+
+    def test_circle_matches_place_lake(self):
+        """Does lakeTerrain() paint exactly the cells placeLake() does?"""
+        config = SimConfig(width=31, height=13, initial_tree_density=0, lake_radius=5)
+        forest = sim.createNewForest(config)
+        sim.placeLake(forest, config)
+        painted = terrainlayer.placeTerrain(sim.createNewForest(config), terrainlayer.lakeTerrain(31, 13, 5))
+        self.assertEqual(painted, forest)
+
+    def test_rect_and_line(self):
+        """Are rectangles filled inclusively, lines drawn thick, and both clipped to the grid?"""
+        terrain = terrainlayer.addRect(Terrain(6, 4), 4, 3, 1, 2)
+        self.assertEqual(rows(terrain)[2:], [[0, 5, 5, 5, 5, 0]] * 2)
+        terrainlayer.addRect(terrain, -3, -3, 0, 0, WATER)
+        self.assertEqual(rows(terrain)[0][:2], [WATER, 0])
+
+        road = terrainlayer.addLine(Terrain(7, 5), 0, 2, 6, 2, thickness=3)
+        self.assertEqual(rows(road), [[0] * 7] + [[ROAD_CODE] * 7] * 3 + [[0] * 7])
+        river = terrainlayer.addLine(Terrain(4, 4), 0, 0, 3, 3, code=WATER)
+        self.assertEqual(river.blockedCells(), [(0, 0), (1, 1), (2, 2), (3, 3)])
+        self.assertEqual(len(river.flammableCells()), 12)
+
+    def test_blocked_cells_never_burn(self):
+        """With fire everywhere and the terrain passed to stepForest(), do blocked cells stay put?"""
+        config = SimConfig(width=12, height=8, grow_chance=1, fire_chance=1)
+        terrain = terrainlayer.addLine(terrainlayer.lakeTerrain(12, 8, 2), 0, 0, 11, 7, code=FIREBREAK_CODE)
+        forest = {'width': 12, 'height': 8}
+        for x in range(12):
+            for y in range(8):
+                forest[(x, y)] = sim.FIRE if (x + y) % 2 else sim.TREE
+        terrainlayer.placeTerrain(forest, terrain)
+        blocked = terrain.blockedForest()
+        for _ in range(4):
+            forest = sim.stepForest(forest, config, random.Random(1), terrain=terrain)
+            self.assertEqual({cell: forest[cell] for cell in blocked}, blocked)
+
+    def test_terrain_step_matches_full_step(self):
+        """Does skipping the blocked cells give the same forest as visiting every cell?"""
+        config = SimConfig(width=30, height=15, initial_tree_density=40, lake_radius=5, seed=4)
+        terrain = terrainlayer.addRect(terrainlayer.lakeTerrain(30, 15, 5), 2, 0, 3, 14)
+        forest = terrainlayer.placeTerrain(sim.createNewForest(config, random.Random(4)), terrain)
+        full, skipped = forest, forest
+        fullRng, skippedRng = random.Random(9), random.Random(9)
+        for _ in range(30):
+            full = sim.stepForest(full, config, fullRng)
+            skipped = sim.stepForest(skipped, config, skippedRng, terrain=terrain)
+        self.assertEqual(skipped, full)
+
+        # runHeadless() now steps with the lake terrain; the result must not change:
+        lakeForest = sim.createNewForest(config, config.makeRandom('init'))
+        sim.placeLake(lakeForest, config)
+        self.assertEqual(sim.runHeadless(20, config=config), sim.runHeadless(20, lakeForest, config))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_place_terrain_grid(self):
+        """Does placeTerrainGrid() paint the same cells into a NumPy grid as placeTerrain()?"""
+        import forestfiresim_numpy as engine
+
+        terrain = terrainlayer.addLine(terrainlayer.lakeTerrain(15, 7, 2), 0, 6, 14, 0, code=ROAD_CODE)
+        grid = terrainlayer.placeTerrainGrid(engine.createNewGrid(15, 7, 0), terrain)
+        forest = terrainlayer.placeTerrain(sim.createNewForest(SimConfig(width=15, height=7,
+                                                                         initial_tree_density=0)), terrain)
+        self.assertEqual(engine.forestFromGrid(grid), forest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 6 – Forest Fire Sim: Tiled Engine Tests
+'''
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from forestfiresim_325 import SimConfig
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TiledEngineTestCase(unittest.TestCase):
+    """Tests for the tiled multi-process forest fire engine."""
+
+    def test_tiles_match_single_grid(self):
+        """Does fire cross tile borders exactly as it spreads inside one grid?"""
+        import forestfiresim_numpy as engine
+        import forestfiresim_tiled as tiled
+        from forestfiresim_replay import cellRollGrid
+
+        config = SimConfig(width=41, height=23, initial_tree_density=40, seed=5)
+        grid = engine.createNewGrid(41, 23, 40, np.random.default_rng(5))
+        engine.placeLakeGrid(grid, 5)
+        expected = grid
+        for step in range(12):
+            roll = cellRollGrid(config.seed, step, config.width, config.height)
+            expected = engine.stepGrid(expected, config.grow_chance, config.fire_chance, roll=roll)
+
+        with tiled.TiledSimulation(grid, config, tiles=(3, 2), deterministic=True) as simulation:
+            history = simulation.run(12)
+            self.assertTrue((simulation.grid() == expected).all())
+        self.assertEqual(history[-1]['trees'], int((expected == engine.TREE_CELL).sum()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 9.2 Assignment – APIs - Persistent Response Cache
+
+Program Overview:
+Keeps API responses in a small SQLite database on disk, so running a script again
+doesn't download the same data again. fetch_url_with_retry() checks the cache before
+going to the network.
+
+Features & Flow:
+- A cached response younger than the TTL is used as is, with no network request at all.
+- An older response is revalidated: the request carries If-None-Match (ETag) and
+  If-Modified-Since (Last-Modified), and a 304 Not Modified answer reuses the cached copy.
+- Every lookup records when the entry was last used. When the cache grows past its size
+  limit, the least recently used entries are deleted first.
+- Offline mode serves everything from the cache, however old, and never touches the network.
+- One connection is shared by every thread, guarded by a lock, so the concurrent spell
+  fetching can use the cache too.
+
+Prerequisites:
+- Requires the 'requests' Python library.
+'''
+
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_FILE = 'api_cache.sqlite3'
+CACHE_TTL = 7 * 24 * 60 * 60  # Seconds a cached response is used without revalidating (7 days)
+CACHE_MAX_BYTES = 50 * 1024 * 1024  # Cache size limit before old entries are evicted (50 MB)
+
+
+class ResponseCache:
+    """
+    A size-bounded, least-recently-used cache of HTTP GET responses stored in SQLite.
+    """
+
+    def __init__(self, filename=CACHE_FILE, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES, offline=False):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       url TEXT PRIMARY KEY,
+                       status INTEGER,
+                       headers TEXT,
+                       body BLOB,
+                       etag TEXT,
+                       last_modified TEXT,
+                       fetched_at REAL,
+                       last_used REAL,
+                       size INTEGER)""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS lru ON responses (last_used)")
+
+    def lookup(self, url):
+        """
+        Returns the cached entry for url as a dict, or None if there isn't one.
+        Marks the entry as just used.
+        """
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT status, headers, body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url))
+        status, headers, body, etag, last_modified, fetched_at = row
+        return {'url': url, 'status': status, 'headers': json.loads(headers), 'body': body,
+                'etag': etag, 'last_modified': last_modified, 'fetched_at': fetched_at}
+
+    def is_fresh(self, entry):
+        """Returns True if the entry is young enough to use without asking the server."""
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Returns the request headers that ask the server whether the entry has changed."""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """Saves a successful response, then evicts old entries if the cache is too big."""
+        body = response.content
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(dict(response.headers)), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body)))
+            self.evict()
+
+    def refresh(self, url):
+        """Marks a cached entry as just confirmed by the server (after a 304 Not Modified)."""
+        with self.lock, self.connection:
+            self.connection.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes. Call with the lock held."""
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT url, size FROM responses ORDER BY last_used").fetchall()
+        doomed = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            total -= size
+        self.connection.executemany("DELETE FROM responses WHERE url = ?", doomed)
+
+    @staticmethod
+    def to_response(entry):
+        """Builds a requests.Response from a cached entry, so callers can use it like a fresh one."""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,208 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 9.2 Assignment – APIs - Shared HTTP Client
+
+Program Overview:
+The HTTP code shared by the API scripts. Both scripts used to carry their own copy of
+fetch_url_with_retry(), which called requests.get() and so opened a brand new TCP (and
+TLS) connection for every request. Here every request goes through one pooled
+requests.Session that keeps connections open and reuses them.
+
+Features & Flow:
+- One keep-alive session per client, with at most PER_HOST_CONNECTIONS connections (and
+  requests in flight) to any one host, however many threads are fetching.
+- Failed requests are retried with exponential backoff and jitter: the wait doubles after
+  each attempt (capped at BACKOFF_MAX) and is randomized so retrying clients don't all
+  come back at the same moment.
+- A Retry-After header (seconds or an HTTP date) on a 429 or 503 response is honoured
+  instead of the backoff delay.
+- Works with the persistent ResponseCache from api_cache.py: fresh entries skip the
+  network, stale ones are revalidated, offline mode never touches the network.
+- RequestMetrics records every request's latency, attempts and outcome, per host.
+
+Prerequisites:
+- Requires the 'requests' Python library.
+'''
+
+import email.utils
+import random
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT = 5  # Seconds to wait for a response
+RETRY_ATTEMPTS = 3  # Retries after the first attempt
+BACKOFF_BASE = 1  # Seconds to wait before the first retry; doubles for each one after
+BACKOFF_MAX = 30  # Longest backoff wait in seconds
+MAX_RETRY_AFTER = 60  # Longest Retry-After wait honoured, in seconds
+PER_HOST_CONNECTIONS = 8  # Most open connections and requests in flight per host
+
+
+class RequestMetrics:
+    """Thread-safe record of request latency, retries and outcomes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []  # (host, seconds, attempts, ok, cached) for every request
+
+    def record(self, url, seconds, attempts, ok, cached=False):
+        with self.lock:
+            self.requests.append((urlsplit(url).netloc, seconds, attempts, ok, cached))
+
+    def summary(self):
+        """Returns a dict of totals and latency statistics for every host together and for each host."""
+        with self.lock:
+            records = list(self.requests)
+
+        def summarize(rows):
+            latencies = sorted(seconds for _, seconds, _, _, cached in rows if not cached)
+            return {'requests': len(rows),
+                    'retries': sum(attempts - 1 for _, _, attempts, _, _ in rows if attempts),
+                    'failures': sum(1 for _, _, _, ok, _ in rows if not ok),
+                    'cache_hits': sum(1 for *_, cached in rows if cached),
+                    'latency_mean': statistics.fmean(latencies) if latencies else 0.0,
+                    'latency_p95': latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+                    'latency_max': latencies[-1] if latencies else 0.0}
+
+        hosts = sorted({row[0] for row in records})
+        return {'all': summarize(records),
+                'hosts': {host: summarize([row for row in records if row[0] == host]) for host in hosts}}
+
+    def report(self):
+        """Returns a one-line-per-host printable summary."""
+        summary = self.summary()
+        lines = []
+        for host, stats in [('all hosts', summary['all'])] + list(summary['hosts'].items()):
+            lines.append(f"{host}: {stats['requests']} requests, {stats['cache_hits']} from cache, "
+                         f"{stats['retries']} retries, {stats['failures']} failed, latency "
+                         f"mean {stats['latency_mean'] * 1000:.0f} ms, p95 {stats['latency_p95'] * 1000:.0f} ms, "
+                         f"max {stats['latency_max'] * 1000:.0f} ms")
+        return '\n'.join(lines)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE):
+    """Returns the wait before retry number attempt (0 for the first retry), with jitter."""
+    delay = min(BACKOFF_MAX, base * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+
+def retry_after(response):
+    """Returns the seconds a 429/503 response asks us to wait (Retry-After), or None."""
+    if response is None or response.status_code not in (429, 503):
+        return None
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+class APIClient:
+    """A pooled, rate-limited HTTP client with retries, caching and metrics."""
+
+    def __init__(self, per_host=PER_HOST_CONNECTIONS, cache=None, metrics=None):
+        self.per_host = per_host
+        self.cache = cache
+        self.metrics = RequestMetrics() if metrics is None else metrics
+        self.session = requests.Session()
+        # pool_maxsize is the most connections kept open to each host, and pool_block makes
+        # threads wait for a free one instead of opening extras. (pool_connections is how
+        # many hosts get a pool, so it stays at the default.)
+        adapter = HTTPAdapter(pool_maxsize=per_host, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.lock = threading.Lock()
+        self.host_limits = {}
+
+    def host_limit(self, url):
+        """Returns the semaphore that limits requests in flight to url's host."""
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+    def fetch(self, url, timeout=REQUEST_TIMEOUT, retries=RETRY_ATTEMPTS, delay=BACKOFF_BASE, cache=None):
+        """
+        Fetches url with retry logic, returning a requests.Response or None on failure.
+
+        Args:
+            url (str): The URL to fetch.
+            timeout (int): The request timeout in seconds.
+            retries (int): The maximum number of retry attempts.
+            delay (float): The wait before the first retry; later waits double, with jitter.
+            cache (ResponseCache): Cache to use instead of the client's own, if given.
+        """
+        cache = self.cache if cache is None else cache
+        start = time.perf_counter()
+        entry = cache.lookup(url) if cache else None
+        if entry and (cache.offline or cache.is_fresh(entry)):
+            self.metrics.record(url, time.perf_counter() - start, 0, True, cached=True)
+            return cache.to_response(entry)
+        if cache and cache.offline:
+            print(f"Offline mode: no cached copy of '{url}'.")
+            self.metrics.record(url, time.perf_counter() - start, 0, False)
+            return None
+        headers = cache.conditional_headers(entry) if entry else {}
+
+        for i in range(retries + 1):
+            response = None
+            try:
+                with self.host_limit(url):
+                    response = self.session.get(url, timeout=timeout, headers=headers)
+                if response.status_code == 304 and entry:
+                    cache.refresh(url)  # Not modified, so the cached copy is still good
+                    self.metrics.record(url, time.perf_counter() - start, i + 1, True, cached=True)
+                    return cache.to_response(entry)
+                response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+                if cache:
+                    cache.store(url, response)
+                self.metrics.record(url, time.perf_counter() - start, i + 1, True)
+                return response
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching URL '{url}' (Attempt {i+1}/{retries+1}): {e}")
+                if i < retries:
+                    failed = e.response if getattr(e, 'response', None) is not None else response
+                    wait = retry_after(failed)
+                    wait = backoff_delay(i, delay) if wait is None else wait
+                    print(f"Retrying in {wait:.1f} seconds...")
+                    time.sleep(wait)
+                else:
+                    print(f"Failed to fetch URL '{url}' after {retries + 1} attempts.")
+            except Exception as e:
+                print(f"An unexpected error occurred while fetching '{url}': {e}")
+                break
+        self.metrics.record(url, time.perf_counter() - start, i + 1, False)
+        return None
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the client shared by every script in this process, creating it on first use."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = APIClient()
+        return _default_client
+
+
+def fetch_url_with_retry(url, timeout=REQUEST_TIMEOUT, retries=RETRY_ATTEMPTS, delay=BACKOFF_BASE, cache=None):
+    """Fetches url through the shared client; see APIClient.fetch()."""
+    return get_client().fetch(url, timeout, retries, delay, cache)
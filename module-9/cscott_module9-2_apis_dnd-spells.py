@@ -6,36 +6,77 @@ Updated: 2025-04-27
 
 Program Overview:
 This program fetches a list of spells from the D&D 5e API, identifies spells that deal damage,
-calculates their potential maximum damage based on the highest available spell slot, and
-displays the top 10 highest damage spells in a formatted table.
+calculates their maximum and expected damage based on the highest available spell slot, and
+displays the top 10 spells by expected damage in a formatted table.
 
 Features & Flow:
 - Fetches spell data from the Open5e API.
 - Extracts damage information, prioritizing the highest spell slot level.
-- Calculates the maximum potential damage based on the damage dice notation (e.g., '3d6').
-- Displays the top 10 damaging spells in a four-column table: Rank, Spell Name, Dice Roll, and Max Damage.
-- Includes robust error handling for API requests and data parsing with retry logic.
+- Calculates the maximum and expected damage from the damage dice expression (e.g., '3d6',
+  '1d10 + 2d6' or '8d6 + MOD') using the exact damage distribution from dice.py.
+- Ranks spells by expected damage and displays the top 10 in a table: Rank, Spell Name,
+  Dice Roll, Max Damage and Expected Damage, followed by the best spell at each slot level.
+- Includes robust error handling for API requests and data parsing with retry logic
+  (exponential backoff with jitter, honouring Retry-After) over a pooled keep-alive session.
+- Fetches spell details concurrently with a bounded thread pool (MAX_WORKERS at a time),
+  each request keeping its own retry logic.
+- Keeps responses in a persistent on-disk cache (api_cache.py), so repeat runs don't download
+  the spell data again; run with --offline to use only the cache.
 
 Prerequisites:
 - Requires the 'requests' and 'tabulate' Python libraries.
 '''
 
-import requests
 from tabulate import tabulate
-import time  # Import the time module for adding delays
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import api_client  # Shared pooled HTTP session with backoff, Retry-After and metrics
+from api_cache import ResponseCache
+import dice  # Dice-expression parser with exact damage distributions
+from dice import DiceError
 
 # Base URL for accessing the D&D 5e API
 BASE_URL = "https://www.dnd5eapi.co"
 REQUEST_TIMEOUT = 5  # Set a timeout for API requests in seconds
 RETRY_ATTEMPTS = 3  # Number of times to retry a failed request
-RETRY_DELAY = 2  # Delay between retries in seconds
+RETRY_DELAY = 2  # Delay before the first retry in seconds (doubles for each retry, with jitter)
+MAX_WORKERS = 16  # Most spell detail requests in flight at once (1 fetches one at a time)
+CACHE_FILE = 'dnd_api_cache.sqlite3'  # Persistent response cache next to the script's working folder
+OFFLINE_MODE = False  # True serves every request from the cache (also set by --offline)
+SPELLCASTING_MODIFIER = 5  # Assumed ability modifier for damage written as '+ MOD'
+
+response_cache = None  # The ResponseCache used by fetch_url_with_retry(), opened in main()
+
+def calculate_damage_stats(damage_string):
+    """
+    Works out the maximum and expected damage of a dice expression with the dice engine.
+
+    Understands full expressions such as '8d6', '1d10 + 2d6' or '4d4 + MOD', where MOD is
+    taken to be SPELLCASTING_MODIFIER. The expected value comes from the exact damage
+    distribution, not from sampling.
+
+    Args:
+        damage_string (str): The damage dice expression (e.g., '3d6 + MOD').
+
+    Returns:
+        dict: {'dice': damage_string, 'max': int, 'expected': float}, or None if the
+              expression can't be understood.
+    """
+    try:
+        distribution = dice.evaluate(damage_string, {'MOD': SPELLCASTING_MODIFIER})
+    except DiceError as e:
+        print(f"Error: Invalid damage string format: {damage_string} ({e})")
+        return None
+    return {'dice': damage_string, 'max': distribution.max, 'expected': float(distribution.mean())}
 
 def calculate_potential_damage(damage_string):
     """
     Calculates the potential maximum damage of a spell based on its damage dice notation.
 
     For example, '3d6' is interpreted as 3 rolls of a 6-sided die, with a maximum
-    potential damage of 3 * 6 = 18.
+    potential damage of 3 * 6 = 18. Expressions such as '1d10 + 2d6' or '8d6 + MOD'
+    are understood too (see calculate_damage_stats()).
 
     Args:
         damage_string (str): A string representing the damage in 'd' notation (e.g., '3d6').
@@ -45,49 +86,28 @@ def calculate_potential_damage(damage_string):
                the original damage string (str), or (0, damage_string) if the damage
                string is not in the expected format or if an error occurs during parsing.
     """
-    try:
-        parts = damage_string.lower().split('d')
-        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-            num_dice = int(parts[0])
-            die_sides = int(parts[1])
-            max_damage = num_dice * die_sides
-            return max_damage, damage_string
-    except AttributeError:
-        print(f"Error: Invalid damage string format: {damage_string}")
-    except ValueError:
-        print(f"Error: Non-numeric characters in damage string: {damage_string}")
-    return 0, damage_string
+    stats = calculate_damage_stats(damage_string)
+    return (stats['max'] if stats else 0), damage_string
 
 def fetch_url_with_retry(url, timeout=REQUEST_TIMEOUT, retries=RETRY_ATTEMPTS, delay=RETRY_DELAY):
     """
     Fetches data from a given URL with retry logic for connection-related errors.
 
+    Requests go through the shared pooled session in api_client.py. When
+    response_cache is open, a fresh cached copy is returned without any request,
+    a stale one is revalidated with If-None-Match/If-Modified-Since, and in offline
+    mode only the cache is used.
+
     Args:
         url (str): The URL to fetch.
         timeout (int): The request timeout in seconds.
         retries (int): The maximum number of retry attempts.
-        delay (int): The delay between retries in seconds.
+        delay (int): The delay before the first retry in seconds; later retries back off exponentially.
 
     Returns:
         requests.Response or None: The response object if successful, None otherwise.
     """
-    for i in range(retries + 1):
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching URL '{url}' (Attempt {i+1}/{retries+1}): {e}")
-            if i < retries:
-                print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                print(f"Failed to fetch URL '{url}' after {retries + 1} attempts.")
-                return None
-        except Exception as e:
-            print(f"An unexpected error occurred while fetching '{url}': {e}")
-            return None
-    return None
+    return api_client.fetch_url_with_retry(url, timeout, retries, delay, cache=response_cache)
 
 def fetch_all_spells():
     """
@@ -128,82 +148,162 @@ def fetch_spell_details(spell_url):
             return None
     return None
 
-def find_highest_damage_spells(spells):
+def fetch_all_spell_details(spells, max_workers=MAX_WORKERS):
+    """
+    Fetches the details of every spell, up to max_workers requests at a time.
+
+    Each request goes through fetch_url_with_retry() on its own thread, so a slow or
+    retrying request only holds up its own worker.
+
+    Args:
+        spells (list): A list of spell dictionaries (from fetch_all_spells).
+        max_workers (int): The most requests to run at once; 1 fetches one at a time.
+
+    Returns:
+        list: The spell details (or None for failed requests), in the same order as spells.
+    """
+    urls = [spell['url'] for spell in spells]
+    if max_workers <= 1:
+        return [fetch_spell_details(url) for url in urls]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch_spell_details, urls))
+
+def find_highest_damage_spells(spells, max_workers=MAX_WORKERS):
     """
-    Identifies spells with damage information and determines their potential maximum damage
-    at the highest available slot level.
+    Identifies spells with damage information and determines their potential maximum and
+    expected damage at every listed slot level, ranking them by the highest one.
 
     Args:
         spells (list): A list of spell dictionaries (from fetch_all_spells).
+        max_workers (int): The most spell detail requests to run at once.
 
     Returns:
         list: A list of dictionaries, where each dictionary contains the spell name,
-              the dice roll needed, and its potential maximum damage, sorted in
-              descending order of damage.
+              the dice roll needed, its potential maximum damage, its expected damage,
+              and the same figures for every slot level ('by_slot'), sorted in
+              descending order of expected damage.
     """
     damage_spells = []
-    for spell in spells:
-        spell_details = fetch_spell_details(spell['url'])
+    for spell_details in fetch_all_spell_details(spells, max_workers):
         if spell_details and 'damage' in spell_details:
             spell_name = spell_details.get('name', 'Unknown Spell')
             damage_info = spell_details['damage']
-            damage_at_slot_level = damage_info.get('damage_at_slot_level')
-
-            if damage_at_slot_level:
-                try:
-                    highest_slot = max(damage_at_slot_level.keys(), key=int)
-                    damage_string = damage_at_slot_level[highest_slot]
-                    max_damage, dice_roll = calculate_potential_damage(damage_string)
-                    damage_spells.append({"name": spell_name, "dice": dice_roll, "damage": max_damage})
-                except ValueError:
-                    print(f"Warning: Non-integer slot level found for spell '{spell_name}'.")
-                except Exception as e:
-                    print(f"Error processing damage for spell '{spell_name}': {e}")
-            else:
-                # Check for immediate damage dice if no slot level scaling
-                damage_dice = damage_info.get('damage_dice')
-                if damage_dice:
-                    max_damage, dice_roll = calculate_potential_damage(damage_dice)
-                    damage_spells.append({"name": spell_name, "dice": dice_roll, "damage": max_damage})
-
-    damage_spells.sort(key=lambda x: x["damage"], reverse=True)
+            try:
+                damage_at_slot_level = damage_info.get('damage_at_slot_level')
+                if damage_at_slot_level:
+                    by_slot = {int(level): calculate_damage_stats(damage_string)
+                               for level, damage_string in damage_at_slot_level.items()}
+                else:
+                    # Check for immediate damage dice if no slot level scaling
+                    damage_dice = damage_info.get('damage_dice')
+                    if not damage_dice:
+                        continue
+                    by_slot = {spell_details.get('level', 0): calculate_damage_stats(damage_dice)}
+            except ValueError:
+                print(f"Warning: Non-integer slot level found for spell '{spell_name}'.")
+                continue
+            except (TypeError, AttributeError) as e:
+                # Damage data in an unexpected shape; skip this spell, not the whole ranking.
+                print(f"Warning: Error processing damage for spell '{spell_name}': {e}")
+                continue
+
+            by_slot = {level: stats for level, stats in by_slot.items() if stats}
+            if by_slot:
+                highest = by_slot[max(by_slot)]
+                damage_spells.append({"name": spell_name, "dice": highest['dice'], "damage": highest['max'],
+                                      "expected": highest['expected'], "by_slot": by_slot})
+
+    damage_spells.sort(key=lambda x: (x["expected"], x["damage"]), reverse=True)
     return damage_spells
 
+def rank_spells_at_slot_level(damage_spells, slot_level):
+    """
+    Ranks spells by expected damage when cast with a spell slot of the given level.
+
+    A spell whose damage doesn't scale (or stops scaling) below slot_level does the damage
+    of its highest listed level at or below slot_level; spells that need a higher slot are left out.
+
+    Args:
+        damage_spells (list): Spells from find_highest_damage_spells().
+        slot_level (int): The spell slot level to rank at.
+
+    Returns:
+        list: Dictionaries with the spell name, dice, max damage and expected damage at that
+              slot level, sorted by expected damage (highest first).
+    """
+    ranked = []
+    for spell in damage_spells:
+        usable = [level for level in spell["by_slot"] if level <= slot_level]
+        if usable:
+            stats = spell["by_slot"][max(usable)]
+            ranked.append({"name": spell["name"], "dice": stats['dice'], "damage": stats['max'],
+                           "expected": stats['expected']})
+    ranked.sort(key=lambda x: (x["expected"], x["damage"]), reverse=True)
+    return ranked
+
 def display_top_damage_spells_table(top_spells, num_spells=10):
     """
     Displays the top N highest damage spells in a column-based table format.
 
     Args:
         top_spells (list): A sorted list of dictionaries, where each dictionary
-                           contains the spell name, the dice roll needed, and its
-                           potential maximum damage.
+                           contains the spell name, the dice roll needed, its
+                           potential maximum damage and its expected damage.
         num_spells (int): The number of top spells to display (default is 10).
     """
-    print(f"\nTop {num_spells} Highest Potential Damage Magic User Spells:")
+    print(f"\nTop {num_spells} Highest Expected Damage Magic User Spells:")
     if not top_spells:
         print("No damage-dealing spells found.")
         return
 
-    headers = ["Rank", "Spell Name", "Dice Roll", "Max Damage"]
+    headers = ["Rank", "Spell Name", "Dice Roll", "Max Damage", "Expected Damage"]
     table_data = []
     for i, spell_data in enumerate(top_spells[:num_spells], 1):
-        table_data.append([i, spell_data["name"], spell_data["dice"], spell_data["damage"]])
+        table_data.append([i, spell_data["name"], spell_data["dice"], spell_data["damage"],
+                           f"{spell_data['expected']:.1f}"])
 
     print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
+def display_best_spell_per_slot_level(damage_spells, max_slot_level=9):
+    """
+    Displays the spell with the highest expected damage at each spell slot level.
+
+    Args:
+        damage_spells (list): Spells from find_highest_damage_spells().
+        max_slot_level (int): The highest slot level to show (default is 9).
+    """
+    table_data = []
+    for slot_level in range(1, max_slot_level + 1):
+        ranked = rank_spells_at_slot_level(damage_spells, slot_level)
+        if ranked:
+            best = ranked[0]
+            table_data.append([slot_level, best["name"], best["dice"], best["damage"], f"{best['expected']:.1f}"])
+    if table_data:
+        print("\nHighest Expected Damage Spell at Each Slot Level:")
+        headers = ["Slot Level", "Spell Name", "Dice Roll", "Max Damage", "Expected Damage"]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
 def main():
     """
     Main function to fetch D&D spells, identify those with damage, calculate their
-    potential maximum damage, and display the top 10 highest damage spells in a table
-    showing the rank, spell name, the dice roll needed, and the maximum damage.
+    maximum and expected damage, and display the top 10 spells by expected damage in a table
+    showing the rank, spell name, the dice roll needed, the maximum and the expected damage,
+    followed by the best spell at each slot level.
     Includes retry logic for API requests.
     """
-    all_spells = fetch_all_spells()
-    if all_spells:
-        highest_damage_spells = find_highest_damage_spells(all_spells)
-        display_top_damage_spells_table(highest_damage_spells)
-    else:
-        print("Could not retrieve the list of spells from the API.")
+    global response_cache
+    response_cache = ResponseCache(CACHE_FILE, offline=OFFLINE_MODE or '--offline' in sys.argv)
+    try:
+        all_spells = fetch_all_spells()
+        if all_spells:
+            highest_damage_spells = find_highest_damage_spells(all_spells)
+            display_top_damage_spells_table(highest_damage_spells)
+            display_best_spell_per_slot_level(highest_damage_spells)
+        else:
+            print("Could not retrieve the list of spells from the API.")
+    finally:
+        response_cache.close()
+    print(f"\nRequest metrics:\n{api_client.get_client().metrics.report()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
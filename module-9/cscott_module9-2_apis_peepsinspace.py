@@ -14,14 +14,14 @@ Features & Flow:
 - Handles potential network errors and invalid JSON responses.
 - Extracts and prints the count of astronauts.
 - Iterates through the list of astronauts and displays their name and associated spacecraft.
-- Includes retry logic for handling transient network issues.
+- Includes retry logic for handling transient network issues (exponential backoff with
+  jitter, honouring Retry-After) over the shared pooled session in api_client.py.
 
 Prerequisites:
 - Requires the 'requests' Python library.
 '''
 
-import requests
-import time  # Import the time module for adding delays
+import api_client  # Shared pooled HTTP session with backoff, Retry-After and metrics
 
 # API endpoint URL
 API_URL = 'http://api.open-notify.org/astros.json'
@@ -29,38 +29,23 @@ API_URL = 'http://api.open-notify.org/astros.json'
 # Constants for retry mechanism
 REQUEST_TIMEOUT = 5  # seconds
 RETRY_ATTEMPTS = 3
-RETRY_DELAY = 2  # seconds
+RETRY_DELAY = 2  # seconds before the first retry; doubles for each retry, with jitter
 
 def fetch_url_with_retry(url, timeout=REQUEST_TIMEOUT, retries=RETRY_ATTEMPTS, delay=RETRY_DELAY):
     """
-    Fetches data from a given URL with retry logic for connection-related errors.
+    Fetches data from a given URL with retry logic for connection-related errors,
+    using the shared pooled session in api_client.py.
 
     Args:
         url (str): The URL to fetch.
         timeout (int): The request timeout in seconds.
         retries (int): The maximum number of retry attempts.
-        delay (int): The delay between retries in seconds.
+        delay (int): The delay before the first retry in seconds; later retries back off exponentially.
 
     Returns:
         requests.Response or None: The response object if successful, None otherwise.
     """
-    for i in range(retries + 1):
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching URL '{url}' (Attempt {i+1}/{retries+1}): {e}")
-            if i < retries:
-                print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                print(f"Failed to fetch URL '{url}' after {retries + 1} attempts.")
-                return None
-        except Exception as e:
-            print(f"An unexpected error occurred while fetching '{url}': {e}")
-            return None
-    return None
+    return api_client.fetch_url_with_retry(url, timeout, retries, delay)
 
 def get_astronauts_in_space():
     """
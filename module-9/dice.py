@@ -0,0 +1,180 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 9.2 Assignment – APIs - Dice Expressions
+
+Program Overview:
+Parses dice expressions such as '8d6', '1d10 + 2d6', '4d4 + MOD' or '2d8 - 1' and works
+out exactly how likely every total is, along with the minimum, maximum and expected value.
+The old damage calculation only understood plain 'NdM' strings and scored anything else as 0.
+
+Features & Flow:
+- parse() turns an expression into a list of signed terms: dice ('NdM' or 'dM'), whole
+  numbers, and named values such as MOD that are looked up in a dict of variables.
+- A Distribution stores how many of the equally likely outcomes give each total, as whole
+  numbers, so every probability is exact (no floating point rounding).
+- Adding two independent rolls convolves their distributions. 'NdM' is built by convolving
+  two halves, so 20d6 takes about five convolutions instead of twenty, and every 'NdM'
+  result is memoized, as is every parsed expression.
+- A term with more than MAX_TOTALS possible totals (such as 200d20) is rejected, since
+  the convolutions grow with the square of that number.
+- evaluate() returns the Distribution of a whole expression.
+
+Examples:
+    evaluate('8d6').max == 48, evaluate('8d6').mean() == 28
+    evaluate('1d10 + MOD', {'MOD': 3}).probability(13) == Fraction(1, 10)
+'''
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+
+TOKEN = re.compile(r'\s*(?:(?P<dice>(?P<count>\d*)[dD](?P<sides>\d+))|(?P<number>\d+)'
+                   r'|(?P<name>[A-Za-z_]\w*)|(?P<op>[+-]))')
+MAX_DICE = 1000  # Largest number of dice in one term.
+MAX_SIDES = 1000  # Largest number of sides on one die.
+MAX_TOTALS = 1000  # Most possible totals of one dice term, count * (sides - 1) + 1.
+
+
+class DiceError(ValueError):
+    """Raised for a dice expression that can't be parsed or evaluated."""
+
+
+class Distribution:
+    """
+    The exact distribution of a total: counts[i] of the `total` equally likely
+    outcomes give the value offset + i.
+    """
+
+    def __init__(self, offset, counts, total):
+        self.offset = offset
+        self.counts = tuple(counts)
+        self.total = total
+
+    @classmethod
+    def constant(cls, value):
+        return cls(value, (1,), 1)
+
+    @property
+    def min(self):
+        return self.offset
+
+    @property
+    def max(self):
+        return self.offset + len(self.counts) - 1
+
+    def __add__(self, other):
+        """Returns the distribution of the sum of two independent totals (a convolution)."""
+        counts = [0] * (len(self.counts) + len(other.counts) - 1)
+        for i, a in enumerate(self.counts):
+            if a:
+                for j, b in enumerate(other.counts):
+                    counts[i + j] += a * b
+        return Distribution(self.offset + other.offset, counts, self.total * other.total)
+
+    def __neg__(self):
+        return Distribution(-self.max, self.counts[::-1], self.total)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def mean(self):
+        """Returns the exact expected value as a Fraction."""
+        return Fraction(sum((self.offset + i) * count for i, count in enumerate(self.counts)), self.total)
+
+    def probability(self, value):
+        """Returns the exact chance of rolling exactly value, as a Fraction."""
+        i = value - self.offset
+        return Fraction(self.counts[i], self.total) if 0 <= i < len(self.counts) else Fraction(0)
+
+    def at_least(self, value):
+        """Returns the exact chance of rolling value or more, as a Fraction."""
+        i = max(0, value - self.offset)
+        return Fraction(sum(self.counts[i:]), self.total)
+
+    def pmf(self):
+        """Returns {value: probability} for every possible value."""
+        return {self.offset + i: Fraction(count, self.total)
+                for i, count in enumerate(self.counts) if count}
+
+
+@lru_cache(maxsize=None)
+def roll(count, sides):
+    """Returns the Distribution of the total of `count` dice with `sides` sides each."""
+    if count == 0:
+        return Distribution.constant(0)
+    if count == 1:
+        return Distribution(1, (1,) * sides, sides)
+    half = count // 2
+    return roll(half, sides) + roll(count - half, sides)
+
+
+def parse(expression):
+    """
+    Returns a list of (sign, kind, value) terms for a dice expression, where kind is
+    'dice' (value = (count, sides)), 'number' (value = int) or 'name' (value = str).
+    Raises DiceError for anything that isn't a valid expression.
+    """
+    terms = []
+    sign = 1
+    expect_term = True
+    position = 0
+    text = expression.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            raise DiceError(f"Unexpected character {text[position:].strip()[:1]!r} in {expression!r}")
+        position = match.end()
+        if match.group('op'):
+            if not expect_term:
+                sign, expect_term = (1 if match.group('op') == '+' else -1), True
+            elif match.group('op') == '-':
+                sign = -sign  # A leading or repeated minus sign.
+            continue
+        if not expect_term:
+            raise DiceError(f"Missing + or - before {match.group().strip()!r} in {expression!r}")
+        if match.group('dice'):
+            count = int(match.group('count') or 1)
+            sides = int(match.group('sides'))
+            if sides < 1 or sides > MAX_SIDES or count > MAX_DICE:
+                raise DiceError(f"Unsupported dice {match.group('dice')!r} in {expression!r}")
+            if count * (sides - 1) + 1 > MAX_TOTALS:
+                raise DiceError(f"Too many possible totals for {match.group('dice')!r} in {expression!r} "
+                                f"(at most {MAX_TOTALS})")
+            terms.append((sign, 'dice', (count, sides)))
+        elif match.group('number'):
+            terms.append((sign, 'number', int(match.group('number'))))
+        else:
+            terms.append((sign, 'name', match.group('name').upper()))
+        sign, expect_term = 1, False
+    if expect_term:
+        raise DiceError(f"Incomplete dice expression {expression!r}")
+    return terms
+
+
+@lru_cache(maxsize=4096)
+def _evaluate(expression, variables):
+    total = Distribution.constant(0)
+    names = dict(variables)
+    for sign, kind, value in parse(expression):
+        if kind == 'dice':
+            term = roll(*value)
+        elif kind == 'number':
+            term = Distribution.constant(value)
+        elif value in names:
+            term = Distribution.constant(names[value])
+        else:
+            raise DiceError(f"Unknown value {value!r} in {expression!r}")
+        total = total + term if sign > 0 else total - term
+    return total
+
+
+def evaluate(expression, variables=None):
+    """
+    Returns the Distribution of a dice expression. Named values (such as MOD) are
+    looked up, case-insensitively, in variables. Raises DiceError for bad expressions.
+    """
+    if not isinstance(expression, str):
+        raise DiceError(f"Dice expression must be a string, not {type(expression).__name__}")
+    names = tuple(sorted((name.upper(), value) for name, value in (variables or {}).items()))
+    return _evaluate(expression, names)
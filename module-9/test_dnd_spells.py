@@ -0,0 +1,292 @@
+'''
+Clint Scott
+CSD325 Advanced Python
+Module 9.2 Assignment – APIs - D&D Spells Tests
+
+Runs the spell ranking against a local stub of the D&D 5e API, so no network is needed.
+'''
+
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from fractions import Fraction
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import api_client
+import dice
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cscott_module9-2_apis_dnd-spells.py')
+spec = importlib.util.spec_from_file_location('dnd_spells', SCRIPT)
+dnd_spells = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(dnd_spells)
+
+SPELL_COUNT = 40
+MAX_WORKERS = 4  # Below the client's per-host limit, so the thread pool is what bounds concurrency.
+RESPONSE_DELAY = 0.05  # Seconds the stub waits before answering a spell detail request.
+
+
+class StubSpellsAPI(BaseHTTPRequestHandler):
+    """
+    Serves /api/spells and /api/spells/<index> with ETags. The first request for 'flaky'
+    gets a 503 and the first for 'slow-down' gets a 429 with Retry-After: 3.
+    Counts the most spell detail requests it was answering at once.
+    """
+
+    seen_before = set()
+    lock = threading.Lock()
+    requests_seen = 0
+    not_modified = 0
+    in_flight = 0
+    peak_in_flight = 0
+
+    def do_GET(self):
+        with self.lock:
+            StubSpellsAPI.requests_seen += 1
+        etag = f'"{self.path}"'
+        if self.headers.get('If-None-Match') == etag:
+            with self.lock:
+                StubSpellsAPI.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path == '/api/spells':
+            body = {'results': [{'url': f'/api/spells/spell-{i}'} for i in range(SPELL_COUNT)]
+                    + [{'url': '/api/spells/flaky'}]}
+        else:
+            index = self.path.rsplit('/', 1)[-1]
+            with self.lock:
+                first_request = index not in self.seen_before
+                self.seen_before.add(index)
+            if first_request and index == 'flaky':
+                self.send_error(503)
+                return
+            if first_request and index == 'slow-down':
+                self.send_response(429)
+                self.send_header('Retry-After', '3')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            with self.lock:
+                StubSpellsAPI.in_flight += 1
+                if StubSpellsAPI.in_flight > StubSpellsAPI.peak_in_flight:
+                    StubSpellsAPI.peak_in_flight = StubSpellsAPI.in_flight
+            threading.Event().wait(RESPONSE_DELAY)  # Not time.sleep(), which the tests patch out.
+            with self.lock:
+                StubSpellsAPI.in_flight -= 1
+            number = SPELL_COUNT if not index.startswith('spell-') else int(index.split('-')[1])
+            body = {'name': index, 'damage': {'damage_at_slot_level': {'1': '1d6', '9': f'{number + 1}d6'}}}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # Keep the test output quiet.
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 64  # Enough backlog that concurrent connections are never refused.
+
+
+class StubAPITestCase(unittest.TestCase):
+    """Starts the stub API and points the script at it."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer(('127.0.0.1', 0), StubSpellsAPI)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubSpellsAPI.seen_before.clear()
+        StubSpellsAPI.requests_seen = StubSpellsAPI.not_modified = StubSpellsAPI.peak_in_flight = 0
+        mock.patch.object(dnd_spells, 'BASE_URL', self.base_url).start()
+        mock.patch.object(dnd_spells, 'response_cache', None).start()
+        self.sleep = mock.patch.object(api_client.time, 'sleep').start()  # No waiting between retries.
+        self.client = api_client.APIClient()
+        self.addCleanup(self.client.close)
+        mock.patch.object(api_client, '_default_client', self.client).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def rank(self, max_workers):
+        """Returns the ranking of the stub's spells and the most requests that were in flight at once."""
+        with mock.patch('builtins.print'):
+            spells = dnd_spells.fetch_all_spells()
+            StubSpellsAPI.peak_in_flight = 0
+            ranked = dnd_spells.find_highest_damage_spells(spells, max_workers)
+        return ranked, StubSpellsAPI.peak_in_flight
+
+
+class ConcurrentFetchTestCase(StubAPITestCase):
+    """Tests for fetching spell details with a bounded thread pool."""
+
+    def test_concurrent_matches_sequential(self):
+        """Does the concurrent mode rank spells like the sequential one, with several requests at once?"""
+        sequential, sequential_peak = self.rank(1)
+        StubSpellsAPI.seen_before.clear()
+        concurrent, concurrent_peak = self.rank(MAX_WORKERS)
+        self.assertEqual(concurrent, sequential)
+        self.assertEqual(len(concurrent), SPELL_COUNT + 1)
+        self.assertEqual(sequential_peak, 1)
+        self.assertGreater(concurrent_peak, 1)
+        self.assertLessEqual(concurrent_peak, MAX_WORKERS)
+
+    def test_per_host_limit(self):
+        """Does the client keep requests to one host within its per-host limit?"""
+        client = api_client.APIClient(per_host=2)
+        self.addCleanup(client.close)
+        mock.patch.object(api_client, '_default_client', client).start()
+        ranked, peak = self.rank(8)
+        self.assertEqual(len(ranked), SPELL_COUNT + 1)
+        self.assertEqual(peak, 2)
+
+    def test_retry_is_kept(self):
+        """Is a request that fails once retried and counted?"""
+        ranked, _ = self.rank(8)
+        one_die = {'dice': '1d6', 'max': 6, 'expected': 3.5}
+        top = {'dice': f'{SPELL_COUNT + 1}d6', 'max': (SPELL_COUNT + 1) * 6, 'expected': (SPELL_COUNT + 1) * 3.5}
+        self.assertEqual(ranked[0], {'name': 'flaky', 'dice': top['dice'], 'damage': top['max'],
+                                     'expected': top['expected'], 'by_slot': {1: one_die, 9: top}})
+        self.sleep.assert_called_once()
+        wait = self.sleep.call_args.args[0]
+        self.assertTrue(dnd_spells.RETRY_DELAY / 2 <= wait <= dnd_spells.RETRY_DELAY)  # Backoff with jitter.
+        summary = self.client.metrics.summary()['all']
+        self.assertEqual((summary['requests'], summary['retries'], summary['failures']),
+                         (SPELL_COUNT + 2, 1, 0))
+
+    def test_retry_after_is_honoured(self):
+        """Does a 429 with Retry-After wait exactly as long as the server asks?"""
+        with mock.patch('builtins.print'):
+            response = dnd_spells.fetch_url_with_retry(f'{self.base_url}/api/spells/slow-down')
+        self.assertEqual(response.json()['name'], 'slow-down')
+        self.sleep.assert_called_once_with(3.0)
+
+
+class ResponseCacheTestCase(StubAPITestCase):
+    """Tests for the persistent response cache under fetch_url_with_retry()."""
+
+    def setUp(self):
+        super().setUp()
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.cache_file = os.path.join(folder.name, 'cache.sqlite3')
+
+    def use_cache(self, **options):
+        cache = dnd_spells.ResponseCache(self.cache_file, **options)
+        self.addCleanup(cache.close)
+        mock.patch.object(dnd_spells, 'response_cache', cache).start()
+        return cache
+
+    def test_repeat_run_uses_no_network(self):
+        """Does a second run inside the TTL make no requests at all?"""
+        self.use_cache()
+        first, _ = self.rank(8)
+        StubSpellsAPI.requests_seen = 0
+        second, _ = self.rank(8)
+        self.assertEqual(second, first)
+        self.assertEqual(StubSpellsAPI.requests_seen, 0)
+
+    def test_stale_entries_are_revalidated(self):
+        """Once the TTL has passed, are entries revalidated with their ETag?"""
+        self.use_cache()
+        first, _ = self.rank(8)
+        self.use_cache(ttl=0)
+        second, _ = self.rank(8)
+        self.assertEqual(second, first)
+        self.assertEqual(StubSpellsAPI.not_modified, SPELL_COUNT + 2)  # Every detail plus the index.
+
+    def test_offline_mode(self):
+        """Does offline mode serve cached data and never touch the network?"""
+        self.use_cache()
+        first, _ = self.rank(8)
+        StubSpellsAPI.requests_seen = 0
+        self.use_cache(ttl=0, offline=True)
+        self.assertEqual(self.rank(8)[0], first)
+        self.assertEqual(StubSpellsAPI.requests_seen, 0)
+
+    def test_lru_eviction(self):
+        """Does the cache stay under its size limit by dropping the least recently used entries?"""
+        cache = self.use_cache(max_bytes=1000)
+        self.rank(8)
+        total = cache.connection.execute('SELECT SUM(size), COUNT(*) FROM responses').fetchone()
+        self.assertLessEqual(total[0], 1000)
+        self.assertLess(total[1], SPELL_COUNT + 2)
+
+
+class DiceExpressionTestCase(unittest.TestCase):
+    """Tests for the dice-expression engine and the damage calculation built on it."""
+
+    def test_exact_distribution(self):
+        """Are the range, mean and probabilities of dice expressions exact?"""
+        fireball = dice.evaluate('8d6')
+        self.assertEqual((fireball.min, fireball.max, fireball.mean()), (8, 48, 28))
+        self.assertEqual(sum(fireball.pmf().values()), 1)
+        self.assertEqual(dice.evaluate('2d6').probability(7), Fraction(1, 6))
+        self.assertEqual(dice.evaluate('d20 + MOD', {'mod': 5}).at_least(21), Fraction(1, 4))
+        mixed = dice.evaluate('1d10 + 2d6 - 1')
+        self.assertEqual((mixed.min, mixed.max, mixed.mean()), (2, 21, Fraction(23, 2)))
+
+    def test_bad_expressions(self):
+        """Are malformed expressions rejected with DiceError?"""
+        for expression in ('', '3d', '2d6 +', '2d6 3', '1d0', 'x2', '4d4 + LEVEL', None, ['2d6']):
+            with self.subTest(expression=expression), self.assertRaises(dice.DiceError):
+                dice.evaluate(expression)
+
+    def test_oversized_dice_rejected_quickly(self):
+        """Are terms with too many possible totals rejected before any convolution is done?"""
+        start = time.perf_counter()
+        for expression in ('1000d1000', '100d100', '200d20', '1d1001', '2d6 + 200d20'):
+            with self.subTest(expression=expression), self.assertRaises(dice.DiceError):
+                dice.evaluate(expression)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(dice.evaluate('10d100').max, 1000)
+
+    def test_damage_calculation(self):
+        """Does the script score full expressions instead of treating them as 0 damage?"""
+        self.assertEqual(dnd_spells.calculate_potential_damage('3d6'), (18, '3d6'))
+        self.assertEqual(dnd_spells.calculate_damage_stats('4d4 + MOD'),
+                         {'dice': '4d4 + MOD', 'max': 16 + dnd_spells.SPELLCASTING_MODIFIER,
+                          'expected': 10 + dnd_spells.SPELLCASTING_MODIFIER})
+        with mock.patch('builtins.print'):
+            self.assertEqual(dnd_spells.calculate_potential_damage('lots'), (0, 'lots'))
+
+    def test_malformed_damage_data_skipped(self):
+        """Is a spell whose damage data has the wrong shape skipped with a warning?"""
+        details = [{'name': 'Listed', 'damage': ['8d6']},
+                   {'name': 'Levels', 'damage': {'damage_at_slot_level': ['3d6']}},
+                   {'name': 'Fine', 'level': 1, 'damage': {'damage_dice': '2d6'}},
+                   {'name': 'Missing', 'damage': {'damage_at_slot_level': {None: '1d6'}}}]
+        with mock.patch.object(dnd_spells, 'fetch_all_spell_details', return_value=details), \
+                mock.patch('builtins.print') as printed:
+            ranked = dnd_spells.find_highest_damage_spells([])
+        self.assertEqual([spell['name'] for spell in ranked], ['Fine'])
+        self.assertEqual(printed.call_count, 3)
+
+    def test_rank_at_slot_level(self):
+        """Are spells ranked by their expected damage at the slot they're cast with?"""
+        stats = dnd_spells.calculate_damage_stats
+        spells = [{'name': 'Scaling', 'by_slot': {1: stats('1d8'), 3: stats('3d8')}},
+                  {'name': 'Steady', 'by_slot': {2: stats('2d10')}},
+                  {'name': 'Big', 'by_slot': {5: stats('10d6')}}]
+        ranked = lambda level: [spell['name'] for spell in dnd_spells.rank_spells_at_slot_level(spells, level)]
+        self.assertEqual(ranked(1), ['Scaling'])
+        self.assertEqual(ranked(2), ['Steady', 'Scaling'])
+        self.assertEqual(ranked(4), ['Scaling', 'Steady'])
+        self.assertEqual(ranked(9), ['Big', 'Scaling', 'Steady'])
+
+
+if __name__ == '__main__':
+    unittest.main()